@@ -0,0 +1,198 @@
+"""
+Цена одного нажатия клавиши громкости: volume_up и показ окна громкости (громкость, mute, имя устройства).
+
+Без кэша каждый вызов заново ищет устройство по умолчанию и активирует интерфейс громкости,
+как прежний AudioUtilities.GetSpeakers(); с EndpointCache устройство ищется только после уведомления.
+На Windows — настоящий Core Audio через pycaw (громкость меняется и возвращается обратно),
+на других системах — FakeAudioBackend, где --resolve-us задаёт цену поиска устройства.
+
+Вторая часть — число записей в устройство при удержании клавиши громкости (автоповтор ~30 в секунду)
+и перетаскивании ползунка (valueChanged на каждый пиксель): по записи на событие, как раньше,
+и через VolumeCommand с записью не чаще раза за кадр, как в AudioManager. Время моделируется.
+
+Третья часть — сколько GUI-поток занят переключением устройства: синхронный вызов против AudioWorker
+(на FakeAudioBackend с задержкой переключения --switch-ms).
+
+Четвёртая часть — обращения к бэкенду, чтобы обновить список устройств после уведомления:
+полное перечисление против DeviceCatalog, который перечитывает только изменившееся устройство.
+
+Запуск: python benchmarks/bench_audio.py [--presses 200] [--resolve-us 300] [--switch-ms 150]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.audio_backend import (AudioDeviceInfo, AudioWorker, DeviceCatalog, EndpointCache, FakeAudioBackend, FLOW_CAPTURE,
+                                 FLOW_RENDER, create_default_backend)
+from poppy.volume_commands import VolumeCommand
+
+FRAME_MS = 16
+STEP = 2
+
+def press(get_endpoint):
+    # volume_up + VolumePopup.show_popup: get_volume, get_mute, get_device_name
+    endpoint = get_endpoint()
+    level = endpoint.get_volume()
+    endpoint.set_volume(min(1.0, level + 0.02))
+    endpoint.set_mute(False)
+    get_endpoint().get_volume()
+    get_endpoint().get_mute()
+    return get_endpoint().name
+
+def measure(get_endpoint, presses: int) -> float:
+    start = time.perf_counter()
+    for _ in range(presses):
+        press(get_endpoint)
+    return (time.perf_counter() - start) * 1000 / presses
+
+def bench(backend, presses: int):
+    endpoint = backend.get_default_endpoint()
+    if endpoint is None:
+        print("No default audio endpoint")
+        return
+    saved = endpoint.get_volume(), endpoint.get_mute()
+    cache = EndpointCache(backend)
+    try:
+        uncached_ms = measure(backend.get_default_endpoint, presses)
+        cache.get()
+        cached_ms = measure(cache.get, presses)
+        print(f"per press  uncached {uncached_ms:8.3f} ms  cached {cached_ms:8.3f} ms  "
+              f"x{uncached_ms / max(cached_ms, 1e-9):.1f}")
+    finally:
+        endpoint.set_volume(saved[0])
+        endpoint.set_mute(saved[1])
+        cache.close()
+
+def check_invalidation():
+    backend = FakeAudioBackend([AudioDeviceInfo("speakers", "Speakers"), AudioDeviceInfo("hdmi", "HDMI")])
+    cache = EndpointCache(backend)
+    first = cache.get()
+    resolves = backend.resolves
+    for _ in range(100):
+        cache.get()
+    backend.simulate_added(AudioDeviceInfo("usb", "USB"))
+    stable = cache.get() is first and backend.resolves == resolves
+    backend.simulate_default_changed("hdmi")
+    switched = cache.get().name == "HDMI"
+    backend.simulate_renamed("hdmi", "TV")
+    renamed = cache.get().name == "TV"
+    backend.simulate_removed("hdmi")
+    fallback = cache.get().id == "speakers"
+    print(f"cache stable {stable}  default changed {switched}  renamed {renamed}  removed {fallback}  "
+          f"resolves {backend.resolves}")
+
+def key_repeat(duration: float, rate: float = 30) -> list[tuple[float, str, int]]:
+    return [(i / rate, "steps", 1) for i in range(int(duration * rate))]
+
+def slider_drag(duration: float, rate: float = 120) -> list[tuple[float, str, int]]:
+    count = int(duration * rate)
+    return [(i / rate, "volume", 10 + 80 * i // max(count - 1, 1)) for i in range(count)]
+
+def replay_direct(events) -> tuple[int, int]:
+    volume, writes = 40, 0
+    for _, kind, value in events:
+        volume = max(0, min(100, volume + value * STEP)) if kind == "steps" else value
+        # SetMasterVolumeLevelScalar + SetMute на каждое событие
+        writes += 2
+    return writes, volume
+
+def replay_coalesced(events) -> tuple[int, int]:
+    """Первая команда после паузы применяется сразу, следующие — через кадр после предыдущей записи."""
+    volume, mute, writes = 40, False, 0
+    command, flush_at, last_write = VolumeCommand(), None, -1.0
+    frame = FRAME_MS / 1000
+
+    def flush(now: float):
+        nonlocal volume, mute, writes, command, flush_at, last_write
+        new_volume, new_mute = command.apply(volume, mute, STEP)
+        writes += (new_volume != volume) + (new_mute != mute)
+        volume, mute, command, flush_at, last_write = new_volume, new_mute, VolumeCommand(), None, now
+
+    for at, kind, value in events:
+        if flush_at is not None and flush_at <= at:
+            flush(flush_at)
+        if kind == "steps":
+            command.add_steps(value)
+        else:
+            command.set_volume(value)
+        if flush_at is None:
+            flush_at = max(at, last_write + frame)
+    if not command.is_empty():
+        # Гарантированная последняя запись
+        flush(flush_at)
+    return writes, volume
+
+def bench_commands():
+    for name, events in (("key repeat 2 s", key_repeat(2)), ("slider drag 1 s", slider_drag(1))):
+        direct_writes, direct_volume = replay_direct(events)
+        writes, volume = replay_coalesced(events)
+        print(f"{name:16} events {len(events):4}  writes direct {direct_writes:4}  coalesced {writes:4}  "
+              f"final volume {direct_volume} / {volume}")
+
+def bench_switch(switch_ms: float):
+    backend = FakeAudioBackend([AudioDeviceInfo("speakers", "Speakers"), AudioDeviceInfo("hdmi", "HDMI")],
+                               switch_delay=switch_ms / 1000)
+    start = time.perf_counter()
+    backend.set_default_device("hdmi")
+    sync_ms = (time.perf_counter() - start) * 1000
+
+    worker = AudioWorker(lambda: backend)
+    try:
+        start = time.perf_counter()
+        future = worker.submit(lambda worker_backend: worker_backend.set_default_device("speakers"))
+        blocked_ms = (time.perf_counter() - start) * 1000
+        future.result(5)
+        done_ms = (time.perf_counter() - start) * 1000
+    finally:
+        worker.close()
+    print(f"switch device  GUI blocked sync {sync_ms:8.2f} ms  worker {blocked_ms:8.3f} ms  "
+          f"(confirmed after {done_ms:.1f} ms, default {backend.default_id})")
+
+def bench_catalog(outputs: int = 8, inputs: int = 4):
+    devices = [AudioDeviceInfo(f"out{i}", f"Output {i}") for i in range(outputs)]
+    devices += [AudioDeviceInfo(f"in{i}", f"Input {i}", FLOW_CAPTURE) for i in range(inputs)]
+    backend = FakeAudioBackend(devices)
+    catalog = DeviceCatalog(backend)
+    backend.set_device_listener(catalog.mark)
+    catalog.devices()
+
+    for name, change in (("rename", lambda: backend.simulate_renamed("out3", "TV")),
+                         ("add", lambda: backend.simulate_added(AudioDeviceInfo("usb", "USB"))),
+                         ("remove", lambda: backend.simulate_removed("out1")),
+                         ("default", lambda: backend.simulate_default_changed("out2"))):
+        change()
+        calls = backend.calls
+        backend.get_devices(FLOW_RENDER)
+        backend.get_devices(FLOW_CAPTURE)
+        full_calls = backend.calls - calls
+
+        calls = backend.calls
+        changed = catalog.apply_pending()
+        print(f"catalog {name:8} changed {changed}  backend calls full {full_calls}  incremental {backend.calls - calls}  "
+              f"outputs {len(catalog.devices())}  default {catalog.default_id()}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio endpoint cache benchmark")
+    parser.add_argument("--presses", type=int, default=200)
+    parser.add_argument("--resolve-us", type=float, default=300, help="fake endpoint lookup cost, microseconds")
+    parser.add_argument("--switch-ms", type=float, default=150, help="fake default device switch cost, ms")
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        print("Core Audio (pycaw)")
+        bench(create_default_backend(), args.presses)
+    else:
+        print("Fake audio backend (no Core Audio)")
+        backend = FakeAudioBackend([AudioDeviceInfo("speakers", "Speakers")], args.resolve_us / 1_000_000)
+        bench(backend, args.presses)
+
+    check_invalidation()
+    bench_commands()
+    bench_switch(args.switch_ms)
+    bench_catalog()
+
+if __name__ == "__main__":
+    main()
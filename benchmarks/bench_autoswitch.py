@@ -0,0 +1,101 @@
+"""
+Цена нажатия для автопереключения раскладки: IncrementalScorer.push на каждую букву и suggest на пробеле,
+на таблицах раскладок US/ЙЦУКЕН (без Win32) и таблицах биграмм из poppy/resources/ngrams.
+
+Запуск: python benchmarks/bench_autoswitch.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.layout_tables import LayoutTable, LayoutTables, STATE_NONE, STATE_SHIFT
+from poppy.layout_scorer import LayoutScorer, IncrementalScorer
+
+WORDS = 50_000
+
+# Клавиши основной части клавиатуры по порядку: VK_OEM_3, цифры, ряды букв
+VKS = (0xC0, *range(0x31, 0x3A), 0x30, 0xBD, 0xBB,
+       0x51, 0x57, 0x45, 0x52, 0x54, 0x59, 0x55, 0x49, 0x4F, 0x50, 0xDB, 0xDD, 0xDC,
+       0x41, 0x53, 0x44, 0x46, 0x47, 0x48, 0x4A, 0x4B, 0x4C, 0xBA, 0xDE,
+       0x5A, 0x58, 0x43, 0x56, 0x42, 0x4E, 0x4D, 0xBC, 0xBE, 0xBF)
+
+LAYOUTS = {
+    0x0409: ("`1234567890-=qwertyuiop[]\\asdfghjkl;'zxcvbnm,./",
+             "~!@#$%^&*()_+QWERTYUIOP{}|ASDFGHJKL:\"ZXCVBNM<>?"),
+    0x0419: ("ё1234567890-=йцукенгшщзхъ\\фывапролджэячсмитьбю.",
+             "Ё!\"№;%:?*()_+ЙЦУКЕНГШЩЗХЪ/ФЫВАПРОЛДЖЭЯЧСМИТЬБЮ,"),
+}
+
+TEXT = {
+    0x0409: "the quick brown fox jumps over the lazy dog while people are typing their messages",
+    0x0419: "быстрая коричневая лиса прыгает через ленивую собаку пока люди набирают сообщения",
+}
+
+def make_table(layout: int) -> LayoutTable:
+    plain, shifted = LAYOUTS[layout]
+    chars = {(0x20, STATE_NONE): " "}
+    for vk, char, shift_char in zip(VKS, plain, shifted):
+        chars[(vk, STATE_NONE)] = char
+        chars[(vk, STATE_SHIFT)] = shift_char
+    return LayoutTable(layout, chars)
+
+def make_trace(tables: LayoutTables) -> list[tuple[int, list[tuple[int, bool]]]]:
+    """Слова в виде нажатий вместе с раскладкой, в которой их набирали; треть набрана не в той раскладке."""
+    rng = random.Random(1)
+    trace = []
+    for _ in range(WORDS):
+        language = rng.choice(tuple(TEXT))
+        word = rng.choice(TEXT[language].split())
+        table = tables.table(language)
+        strokes = []
+        for char in word:
+            vk, state = table.keys[char]
+            strokes.append((vk, state == STATE_SHIFT))
+        typed_in = language if rng.random() > 1 / 3 else next(layout for layout in TEXT if layout != language)
+        trace.append((typed_in, strokes))
+    return trace
+
+def percentile(values: list[int], p: float) -> int:
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def main():
+    tables = LayoutTables([make_table(layout) for layout in LAYOUTS])
+    directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "poppy", "resources", "ngrams")
+    scorer = IncrementalScorer(LayoutScorer(tables, directory), tables)
+    scorer.reset()
+    if len(scorer.layouts) < 2:
+        print(f"no bigram tables in {directory}")
+        return
+
+    trace = make_trace(tables)
+    push_ns: list[int] = []
+    boundary_ns: list[int] = []
+    switched = 0
+    clock = time.perf_counter_ns
+
+    for typed_in, strokes in trace:
+        for vk, shift in strokes:
+            start = clock()
+            scorer.push(vk, shift)
+            push_ns.append(clock() - start)
+
+        start = clock()
+        target = scorer.suggest(typed_in)
+        scorer.clear()
+        boundary_ns.append(clock() - start)
+        switched += target is not None
+
+    push_ns.sort()
+    boundary_ns.sort()
+    print(f"words:     {len(trace)} ({len(scorer.layouts)} layouts), switched {switched}")
+    for name, values in (("push", push_ns), ("boundary", boundary_ns)):
+        print(f"{name:9}  mean {sum(values) / len(values) / 1000:6.2f} us  "
+              f"p50 {percentile(values, 0.5) / 1000:6.2f} us  "
+              f"p99 {percentile(values, 0.99) / 1000:6.2f} us  "
+              f"max {values[-1] / 1000:7.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Время снимка и восстановления буфера обмена со всеми форматами при содержимом в несколько мегабайт.
+
+На Windows — настоящий буфер обмена (текст, «HTML Format», DIB и бинарный зарегистрированный формат);
+содержимое буфера пользователя сохраняется перед замером и возвращается после. На других системах —
+FakeClipboardBackend и копирование через copy_from_address/copy_to_address, которые использует Win32-бэкенд.
+
+Запуск: python benchmarks/bench_clipboard.py [--sizes 1 8 32] [--repeat 5]
+"""
+import argparse
+import ctypes
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.clipboard import (ClipboardSnapshot, FakeClipboardBackend, CF_UNICODETEXT, copy_from_address, copy_to_address,
+                             create_default_backend, encode_text)
+
+CF_DIB = 8
+
+def make_formats(size_mb: int, html_format: int, binary_format: int) -> list[tuple[int, memoryview]]:
+    """Текст, HTML и изображение примерно по трети размера — как при копировании из браузера."""
+    part = size_mb * 1024 * 1024 // 3
+    text = ("Poppy clipboard benchmark. Буфер обмена. " * (part // 80 + 1))[:part // 2]
+    html = memoryview(bytearray(b"Version:0.9\r\n<html><body>" + b"x" * part + b"</body></html>"))
+    # BITMAPINFOHEADER + пиксели; содержимое для замера не важно
+    dib = memoryview(bytearray(40 + part))
+    formats = [(CF_UNICODETEXT, encode_text(text)), (html_format, html), (CF_DIB, dib)]
+    if binary_format:
+        formats.append((binary_format, memoryview(bytearray(os.urandom(1024)))))
+    return formats
+
+def measure(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench_backend(backend, sizes: list[int], repeat: int, html_format: int, binary_format: int):
+    for size_mb in sizes:
+        formats = make_formats(size_mb, html_format, binary_format)
+        source = ClipboardSnapshot(formats)
+        backend.restore(source)
+
+        snapshot = backend.snapshot()
+        snapshot_ms = measure(backend.snapshot, repeat)
+        restore_ms = measure(lambda: backend.restore(snapshot), repeat)
+        text_ms = measure(backend.get_text, repeat)
+
+        restored = backend.snapshot()
+        intact = all(bytes(restored.get(format_id) or b"")[:data.nbytes] == bytes(data) for format_id, data in formats)
+        print(f"{size_mb:4} MB  formats {len(snapshot):2}  snapshot {snapshot_ms:8.2f} ms  restore {restore_ms:8.2f} ms  "
+              f"get_text {text_ms:8.2f} ms  intact {intact}")
+
+def bench_copies(sizes: list[int], repeat: int):
+    for size_mb in sizes:
+        size = size_mb * 1024 * 1024
+        source = (ctypes.c_char * size)()
+        target = (ctypes.c_char * size)()
+        address = ctypes.addressof(source)
+        copied = copy_from_address(address, size)
+        read_ms = measure(lambda: copy_from_address(address, size), repeat)
+        write_ms = measure(lambda: copy_to_address(ctypes.addressof(target), copied), repeat)
+        print(f"{size_mb:4} MB  copy_from_address {read_ms:8.2f} ms  copy_to_address {write_ms:8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Clipboard snapshot/restore benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32], help="clipboard contents, MB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        user32 = ctypes.windll.user32
+        user32.RegisterClipboardFormatW.restype = ctypes.c_uint
+        html_format = user32.RegisterClipboardFormatW("HTML Format")
+        binary_format = user32.RegisterClipboardFormatW("Poppy Benchmark")
+        backend = create_default_backend()
+        saved = backend.snapshot()
+        try:
+            print("Win32 clipboard")
+            bench_backend(backend, args.sizes, args.repeat, html_format, binary_format)
+        finally:
+            if saved is not None:
+                backend.restore(saved)
+    else:
+        print("Fake clipboard (no Win32)")
+        bench_backend(FakeClipboardBackend(), args.sizes, args.repeat, 0xC001, 0xC002)
+
+    print("Buffer copies used by the Win32 backend")
+    bench_copies(args.sizes, args.repeat)
+
+if __name__ == "__main__":
+    main()
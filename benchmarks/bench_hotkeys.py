@@ -0,0 +1,121 @@
+"""
+Сравнение поиска хоткеев: старый вариант (frozenset нажатых клавиш на каждое событие)
+и HotkeyMatcher (инкрементальная битовая маска + скомпилированные таблицы).
+
+Запуск: python benchmarks/bench_hotkeys.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.hooks._key import HotkeyType
+from poppy.hooks._hotkey_matcher import HotkeyMatcher
+
+EVENTS = 200_000
+
+HOTKEYS = [
+    (0xA2, 0xA0, 0x41),     # ctrl+shift+a
+    (0xA2, 0xA4, 0x56),     # ctrl+alt+v
+    (0xA0, 0x13),           # shift+pause
+    (0x5B, 0xA0, 0x53),     # win+shift+s
+    (0xA4, 0x20),           # alt+space
+    (0x13,),                # pause
+]
+
+class LegacyMatcher:
+    """Повторяет прежнюю логику Keyboard._on_press/_on_release."""
+    def __init__(self):
+        self._pressed: set[int] = set()
+        self._on_press: dict[frozenset[int], list] = {}
+        self._on_press_once: dict[frozenset[int], list] = {}
+        self._on_release: dict[frozenset[int], list] = {}
+        self._active_once: set[frozenset[int]] = set()
+
+    def add(self, codes, callback, hotkey_type: HotkeyType):
+        table = {
+            HotkeyType.ON_PRESS: self._on_press,
+            HotkeyType.ON_PRESS_ONCE: self._on_press_once,
+            HotkeyType.ON_RELEASE: self._on_release,
+        }[hotkey_type]
+        table.setdefault(frozenset(codes), []).append(callback)
+
+    def press(self, code: int):
+        self._pressed.add(code)
+        pressed_frozen = frozenset(self._pressed)
+        for callback in list(self._on_press.get(pressed_frozen, ())):
+            callback()
+        if pressed_frozen not in self._active_once:
+            self._active_once.add(pressed_frozen)
+            for callback in list(self._on_press_once.get(pressed_frozen, ())):
+                callback()
+
+    def release(self, code: int):
+        pressed_frozen = frozenset(self._pressed)
+        self._pressed.discard(code)
+        for callback in list(self._on_release.get(pressed_frozen, ())):
+            callback()
+        to_remove = set()
+        for hk in self._active_once:
+            if code in hk:
+                to_remove.add(hk)
+        self._active_once -= to_remove
+
+def make_trace(count: int) -> list[tuple[bool, int]]:
+    """Набор текста с периодическими хоткеями: (нажатие?, vk)."""
+    rnd = random.Random(42)
+    letters = list(range(0x41, 0x5B)) + [0x20]
+    trace = []
+    while len(trace) < count:
+        if rnd.random() < 0.1:
+            hotkey = rnd.choice(HOTKEYS)
+            trace.extend((True, vk) for vk in hotkey)
+            trace.extend((False, vk) for vk in reversed(hotkey))
+        else:
+            vk = rnd.choice(letters)
+            trace.append((True, vk))
+            trace.append((False, vk))
+    return trace[:count]
+
+def run(matcher, press, release, trace) -> float:
+    start = time.perf_counter()
+    for is_press, vk in trace:
+        if is_press:
+            press(vk)
+        else:
+            release(vk)
+    return len(trace) / (time.perf_counter() - start)
+
+def main():
+    trace = make_trace(EVENTS)
+    fired = [0, 0]
+
+    legacy = LegacyMatcher()
+    for hotkey in HOTKEYS:
+        for hotkey_type in HotkeyType:
+            legacy.add(hotkey, lambda: fired.__setitem__(0, fired[0] + 1), hotkey_type)
+
+    matcher = HotkeyMatcher("Bench")
+    for hotkey in HOTKEYS:
+        for hotkey_type in HotkeyType:
+            matcher.add([(vk,) for vk in hotkey], lambda: fired.__setitem__(1, fired[1] + 1), hotkey_type)
+
+    def matcher_press(vk):
+        matcher.press(vk)
+        matcher.trigger_press()
+
+    def matcher_release(vk):
+        matcher.trigger_release(matcher.release(vk), vk)
+
+    legacy_rate = run(legacy, legacy.press, legacy.release, trace)
+    matcher_rate = run(matcher, matcher_press, matcher_release, trace)
+
+    print(f"events:          {len(trace)}")
+    print(f"legacy frozenset: {legacy_rate:12,.0f} events/sec  (fired {fired[0]})")
+    print(f"bitmask matcher:  {matcher_rate:12,.0f} events/sec  (fired {fired[1]})")
+    print(f"speedup:          {matcher_rate / legacy_rate:.2f}x")
+
+if __name__ == "__main__":
+    main()
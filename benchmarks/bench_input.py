@@ -0,0 +1,45 @@
+"""
+Пакетная отправка ввода: перенабор слова по одному INPUT на вызов (как раньше)
+и одной скомпилированной последовательностью. Работает на любой платформе через RecordingBackend.
+
+Запуск: python benchmarks/bench_input.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.hooks import KeyStroke, InputSequence, CompiledInput, RecordingBackend
+
+ROUNDS = 2_000
+WORD = [KeyStroke(vk=0x41 + (i % 26), shift=(i % 5 == 0)) for i in range(20)]
+
+def retype_per_event(backend: RecordingBackend):
+    """Прежний вариант: backspace/keystroke по одному событию на вызов SendInput."""
+    sequence = InputSequence().backspace(len(WORD)).keystrokes(WORD)
+    for entry in sequence.compile().entries:
+        backend.send(CompiledInput((entry,)))
+
+def retype_batched(backend: RecordingBackend):
+    backend.send(InputSequence().backspace(len(WORD)).keystrokes(WORD).compile())
+
+def measure(name: str, func, backend: RecordingBackend):
+    backend.clear()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(backend)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {backend.calls / ROUNDS:6.1f} calls/word  {elapsed / ROUNDS * 1e6:8.1f} us/word")
+
+def main():
+    backend = RecordingBackend()
+    cached = InputSequence().backspace(len(WORD)).keystrokes(WORD).compile()
+
+    print(f"word: {len(WORD)} chars, {len(cached)} INPUT events")
+    measure("per-event SendInput", retype_per_event, backend)
+    measure("batched", retype_batched, backend)
+    measure("batched, cached", lambda b: b.send(cached), backend)
+
+if __name__ == "__main__":
+    main()
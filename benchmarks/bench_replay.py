@@ -0,0 +1,117 @@
+"""
+Воспроизведение логов событий хуков через Keyboard/Mouse без Win32: задержки по событиям и по подписчикам.
+
+    python benchmarks/bench_replay.py                     # синтетические трассы (набор текста + игровая мышь)
+    python benchmarks/bench_replay.py --log events.bin    # записанный лог
+    python benchmarks/bench_replay.py --alloc             # дополнительно выделения памяти на вызов
+    python benchmarks/bench_replay.py --save-traces DIR   # сохранить синтетические трассы в DIR
+    python benchmarks/bench_replay.py --record events.bin # (Windows) записать реальный ввод до Ctrl+C
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.hooks import EventRecorder, KeyEventType, KeyStroke, PRINTABLE_KEYS, WORD_BOUNDARY_KEYS, keys, read_events, write_events
+from poppy.hooks._keyboard import Keyboard
+from poppy.hooks._mouse import Mouse
+from poppy.hooks._replay import ReplayHarness, typing_trace, gaming_mouse_trace
+
+def subscribe(keyboard: Keyboard, mouse: Mouse):
+    """Подписчики с той же формой работы, что у KeyboardHandler и LayoutSwitcher (без Qt и Win32)."""
+    typed: list[KeyStroke] = []
+
+    def on_key(e):
+        # как LayoutSwitcher._do_on_key
+        if e.event_type == KeyEventType.RELEASE:
+            return
+        if e.key == keys.backspace:
+            if typed:
+                typed.pop()
+        elif e.key in WORD_BOUNDARY_KEYS:
+            typed.clear()
+        elif e.key in PRINTABLE_KEYS:
+            if keyboard.is_ctrl_pressed() or keyboard.is_alt_pressed():
+                typed.clear()
+            else:
+                typed.append(KeyStroke(vk=e.key.vk, shift=keyboard.is_shift_pressed()))
+
+    modifiers = {"ctrl": False, "alt": False, "shift": False}
+
+    def modifier(name):
+        def on_modifier(e):
+            modifiers[name] = e.event_type == KeyEventType.PRESS
+        on_modifier.__qualname__ = f"on_{name}"
+        return on_modifier
+
+    keyboard.hook(on_key)
+    for key, name in ((keys.left_ctrl, "ctrl"), (keys.right_ctrl, "ctrl"), (keys.left_alt, "alt"),
+                      (keys.right_alt, "alt"), (keys.left_shift, "shift"), (keys.right_shift, "shift")):
+        keyboard.hook_key(key, modifier(name))
+    keyboard.hook_hotkey("pause", lambda: None)
+    keyboard.hook_hotkey("ctrl+v", lambda: None)
+    keyboard.hook_hotkey([keys.caps_lock], lambda: None)
+
+    def on_click(e):
+        typed.clear()
+    mouse.hook(on_click)
+
+def record(path: str):
+    from poppy.hooks import keyboard, mouse
+
+    recorder = EventRecorder()
+    recorder.start(path)
+    keyboard.set_recorder(recorder)
+    mouse.set_recorder(recorder)
+    keyboard.acquire_hook("recorder")
+    mouse.acquire_hook("recorder")
+    print(f"Recording to {path}, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        keyboard.release_hook("recorder")
+        mouse.release_hook("recorder")
+        recorder.stop()
+    print(f"{recorder.count} events recorded")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log", help="replay a recorded event log")
+    parser.add_argument("--alloc", action="store_true", help="measure allocations per subscriber call")
+    parser.add_argument("--save-traces", metavar="DIR", help="write synthetic traces to DIR")
+    parser.add_argument("--record", metavar="PATH", help="record live input (Windows only)")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    if args.log:
+        traces = {os.path.basename(args.log): list(read_events(args.log))}
+    else:
+        traces = {
+            "typing": typing_trace(words=2000),
+            "gaming mouse": gaming_mouse_trace(seconds=20),
+        }
+
+    if args.save_traces:
+        os.makedirs(args.save_traces, exist_ok=True)
+        for name, events in traces.items():
+            write_events(os.path.join(args.save_traces, name.replace(" ", "_") + ".bin"), events)
+
+    keyboard, mouse = Keyboard(), Mouse()
+    subscribe(keyboard, mouse)
+    harness = ReplayHarness(keyboard, mouse)
+
+    for name, events in traces.items():
+        print(f"=== {name} ===")
+        print(harness.run(events, track_allocations=args.alloc).format())
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,11 @@ from .ui.popups import PopupManager, KeyboardPopup, VolumePopup, MediaInfoPopup,
 from .ui import MainWindow
 from .tray_manager import TrayManager
 from .language_handler import LanguageHandler
+from .layout_state import LayoutState
+from .layout_memory import LayoutMemory
 from .layout_switcher import LayoutSwitcher
+from .clipboard import Clipboard
+from .hook_diagnostics import HookDiagnostics
 from .utils import Utils
 from .translations import localizer as loc, translations as trans
 
@@ -63,10 +67,17 @@ class App(QObject):
         self._keyboard_popup_cursor: KeyboardPopupCursor = KeyboardPopupCursor(50, 30, False, False)
 
         self._language_handler: LanguageHandler = LanguageHandler()
+        self._layout_state: LayoutState = LayoutState(self._language_handler)
+        self._clipboard: Clipboard = Clipboard()
         self._keyboard_handler: KeyboardHandler = KeyboardHandler()
         self._layout_switcher: LayoutSwitcher = LayoutSwitcher()
+        self._layout_memory: LayoutMemory = LayoutMemory(self._layout_state)
+        self._hook_diagnostics: HookDiagnostics = HookDiagnostics()
 
-        self._current_layout = self._language_handler.get_layout()
+        self._current_layout = self._layout_state.layout
+        self._layout_state.layout_changed.connect(self.show_layout)
+        self._audio_manager.volume_state_changed.connect(self._on_volume_state_changed)
+        self._audio_manager.volume_commands_applied.connect(self._on_volume_commands_applied)
 
         icon_path = Utils.get_resource_path('icon.ico')
         self._qt_app.setWindowIcon(QIcon(icon_path))
@@ -105,9 +116,25 @@ class App(QObject):
     def language_handler(self) -> LanguageHandler:
         return self._language_handler
 
+    @property
+    def layout_state(self) -> LayoutState:
+        return self._layout_state
+
+    @property
+    def clipboard(self) -> Clipboard:
+        return self._clipboard
+
     @property
     def layout_switcher(self) -> LayoutSwitcher:
         return self._layout_switcher
+
+    @property
+    def layout_memory(self) -> LayoutMemory:
+        return self._layout_memory
+
+    @property
+    def hook_diagnostics(self) -> HookDiagnostics:
+        return self._hook_diagnostics
     
     def call_soon(self, callback, *args):
         self._loop.call_soon(callback, *args)
@@ -115,10 +142,8 @@ class App(QObject):
     def call_soon_threadsafe(self, callback, *args):
         self._loop.call_soon_threadsafe(callback, *args)
 
-    def show_layout(self, layout: int | None = None):
-        if layout is None:
-            layout = self._language_handler.get_layout()
-        
+    def show_layout(self, layout: int):
+        # Вызывается по layout_changed: LayoutState публикует смену один раз, даже если уведомлений было несколько
         if layout == self._current_layout:
             return
 
@@ -155,6 +180,16 @@ class App(QObject):
         if config.volume_window.show_media.value and (not self.media_popup.isVisible() or not self.media_popup.is_active):
             self.media_popup.show_popup()
 
+    def _on_volume_state_changed(self, state, external: bool):
+        if external and config.volume_window.show_external.value:
+            self._volume_popup.show_popup()
+        else:
+            self._volume_popup.update_state(not external)
+
+    def _on_volume_commands_applied(self, show_popup: bool):
+        if show_popup:
+            self.show_volume_popup()
+
     def show_media_popup(self):
         self._media_popup.show_popup()
 
@@ -172,6 +207,8 @@ class App(QObject):
     def run(self):
         # Запускаем мониторинг медиа-сессий после старта цикла
         self._loop.call_soon(self._media_popup.start)
+        self._loop.call_soon(self._layout_state.start)
+        self._loop.call_soon(self._audio_manager.start)
         self._loop.call_soon(self._keyboard_handler.start)
         self._loop.call_soon(self._layout_switcher.start)
         
@@ -190,5 +227,7 @@ class App(QObject):
     def cleanup(self):
         self._keyboard_handler.stop()
         self._layout_switcher.stop()
+        self._layout_state.stop()
+        self._audio_manager.close()
 
 _instance: App | None = None
\ No newline at end of file
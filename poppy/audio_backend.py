@@ -0,0 +1,690 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ctypes
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, NamedTuple
+
+FLOW_RENDER = 0
+FLOW_CAPTURE = 1
+
+DEVICE_STATE_ACTIVE = 0x1
+
+ROLE_CONSOLE = 0
+ROLE_MULTIMEDIA = 1
+ROLE_COMMUNICATIONS = 2
+
+# Причины уведомлений об устройствах (listener(reason, device_id))
+DEVICE_DEFAULT_CHANGED = "default"
+DEVICE_ADDED = "added"
+DEVICE_REMOVED = "removed"
+DEVICE_STATE_CHANGED = "state"
+DEVICE_NAME_CHANGED = "name"
+
+DeviceListener = Callable[[str, str | None], None]
+# (громкость 0..1, mute, изменено не нами) — вызывается в потоке COM
+VolumeListener = Callable[[float, bool, bool], None]
+
+class AudioDeviceInfo(NamedTuple):
+    id: str
+    name: str
+    flow: int = FLOW_RENDER
+    state: int = DEVICE_STATE_ACTIVE
+
+class VolumeState(NamedTuple):
+    level: float = 0.0
+    mute: bool = False
+    device_id: str | None = None
+    device_name: str = ""
+
+    @property
+    def volume(self) -> int:
+        return int(round(self.level * 100))
+
+class AudioEndpoint:
+    """Устройство вывода с уже активированным интерфейсом громкости; громкость — доля от 0 до 1."""
+    @property
+    def id(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def name(self) -> str:
+        raise NotImplementedError
+
+    def get_volume(self) -> float:
+        raise NotImplementedError
+
+    def set_volume(self, level: float):
+        raise NotImplementedError
+
+    def get_mute(self) -> bool:
+        raise NotImplementedError
+
+    def set_mute(self, mute: bool):
+        raise NotImplementedError
+
+    def set_volume_listener(self, listener: VolumeListener | None):
+        """Подписка на изменения громкости и mute; снимать нужно в том же потоке, где подписались."""
+        raise NotImplementedError
+
+class AudioBackend:
+    """
+    Доступ к аудиоустройствам системы. Уведомления об устройствах приходят в listener из потока COM,
+    поэтому слушатель должен только отметить изменение и не трогать COM-объекты.
+    """
+    def get_default_endpoint(self) -> AudioEndpoint | None:
+        raise NotImplementedError
+
+    def get_devices(self, flow: int = FLOW_RENDER) -> list[AudioDeviceInfo]:
+        """Активные устройства."""
+        raise NotImplementedError
+
+    def get_device(self, device_id: str) -> AudioDeviceInfo | None:
+        """Устройство в любом состоянии; None, если его больше нет."""
+        raise NotImplementedError
+
+    def get_default_device_id(self, flow: int, role: int) -> str | None:
+        raise NotImplementedError
+
+    def set_default_device(self, device_id: str, communications: bool = False):
+        raise NotImplementedError
+
+    def set_device_listener(self, listener: DeviceListener | None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class PycawAudioEndpoint(AudioEndpoint):
+    def __init__(self, device_id: str, name: str, volume, event_context):
+        self._id = device_id
+        self._name = name
+        self._volume = volume
+        # Своим изменениям передаём этот GUID, чтобы в уведомлениях отличать их от чужих
+        self._event_context = event_context
+        self._callback = None
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def get_volume(self) -> float:
+        return self._volume.GetMasterVolumeLevelScalar()
+
+    def set_volume(self, level: float):
+        self._volume.SetMasterVolumeLevelScalar(level, ctypes.byref(self._event_context))
+
+    def get_mute(self) -> bool:
+        return self._volume.GetMute() == 1
+
+    def set_mute(self, mute: bool):
+        self._volume.SetMute(1 if mute else 0, ctypes.byref(self._event_context))
+
+    def set_volume_listener(self, listener: VolumeListener | None):
+        if self._callback is not None:
+            self._volume.UnregisterControlChangeNotify(self._callback)
+            self._callback = None
+
+        if listener is not None:
+            from pycaw.callbacks import AudioEndpointVolumeCallback
+            own_context = self._event_context
+
+            class VolumeCallback(AudioEndpointVolumeCallback):
+                def on_notify(self, new_volume, new_mute, event_context, channels, channel_volumes):
+                    try:
+                        listener(new_volume, bool(new_mute), event_context.contents != own_context)
+                    except Exception as e:
+                        print(f"[AudioBackend] Volume listener error: {e}")
+
+            self._callback = VolumeCallback()
+            self._volume.RegisterControlChangeNotify(self._callback)
+
+class PycawAudioBackend(AudioBackend):
+    """Core Audio через pycaw: один перечислитель устройств на всё время работы и IMMNotificationClient."""
+    FRIENDLY_NAME_FMTID = "{A45C254E-DF1C-4EFD-8020-67D146A850E0}"
+    FRIENDLY_NAME_PID = 14
+
+    def __init__(self):
+        import comtypes
+        from pycaw.pycaw import AudioUtilities
+        from pycaw.constants import ERole, STGM
+        from pycaw.api.endpointvolume import IAudioEndpointVolume
+        from pycaw.api.mmdeviceapi import IMMEndpoint
+        from pycaw.api.mmdeviceapi.depend.structures import PROPERTYKEY
+
+        self._comtypes = comtypes
+        self._utilities = AudioUtilities
+        self._roles = ERole
+        self._stgm_read = STGM.STGM_READ.value
+        self._volume_interface = IAudioEndpointVolume
+        self._endpoint_interface = IMMEndpoint
+        self._name_key = PROPERTYKEY()
+        self._name_key.fmtid = comtypes.GUID(self.FRIENDLY_NAME_FMTID)
+        self._name_key.pid = self.FRIENDLY_NAME_PID
+
+        self._event_context = comtypes.GUID.create_new()
+        self._enumerator = AudioUtilities.GetDeviceEnumerator()
+        self._listener: DeviceListener | None = None
+        self._client = None
+
+    def get_default_endpoint(self) -> AudioEndpoint | None:
+        device = self._enumerator.GetDefaultAudioEndpoint(FLOW_RENDER, self._roles.eMultimedia.value)
+        if device is None:
+            return None
+        volume = device.Activate(self._volume_interface._iid_, self._comtypes.CLSCTX_ALL, None)
+        volume = volume.QueryInterface(self._volume_interface)
+        return PycawAudioEndpoint(device.GetId(), self._get_name(device), volume, self._event_context)
+
+    def get_devices(self, flow: int = FLOW_RENDER) -> list[AudioDeviceInfo]:
+        # Читаем только имя, а не все свойства устройства, как AudioUtilities.CreateDevice
+        collection = self._enumerator.EnumAudioEndpoints(flow, DEVICE_STATE_ACTIVE)
+        devices = []
+        for i in range(collection.GetCount()):
+            device = collection.Item(i)
+            devices.append(AudioDeviceInfo(device.GetId(), self._get_name(device), flow, device.GetState()))
+        return devices
+
+    def get_device(self, device_id: str) -> AudioDeviceInfo | None:
+        try:
+            device = self._enumerator.GetDevice(device_id)
+            flow = device.QueryInterface(self._endpoint_interface).GetDataFlow()
+            return AudioDeviceInfo(device_id, self._get_name(device), flow, device.GetState())
+        except self._comtypes.COMError:
+            return None
+
+    def get_default_device_id(self, flow: int, role: int) -> str | None:
+        try:
+            return self._enumerator.GetDefaultAudioEndpoint(flow, role).GetId()
+        except self._comtypes.COMError:
+            # Нет ни одного устройства этого направления
+            return None
+
+    def set_default_device(self, device_id: str, communications: bool = False):
+        roles = [self._roles.eConsole, self._roles.eCommunications] if communications else None
+        self._utilities.SetDefaultDevice(device_id, roles)
+
+    def set_device_listener(self, listener: DeviceListener | None):
+        if self._client is not None:
+            self._enumerator.UnregisterEndpointNotificationCallback(self._client)
+            self._client = None
+
+        self._listener = listener
+        if listener is not None:
+            self._client = self._create_notification_client()
+            self._enumerator.RegisterEndpointNotificationCallback(self._client)
+
+    def close(self):
+        self.set_device_listener(None)
+
+    def _get_name(self, device) -> str:
+        try:
+            store = device.OpenPropertyStore(self._stgm_read)
+            value = store.GetValue(self._name_key)
+            name = value.GetValue()
+            value.clear()
+            return name if isinstance(name, str) else ""
+        except Exception as e:
+            print(f"[AudioBackend] Failed to read device name: {e}")
+            return ""
+
+    def _notify(self, reason: str, device_id: str | None):
+        listener = self._listener
+        if listener is None:
+            return
+        try:
+            listener(reason, device_id)
+        except Exception as e:
+            print(f"[AudioBackend] Device listener error: {e}")
+
+    def _create_notification_client(self):
+        from pycaw.callbacks import MMNotificationClient
+        backend = self
+
+        class NotificationClient(MMNotificationClient):
+            def on_default_device_changed(self, flow, flow_id, role, role_id, default_device_id):
+                backend._notify(DEVICE_DEFAULT_CHANGED, default_device_id)
+
+            def on_device_added(self, added_device_id):
+                backend._notify(DEVICE_ADDED, added_device_id)
+
+            def on_device_removed(self, removed_device_id):
+                backend._notify(DEVICE_REMOVED, removed_device_id)
+
+            def on_device_state_changed(self, device_id, new_state, new_state_id):
+                backend._notify(DEVICE_STATE_CHANGED, device_id)
+
+            def on_property_value_changed(self, device_id, property_struct, fmtid, pid):
+                # Свойства меняются часто (формат, громкость); нас интересует только имя
+                if pid == backend.FRIENDLY_NAME_PID and str(fmtid).upper() == backend.FRIENDLY_NAME_FMTID:
+                    backend._notify(DEVICE_NAME_CHANGED, device_id)
+
+        return NotificationClient()
+
+class FakeAudioEndpoint(AudioEndpoint):
+    def __init__(self, backend: "FakeAudioBackend", device: AudioDeviceInfo):
+        self._backend = backend
+        self._device = device
+        self._listener: VolumeListener | None = None
+
+    @property
+    def id(self) -> str:
+        return self._device.id
+
+    @property
+    def name(self) -> str:
+        return self._device.name
+
+    def get_volume(self) -> float:
+        self._backend.calls += 1
+        return self._backend.volumes.get(self._device.id, 0.0)
+
+    def set_volume(self, level: float):
+        self._backend.calls += 1
+        self._backend.volumes[self._device.id] = level
+        self.notify(False)
+
+    def get_mute(self) -> bool:
+        self._backend.calls += 1
+        return self._backend.mutes.get(self._device.id, False)
+
+    def set_mute(self, mute: bool):
+        self._backend.calls += 1
+        self._backend.mutes[self._device.id] = mute
+        self.notify(False)
+
+    def set_volume_listener(self, listener: VolumeListener | None):
+        self._backend.calls += 1
+        self._listener = listener
+        if listener is None:
+            self._backend.endpoints.discard(self)
+        else:
+            self._backend.endpoints.add(self)
+
+    def notify(self, external: bool):
+        listener = self._listener
+        if listener is not None:
+            listener(self._backend.volumes.get(self._device.id, 0.0), self._backend.mutes.get(self._device.id, False),
+                     external)
+
+class FakeAudioBackend(AudioBackend):
+    """
+    Устройства в памяти — для проверок и бенчмарков без Windows. calls считает обращения к «COM»,
+    resolve_delay имитирует цену поиска устройства и активации интерфейса громкости,
+    switch_delay — переключения устройства по умолчанию.
+    simulate_* делают то же, что система, и вызывают слушателя из отдельного потока, как COM.
+    """
+    def __init__(self, devices: list[AudioDeviceInfo] | None = None, resolve_delay: float = 0.0,
+                 switch_delay: float = 0.0):
+        self._lock = threading.Lock()
+        self._devices: dict[str, AudioDeviceInfo] = {device.id: device for device in devices or []}
+        self._default_id: str | None = next((device.id for device in self._devices.values()
+                                             if device.flow == FLOW_RENDER), None)
+        self._listener: DeviceListener | None = None
+        self.resolve_delay = resolve_delay
+        self.switch_delay = switch_delay
+        self.calls = 0
+        self.resolves = 0
+        self.volumes: dict[str, float] = {}
+        self.mutes: dict[str, bool] = {}
+        self.default_history: list[str] = []
+        # Конечные точки с подпиской на громкость
+        self.endpoints: set[FakeAudioEndpoint] = set()
+
+    @property
+    def default_id(self) -> str | None:
+        return self._default_id
+
+    def get_default_endpoint(self) -> AudioEndpoint | None:
+        self.calls += 1
+        self.resolves += 1
+        if self.resolve_delay:
+            time.sleep(self.resolve_delay)
+        with self._lock:
+            device = self._devices.get(self._default_id) if self._default_id else None
+        return FakeAudioEndpoint(self, device) if device is not None else None
+
+    def get_devices(self, flow: int = FLOW_RENDER) -> list[AudioDeviceInfo]:
+        with self._lock:
+            devices = [device for device in self._devices.values()
+                       if device.flow == flow and device.state == DEVICE_STATE_ACTIVE]
+        # Перечисление и чтение имени каждого устройства
+        self.calls += 1 + len(devices)
+        return devices
+
+    def get_device(self, device_id: str) -> AudioDeviceInfo | None:
+        self.calls += 1
+        with self._lock:
+            return self._devices.get(device_id)
+
+    def get_default_device_id(self, flow: int, role: int) -> str | None:
+        self.calls += 1
+        if flow == FLOW_RENDER:
+            return self._default_id
+        with self._lock:
+            return next((device.id for device in self._devices.values() if device.flow == flow), None)
+
+    def set_default_device(self, device_id: str, communications: bool = False):
+        self.calls += 1
+        with self._lock:
+            device = self._devices.get(device_id)
+        if device is None:
+            raise OSError(f"Unknown device {device_id}")
+        if self.switch_delay:
+            time.sleep(self.switch_delay)
+        self.default_history.append(device_id)
+        if device.flow == FLOW_RENDER:
+            self.simulate_default_changed(device_id)
+
+    def set_device_listener(self, listener: DeviceListener | None):
+        self._listener = listener
+
+    def simulate_volume(self, device_id: str, level: float | None = None, mute: bool | None = None,
+                        delay: float = 0.0):
+        """Громкость меняет другая программа или микшер Windows."""
+        def run():
+            if level is not None:
+                self.volumes[device_id] = level
+            if mute is not None:
+                self.mutes[device_id] = mute
+            for endpoint in list(self.endpoints):
+                if endpoint.id == device_id:
+                    endpoint.notify(True)
+
+        self._run_later(delay, run)
+
+    def simulate_default_changed(self, device_id: str, delay: float = 0.0):
+        def change():
+            with self._lock:
+                self._default_id = device_id
+        self._later(delay, change, DEVICE_DEFAULT_CHANGED, device_id)
+
+    def simulate_added(self, device: AudioDeviceInfo, delay: float = 0.0):
+        def add():
+            with self._lock:
+                self._devices[device.id] = device
+        self._later(delay, add, DEVICE_ADDED, device.id)
+
+    def simulate_removed(self, device_id: str, delay: float = 0.0):
+        def remove():
+            with self._lock:
+                self._devices.pop(device_id, None)
+                if self._default_id == device_id:
+                    self._default_id = next((device.id for device in self._devices.values()
+                                             if device.flow == FLOW_RENDER), None)
+        self._later(delay, remove, DEVICE_REMOVED, device_id)
+
+    def simulate_renamed(self, device_id: str, name: str, delay: float = 0.0):
+        def rename():
+            with self._lock:
+                if device_id in self._devices:
+                    self._devices[device_id] = self._devices[device_id]._replace(name=name)
+        self._later(delay, rename, DEVICE_NAME_CHANGED, device_id)
+
+    def _later(self, delay: float, change: Callable[[], None], reason: str, device_id: str):
+        def run():
+            change()
+            listener = self._listener
+            if listener is not None:
+                listener(reason, device_id)
+
+        self._run_later(delay, run)
+
+    @staticmethod
+    def _run_later(delay: float, run: Callable[[], None]):
+        if delay <= 0:
+            run()
+            return
+        timer = threading.Timer(delay, run)
+        timer.daemon = True
+        timer.start()
+
+class EndpointCache:
+    """
+    Устройство вывода по умолчанию вместе с его интерфейсом громкости и именем. Ищется заново только после
+    уведомления об устройствах: слушатель из потока COM лишь увеличивает счётчик поколений,
+    а сам объект пересоздаётся при следующем обращении в потоке, который им пользуется.
+    """
+    def __init__(self, backend: AudioBackend):
+        self._backend = backend
+        self._endpoint: AudioEndpoint | None = None
+        self._generation = 0
+        self._endpoint_generation = -1
+        self._listeners: list[DeviceListener] = []
+        backend.set_device_listener(self._on_device_event)
+
+    @property
+    def backend(self) -> AudioBackend:
+        return self._backend
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def add_listener(self, listener: DeviceListener):
+        """Дополнительный слушатель уведомлений (вызывается в потоке COM)."""
+        self._listeners.append(listener)
+
+    def get(self) -> AudioEndpoint | None:
+        generation = self._generation
+        if self._endpoint_generation != generation:
+            self._endpoint = None
+            try:
+                self._endpoint = self._backend.get_default_endpoint()
+            except Exception as e:
+                print(f"[AudioManager] Failed to get default audio endpoint: {e}")
+            self._endpoint_generation = generation
+        return self._endpoint
+
+    def invalidate(self):
+        self._generation += 1
+
+    def close(self):
+        self._backend.set_device_listener(None)
+        self._backend.close()
+        self._endpoint = None
+
+    def _on_device_event(self, reason: str, device_id: str | None):
+        # Имя и состояние важны, только если это текущее устройство; добавление другого устройства его не меняет
+        endpoint = self._endpoint
+        if reason in (DEVICE_DEFAULT_CHANGED, DEVICE_REMOVED) or endpoint is None or endpoint.id == device_id:
+            self._generation += 1
+        for listener in self._listeners:
+            listener(reason, device_id)
+
+class DeviceCatalog:
+    """
+    Устройства обоих направлений (id, имя, направление, состояние) и устройства по умолчанию для каждой роли.
+    Заполняется один раз, дальше обновляется по уведомлениям: mark() из потока COM только запоминает,
+    что изменилось, а apply_pending() в потоке владельца перечитывает лишь эти устройства.
+    """
+    FLOWS = (FLOW_RENDER, FLOW_CAPTURE)
+    ROLES = (ROLE_CONSOLE, ROLE_MULTIMEDIA, ROLE_COMMUNICATIONS)
+
+    def __init__(self, backend: AudioBackend):
+        self._backend = backend
+        self._devices: dict[str, AudioDeviceInfo] = {}
+        self._defaults: dict[tuple[int, int], str | None] = {}
+        self._loaded = False
+        self._revision = 0
+
+        self._lock = threading.Lock()
+        self._pending_ids: set[str] = set()
+        self._pending_defaults = False
+        self._pending_reload = False
+
+    @property
+    def revision(self) -> int:
+        """Растёт при каждом изменении — потребители сравнивают его с последним показанным."""
+        return self._revision
+
+    def devices(self, flow: int = FLOW_RENDER) -> list[AudioDeviceInfo]:
+        """Активные устройства в порядке перечисления системой."""
+        self._ensure_loaded()
+        return [device for device in self._devices.values()
+                if device.flow == flow and device.state == DEVICE_STATE_ACTIVE]
+
+    def get(self, device_id: str) -> AudioDeviceInfo | None:
+        self._ensure_loaded()
+        return self._devices.get(device_id)
+
+    def default_id(self, flow: int = FLOW_RENDER, role: int = ROLE_MULTIMEDIA) -> str | None:
+        self._ensure_loaded()
+        return self._defaults.get((flow, role))
+
+    def mark(self, reason: str, device_id: str | None):
+        """Поток COM: запомнить изменение, ничего не читая."""
+        with self._lock:
+            if reason == DEVICE_DEFAULT_CHANGED:
+                self._pending_defaults = True
+            elif device_id:
+                self._pending_ids.add(device_id)
+                # Удалённое или отключённое устройство могло быть устройством по умолчанию
+                if reason in (DEVICE_REMOVED, DEVICE_STATE_CHANGED):
+                    self._pending_defaults = True
+            else:
+                self._pending_reload = True
+
+    def reload(self):
+        with self._lock:
+            self._pending_reload = True
+
+    def apply_pending(self) -> bool:
+        """Перечитать изменившееся; True — если каталог изменился."""
+        with self._lock:
+            ids, self._pending_ids = self._pending_ids, set()
+            defaults, self._pending_defaults = self._pending_defaults, False
+            reload, self._pending_reload = self._pending_reload, False
+
+        if not self._loaded:
+            return False
+        if reload:
+            self._loaded = False
+            self._ensure_loaded()
+            return True
+
+        changed = False
+        for device_id in ids:
+            try:
+                device = self._backend.get_device(device_id)
+            except Exception as e:
+                print(f"[AudioManager] Failed to read device {device_id}: {e}")
+                continue
+            if device is None:
+                changed |= self._devices.pop(device_id, None) is not None
+            elif self._devices.get(device_id) != device:
+                self._devices[device_id] = device
+                changed = True
+        if defaults:
+            changed |= self._load_defaults()
+
+        if changed:
+            self._revision += 1
+        return changed
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self._devices.clear()
+        for flow in self.FLOWS:
+            try:
+                for device in self._backend.get_devices(flow):
+                    self._devices[device.id] = device
+            except Exception as e:
+                print(f"[AudioManager] Failed to enumerate devices: {e}")
+        self._load_defaults()
+        self._revision += 1
+
+    def _load_defaults(self) -> bool:
+        defaults = {}
+        for flow in self.FLOWS:
+            for role in self.ROLES:
+                try:
+                    defaults[(flow, role)] = self._backend.get_default_device_id(flow, role)
+                except Exception as e:
+                    print(f"[AudioManager] Failed to get default device: {e}")
+                    defaults[(flow, role)] = None
+        changed = defaults != self._defaults
+        self._defaults = defaults
+        return changed
+
+class AudioWorker:
+    """
+    Отдельный поток COM (MTA) для медленных операций с устройствами — переключение устройства по умолчанию
+    с Bluetooth и HDMI может занимать сотни миллисекунд. Задачи выполняются по очереди со своим бэкендом потока,
+    результат возвращается Future; его обработчики вызываются в потоке воркера.
+    """
+    def __init__(self, backend_factory: Callable[[], AudioBackend]):
+        self._backend_factory = backend_factory
+        self._queue: queue.SimpleQueue[tuple[Future, Callable[..., Any], tuple] | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, function: Callable[..., Any], *args) -> Future:
+        """Выполнить function(backend, *args) в потоке воркера."""
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="AudioWorker", daemon=True)
+                self._thread.start()
+        self._queue.put((future, function, args))
+        return future
+
+    def close(self, timeout: float = 1.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _run(self):
+        com_initialized = self._init_com()
+        backend = None
+        try:
+            while True:
+                task = self._queue.get()
+                if task is None:
+                    break
+                future, function, args = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if backend is None:
+                        backend = self._backend_factory()
+                    future.set_result(function(backend, *args))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            # COM-объекты потока освобождаются в нём же
+            backend = None
+            if com_initialized:
+                import comtypes
+                comtypes.CoUninitialize()
+
+    @staticmethod
+    def _init_com() -> bool:
+        if sys.platform != "win32":
+            return False
+        import comtypes
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        return True
+
+def create_default_backend() -> AudioBackend:
+    if sys.platform == "win32":
+        return PycawAudioBackend()
+    return FakeAudioBackend()
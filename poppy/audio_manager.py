@@ -8,64 +8,167 @@
 #
 # You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from pycaw.constants import EDataFlow, DEVICE_STATE, ERole
-from pycaw.pycaw import AudioUtilities
+import threading
+import time
+from concurrent.futures import Future
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from .audio_backend import (AudioBackend, AudioEndpoint, AudioWorker, DeviceCatalog, EndpointCache, FLOW_CAPTURE,
+                            FLOW_RENDER, VolumeState, create_default_backend)
 from .config import config
+from .volume_commands import VolumeCommand
 
-class AudioManager:
+# Уведомления о громкости приходят пачками (ползунок микшера, колесо), публикуем не чаще раза за кадр;
+# так же редко пишем громкость в устройство
+FRAME_MS = 16
+
+class AudioManager(QObject):
+    """
+    Громкость и переключение устройств вывода. Устройство по умолчанию, его интерфейс громкости и имя
+    хранятся в EndpointCache и ищутся заново только после уведомления о смене устройств,
+    поэтому нажатие клавиши громкости и показ окна не создают COM-объекты каждый раз.
+
+    Громкость и mute хранятся в VolumeState: свои изменения записываются в него сразу, чужие (другие программы,
+    микшер, кнопки на устройстве) приходят уведомлениями из потока COM и публикуются в GUI-потоке
+    сигналом volume_state_changed не чаще раза за кадр.
+
+    Клавиши громкости, ползунок окна и другие источники не пишут в устройство сами, а добавляют команды
+    (change_volume, request_volume, request_toggle_mute) из любого потока. Команды за кадр сводятся
+    в одну VolumeCommand и применяются одной записью громкости и mute; последняя команда применяется всегда —
+    по таймеру или сразу через flush_volume.
+
+    Переключение устройства выполняется в AudioWorker (поток COM MTA). Состояние сразу получает имя целевого
+    устройства из каталога, а после завершения сверяется с системой — и при успехе, и при ошибке.
+
+    DeviceCatalog хранит список устройств и устройства по умолчанию; уведомления обновляют в нём только
+    изменившиеся устройства, а потребители (меню в трее, страница настроек) получают devices_changed
+    и обновляют только отличающиеся пункты.
+    """
+    # Новое состояние и было ли оно изменено другой программой (а не сменой устройства)
+    volume_state_changed = pyqtSignal(object, bool)
+    # Команды применены; True — среди них были команды, после которых нужно показать окно громкости
+    volume_commands_applied = pyqtSignal(bool)
+    # Изменился каталог устройств (добавление, удаление, имя, состояние, устройство по умолчанию)
+    devices_changed = pyqtSignal()
+
+    def __init__(self, backend: AudioBackend | None = None):
+        super().__init__()
+        from .app import App
+        self._app = App.instance()
+
+        # Переданный бэкенд (например, FakeAudioBackend) общий, системному в потоке воркера нужен свой экземпляр
+        self._worker = AudioWorker((lambda: backend) if backend is not None else create_default_backend)
+        self._cache = EndpointCache(backend or create_default_backend())
+        self._cache.add_listener(self._on_device_event)
+        self._catalog = DeviceCatalog(self._cache.backend)
+        self._pending_switches = 0
+        # Устройство, на громкость которого подписаны, и его состояние
+        self._endpoint: AudioEndpoint | None = None
+        self._state = VolumeState()
+
+        # Поля ниже меняются из потока COM
+        self._lock = threading.Lock()
+        self._pending_volume: tuple[AudioEndpoint, float, bool] | None = None
+        self._pending_device = False
+        self._publish_scheduled = False
+
+        self._publish_timer = QTimer(self)
+        self._publish_timer.setSingleShot(True)
+        self._publish_timer.setInterval(FRAME_MS)
+        self._publish_timer.timeout.connect(self._publish)
+
+        # Команды добавляются из потока хуков и GUI-потока
+        self._command = VolumeCommand()
+        self._flush_scheduled = False
+        self._last_write = 0.0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush_volume)
+
+    @property
+    def backend(self) -> AudioBackend:
+        return self._cache.backend
+
+    @property
+    def catalog(self) -> DeviceCatalog:
+        return self._catalog
+
+    @property
+    def volume_state(self) -> VolumeState:
+        """Текущее состояние без обращения к COM (кроме первого раза после смены устройства)."""
+        self._sync()
+        return self._state
+
+    def change_volume(self, steps: int, show_popup: bool = False):
+        """Изменить громкость на steps шагов из настроек (можно из любого потока)."""
+        self._add_command(lambda command: command.add_steps(steps), show_popup)
+
+    def request_volume(self, value: int, show_popup: bool = False):
+        """Установить громкость 0..100 (можно из любого потока)."""
+        self._add_command(lambda command: command.set_volume(max(0, min(value, 100))), show_popup)
+
+    def request_toggle_mute(self, show_popup: bool = False):
+        self._add_command(lambda command: command.add_toggle_mute(), show_popup)
+
+    def flush_volume(self):
+        """Сразу применить накопленные команды (GUI-поток)."""
+        self._flush_timer.stop()
+        with self._lock:
+            command, self._command = self._command, VolumeCommand()
+            self._flush_scheduled = False
+        if command.is_empty():
+            return
+
+        def apply(endpoint: AudioEndpoint):
+            volume, mute = command.apply(self._state.volume, self._state.mute, config.volume_window.step.value)
+            if volume != self._state.volume:
+                endpoint.set_volume(volume * 0.01)
+            if mute != self._state.mute:
+                endpoint.set_mute(mute)
+            self._state = self._state._replace(level=volume * 0.01, mute=mute)
+
+        self._call(apply)
+        self._last_write = time.monotonic()
+        self.volume_commands_applied.emit(command.show_popup)
 
     def volume_up(self) -> int:
-        volume = self._get_current_audio_interface().EndpointVolume
-        step = config.volume_window.step.value
-        current = int(round(volume.GetMasterVolumeLevelScalar() * 100 / step) * step)
-        new = min(100, current + step)
-        volume.SetMasterVolumeLevelScalar(new * 0.01, None)
-        volume.SetMute(0, None)
-        return new
+        self.change_volume(1)
+        self.flush_volume()
+        return self.get_volume()
 
     def volume_down(self) -> int:
-        volume = self._get_current_audio_interface().EndpointVolume
-        step = config.volume_window.step.value
-        current = int(round(volume.GetMasterVolumeLevelScalar() * 100 / step) * step)
-        new = max(0, current - step)
-        volume.SetMasterVolumeLevelScalar(new * 0.01, None)
-        volume.SetMute(0, None)
-        return new
+        self.change_volume(-1)
+        self.flush_volume()
+        return self.get_volume()
 
     def set_volume(self, value):
-        volume = self._get_current_audio_interface().EndpointVolume
-        value = max(0, min(value, 100))
-        volume.SetMasterVolumeLevelScalar(value * 0.01, None)
-        volume.SetMute(0, None)
+        self.request_volume(value)
+        self.flush_volume()
 
     def get_volume(self) -> int:
-        volume = self._get_current_audio_interface().EndpointVolume
         step = config.volume_window.step.value
-        return int(round(volume.GetMasterVolumeLevelScalar() * 100 / step) * step)
+        return int(round(self.volume_state.level * 100 / step) * step)
 
     def get_mute(self) -> bool:
-        volume = self._get_current_audio_interface().EndpointVolume
-        return True if volume.GetMute() == 1 else False
+        return self.volume_state.mute
 
     def toggle_mute(self) -> bool:
-        volume = self._get_current_audio_interface().EndpointVolume
-        current_mute = volume.GetMute()
-        new_mute = 1 - current_mute
-        volume.SetMute(new_mute, None)
-        return True if new_mute == 1 else False
-    
+        self.request_toggle_mute()
+        self.flush_volume()
+        return self._state.mute
+
     def get_device_name(self) -> str:
-        return self._get_current_audio_interface().FriendlyName
+        return self.volume_state.device_name
+
+    def get_device_id(self) -> str | None:
+        return self.volume_state.device_id
 
     def get_all_output_devices(self) -> list:
-        devices = self._get_all_audio_interfaces()
-        return [{"id": device.id, "name": device.FriendlyName} for device in devices]
+        return self._get_devices(FLOW_RENDER)
 
     def get_all_input_devices(self) -> list:
-        devices = self._get_all_audio_interfaces(False)
-        return [{"id": device.id, "name": device.FriendlyName} for device in devices]
+        return self._get_devices(FLOW_CAPTURE)
 
-    def switch_device(self, device_id: str = None):
+    def switch_device(self, device_id: str = None) -> Future | None:
         devices = self.get_all_output_devices()
         if not devices:
             return
@@ -75,7 +178,7 @@ class AudioManager:
         index = -1
         dev_id = None
         mic_id = None
-        current_id = self._get_current_audio_interface().id
+        current_id = self.get_device_id()
         
         if config.audio_switch.select.value:
             enabled_devices = []
@@ -115,21 +218,156 @@ class AudioManager:
                 index = (index + 1) % len(devices)
                 dev_id = devices[index]["id"]
         
-        roles = [ERole.eConsole, ERole.eCommunications] if config.audio_switch.set_communication.value else None
-        if dev_id:
-            AudioUtilities.SetDefaultDevice(dev_id, roles)
+        if not dev_id:
+            return None
+
+        # Сразу показываем выбранное устройство; громкость прочитаем, когда переключение подтвердится
+        self.flush_volume()
+        names = {dev["id"]: dev["name"] for dev in devices}
+        self._state = self._state._replace(device_id=dev_id, device_name=names.get(dev_id, ""))
+        self._pending_switches += 1
+
+        future = self._worker.submit(self._set_default_devices, dev_id, mic_id,
+                                     config.audio_switch.set_communication.value)
+        future.add_done_callback(lambda f: self._app.call_soon_threadsafe(self._on_switch_done, f))
+        return future
+
+    def start(self):
+        # Найти устройство и подписаться заранее, чтобы первый показ окна громкости не ждал COM
+        self._sync()
+
+    def close(self):
+        self.flush_volume()
+        self._publish_timer.stop()
+        self._worker.close()
+        self._subscribe(None)
+        self._cache.close()
+
+    @staticmethod
+    def _set_default_devices(backend: AudioBackend, dev_id: str, mic_id: str | None, communications: bool):
+        # Поток воркера
+        backend.set_default_device(dev_id, communications)
         if mic_id:
-            AudioUtilities.SetDefaultDevice(mic_id, roles)
-
-    def _get_current_audio_interface(self):
-        return AudioUtilities.GetSpeakers()
-    
-    def _get_all_audio_interfaces(self, render = True):
-        enum = AudioUtilities.GetDeviceEnumerator()
-        collection = enum.EnumAudioEndpoints(EDataFlow.eRender.value if render else EDataFlow.eCapture.value, DEVICE_STATE.ACTIVE.value)
-        devices = []
-        for i in range(collection.GetCount()):
-            item = collection.Item(i)
-            device = AudioUtilities.CreateDevice(item)
-            devices.append(device)
-        return devices
\ No newline at end of file
+            backend.set_default_device(mic_id, communications)
+
+    def _on_switch_done(self, future: Future):
+        self._pending_switches -= 1
+        if future.exception() is not None:
+            print(f"[AudioManager] Failed to switch audio device: {future.exception()}")
+        if self._pending_switches:
+            return
+
+        # Сверяемся с системой: при ошибке вернётся прежнее устройство, при успехе — громкость нового
+        optimistic = self._state
+        self._cache.invalidate()
+        self._sync()
+        if self._state != optimistic:
+            self.volume_state_changed.emit(self._state, False)
+
+    def _add_command(self, add, show_popup: bool):
+        with self._lock:
+            add(self._command)
+            self._command.show_popup |= show_popup
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._app.call_soon_threadsafe(self._schedule_flush)
+
+    def _schedule_flush(self):
+        # Первая команда после паузы применяется сразу, следующие — не раньше, чем через кадр после записи
+        elapsed_ms = (time.monotonic() - self._last_write) * 1000
+        self._flush_timer.start(max(0, int(FRAME_MS - elapsed_ms)))
+
+    def _call(self, action, default=None):
+        # Устройство могло пропасть раньше, чем пришло уведомление, — тогда ищем его заново один раз
+        for attempt in range(2):
+            endpoint = self._sync()
+            if endpoint is None:
+                return default
+            try:
+                return action(endpoint)
+            except Exception as e:
+                self._cache.invalidate()
+                if attempt:
+                    print(f"[AudioManager] Error: {e}")
+        return default
+
+    def _sync(self) -> AudioEndpoint | None:
+        """Если устройство по умолчанию сменилось — переподписаться и прочитать его громкость."""
+        endpoint = self._cache.get()
+        if endpoint is self._endpoint:
+            return endpoint
+
+        self._subscribe(endpoint)
+        self._state = VolumeState()
+        if endpoint is not None:
+            try:
+                self._state = VolumeState(endpoint.get_volume(), endpoint.get_mute(), endpoint.id, endpoint.name)
+            except Exception as e:
+                print(f"[AudioManager] Failed to read volume: {e}")
+                self._state = VolumeState(device_id=endpoint.id, device_name=endpoint.name)
+        return endpoint
+
+    def _subscribe(self, endpoint: AudioEndpoint | None):
+        if self._endpoint is not None:
+            try:
+                self._endpoint.set_volume_listener(None)
+            except Exception as e:
+                print(f"[AudioManager] Failed to unsubscribe from volume changes: {e}")
+
+        self._endpoint = endpoint
+        if endpoint is not None:
+            try:
+                endpoint.set_volume_listener(
+                    lambda level, mute, external: self._on_volume_notify(endpoint, level, mute, external))
+            except Exception as e:
+                print(f"[AudioManager] Failed to subscribe to volume changes: {e}")
+
+    def _on_volume_notify(self, endpoint: AudioEndpoint, level: float, mute: bool, external: bool):
+        # Поток COM. Свои изменения уже записаны в состояние
+        if not external:
+            return
+        with self._lock:
+            self._pending_volume = (endpoint, level, mute)
+        self._schedule_publish()
+
+    def _on_device_event(self, reason: str, device_id: str | None):
+        # Поток COM; кэш к этому моменту уже сброшен
+        self._catalog.mark(reason, device_id)
+        with self._lock:
+            self._pending_device = True
+        self._schedule_publish()
+
+    def _schedule_publish(self):
+        with self._lock:
+            if self._publish_scheduled:
+                return
+            self._publish_scheduled = True
+        self._app.call_soon_threadsafe(self._publish_timer.start)
+
+    def _publish(self):
+        with self._lock:
+            pending_volume, self._pending_volume = self._pending_volume, None
+            device_changed, self._pending_device = self._pending_device, False
+            self._publish_scheduled = False
+
+        if device_changed and self._catalog.apply_pending():
+            self.devices_changed.emit()
+
+        previous = self._state
+        endpoint = self._sync()
+        if device_changed and self._state != previous:
+            self.volume_state_changed.emit(self._state, False)
+            return
+
+        # Уведомление от прежнего устройства, пришедшее после переподписки, не относится к текущему
+        if pending_volume is None or pending_volume[0] is not endpoint:
+            return
+        _, level, mute = pending_volume
+        state = self._state._replace(level=level, mute=mute)
+        if state != self._state:
+            self._state = state
+            self.volume_state_changed.emit(state, True)
+
+    def _get_devices(self, flow: int) -> list:
+        return [{"id": device.id, "name": device.name} for device in self._catalog.devices(flow)]
@@ -0,0 +1,644 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import ctypes
+import sys
+import threading
+import time
+from ctypes import wintypes
+from typing import Callable
+
+# Дедлайны шагов: приложение, не ответившее за это время, считается не скопировавшим/не вставившим.
+# Вставка ждёт дольше: Chromium, Electron и UWP читают буфер асинхронно, уже после обработки Ctrl+V
+COPY_TIMEOUT = 0.3
+PASTE_TIMEOUT = 1.0
+# Без отложенной отрисовки момент чтения буфера не узнать — перед восстановлением ждём с запасом
+PASTE_FALLBACK_DELAY = 0.25
+POLL_INTERVAL = 0.001
+
+CF_TEXT = 1
+CF_BITMAP = 2
+CF_METAFILEPICT = 3
+CF_OEMTEXT = 7
+CF_PALETTE = 9
+CF_UNICODETEXT = 13
+CF_ENHMETAFILE = 14
+CF_OWNERDISPLAY = 0x0080
+CF_DSPTEXT = 0x0081
+CF_DSPBITMAP = 0x0082
+CF_DSPMETAFILEPICT = 0x0083
+CF_DSPENHMETAFILE = 0x008E
+CF_PRIVATEFIRST = 0x0200
+CF_GDIOBJLAST = 0x03FF
+
+# Форматы-дескрипторы GDI и приватные: их данные — не HGLOBAL, и система либо синтезирует их сама (CF_BITMAP из CF_DIB),
+# либо они принадлежат приложению-владельцу. CF_ENHMETAFILE сохраняется отдельно через GetEnhMetaFileBits
+_HANDLE_FORMATS = frozenset((CF_BITMAP, CF_METAFILEPICT, CF_PALETTE, CF_OWNERDISPLAY, CF_DSPBITMAP,
+                             CF_DSPMETAFILEPICT, CF_DSPENHMETAFILE))
+# Синтезируются системой из CF_UNICODETEXT — не храним вторую и третью копию текста
+_SYNTHESIZED_TEXT_FORMATS = frozenset((CF_TEXT, CF_OEMTEXT))
+
+class ClipboardSnapshot:
+    """
+    Все форматы буфера обмена как сырые байты без декодирования. Каждый формат — один буфер, наружу отдаётся
+    memoryview без копирования; при восстановлении байты копируются прямо в новую глобальную память.
+    """
+    __slots__ = ("_formats", "_sequence")
+
+    def __init__(self, formats: list[tuple[int, memoryview]], sequence: int = 0):
+        self._formats = formats
+        self._sequence = sequence
+
+    @property
+    def formats(self) -> list[tuple[int, memoryview]]:
+        return self._formats
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @property
+    def size(self) -> int:
+        return sum(data.nbytes for _, data in self._formats)
+
+    def __len__(self) -> int:
+        return len(self._formats)
+
+    def get(self, format_id: int) -> memoryview | None:
+        for current, data in self._formats:
+            if current == format_id:
+                return data
+        return None
+
+    def __repr__(self):
+        return f"ClipboardSnapshot(formats={[format_id for format_id, _ in self._formats]}, size={self.size})"
+
+def copy_from_address(address: int, size: int) -> memoryview:
+    """Одна копия из чужой памяти (заблокированного HGLOBAL) в собственный буфер."""
+    buffer = bytearray(size)
+    if size:
+        ctypes.memmove((ctypes.c_char * size).from_buffer(buffer), address, size)
+    return memoryview(buffer)
+
+def as_pointer(data: memoryview):
+    """Указатель на данные буфера для WinAPI; у буферов только для чтения (bytes) ctypes берёт указатель на копию."""
+    if data.readonly:
+        return bytes(data)
+    return (ctypes.c_char * data.nbytes).from_buffer(data)
+
+def copy_to_address(address: int, data: memoryview):
+    if data.nbytes:
+        ctypes.memmove(address, as_pointer(data), data.nbytes)
+
+def encode_text(text: str) -> memoryview:
+    return memoryview(bytearray((text + "\0").encode("utf-16-le")))
+
+def decode_text(data: memoryview) -> str:
+    text = bytes(data).decode("utf-16-le", errors="replace")
+    end = text.find("\0")
+    return text if end < 0 else text[:end]
+
+class ClipboardBackend:
+    """Доступ к системному буферу обмена. Блокирующие методы сервис вызывает в пуле потоков."""
+    def sequence_number(self) -> int:
+        raise NotImplementedError
+
+    def get_text(self) -> str | None:
+        raise NotImplementedError
+
+    def set_text(self, text: str):
+        raise NotImplementedError
+
+    def snapshot(self) -> ClipboardSnapshot | None:
+        raise NotImplementedError
+
+    def restore(self, snapshot: ClipboardSnapshot) -> bool:
+        raise NotImplementedError
+
+    def wait_for_change(self, since: int, timeout: float) -> bool:
+        deadline = time.perf_counter() + timeout
+        while self.sequence_number() == since:
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+        return True
+
+    def offer_text(self, text: str):
+        """Кладёт текст для вставки так, чтобы wait_text_read мог узнать, когда приложение его прочитает."""
+        self.set_text(text)
+
+    def wait_text_read(self, timeout: float) -> bool:
+        """Ждёт, пока активное приложение прочитает текст из offer_text; False — не прочитало до дедлайна."""
+        raise NotImplementedError
+
+class _ClipboardOwnerWindow:
+    """
+    Скрытое окно в собственном потоке с циклом сообщений — владелец буфера при отложенной отрисовке.
+    Текст кладётся в буфер без данных (SetClipboardData(CF_UNICODETEXT, NULL)), и система присылает
+    WM_RENDERFORMAT в момент, когда приложение действительно читает буфер — это и есть подтверждение вставки,
+    в том числе для приложений, читающих буфер асинхронно.
+
+    Читателя определяем по окну, открывшему буфер: если это не процесс активного окна (менеджер буфера,
+    история буфера), вставка ещё не подтверждена, но к дедлайну считается вероятной (UWP читает из другого процесса).
+    """
+    WM_DESTROY = 0x0002
+    WM_CLOSE = 0x0010
+    WM_RENDERFORMAT = 0x0305
+    WM_RENDERALLFORMATS = 0x0306
+    WM_DESTROYCLIPBOARD = 0x0307
+    WM_OFFER = 0x8001  # WM_APP + 1
+    HWND_MESSAGE = -3
+    # Форматы-пометки: история буфера Windows и менеджеры буфера не сохраняют (и не читают) такой текст
+    EXCLUDE_FORMATS = ("ExcludeClipboardContentFromMonitorProcessing", "CanIncludeInClipboardHistory",
+                       "CanUploadToCloudClipboard")
+
+    READ_NONE = 0
+    READ_OTHER = 1
+    READ_TARGET = 2
+    READ_LOST = 3
+
+    def __init__(self, backend: "Win32ClipboardBackend"):
+        self._backend = backend
+        self._user32 = backend._user32
+        self._hwnd = 0
+        self._text: str | None = None
+        self._offered: str | None = None
+        self._read = self.READ_NONE
+        self._condition = threading.Condition()
+        self._ready = threading.Event()
+        self._exclude_formats = [self._user32.RegisterClipboardFormatW(name) for name in self.EXCLUDE_FORMATS]
+
+        self._thread = threading.Thread(target=self._run, name="ClipboardOwner", daemon=True)
+        self._thread.start()
+        self._ready.wait(1.0)
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self._hwnd)
+
+    def offer(self, text: str) -> bool:
+        self._offered = text
+        # Буфер открывается окном-владельцем в его потоке: EmptyClipboard делает владельцем именно его
+        return bool(self._user32.SendMessageW(self._hwnd, self.WM_OFFER, 0, 0))
+
+    def wait_read(self, timeout: float) -> bool:
+        with self._condition:
+            self._condition.wait_for(lambda: self._read in (self.READ_TARGET, self.READ_LOST), timeout)
+            return self._read in (self.READ_TARGET, self.READ_OTHER)
+
+    def _run(self):
+        user32 = self._user32
+        LRESULT = wintypes.LPARAM
+        WNDPROC = ctypes.WINFUNCTYPE(LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+
+        class WNDCLASSW(ctypes.Structure):
+            _fields_ = [("style", wintypes.UINT), ("lpfnWndProc", WNDPROC), ("cbClsExtra", ctypes.c_int),
+                        ("cbWndExtra", ctypes.c_int), ("hInstance", wintypes.HINSTANCE), ("hIcon", wintypes.HICON),
+                        ("hCursor", wintypes.HANDLE), ("hbrBackground", wintypes.HBRUSH),
+                        ("lpszMenuName", wintypes.LPCWSTR), ("lpszClassName", wintypes.LPCWSTR)]
+
+        user32.DefWindowProcW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+        user32.DefWindowProcW.restype = LRESULT
+        user32.RegisterClassW.argtypes = (ctypes.POINTER(WNDCLASSW),)
+        user32.RegisterClassW.restype = wintypes.ATOM
+        user32.CreateWindowExW.argtypes = (wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+                                           ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.HWND,
+                                           wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID)
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+        user32.GetMessageW.restype = wintypes.BOOL
+
+        # Ссылка на WNDPROC живёт, пока работает цикл сообщений
+        proc = WNDPROC(self._window_proc)
+        instance = ctypes.windll.kernel32.GetModuleHandleW(None)
+        window_class = WNDCLASSW(lpfnWndProc=proc, hInstance=instance, lpszClassName="PoppyClipboardOwner")
+        user32.RegisterClassW(ctypes.byref(window_class))
+        self._hwnd = user32.CreateWindowExW(0, "PoppyClipboardOwner", None, 0, 0, 0, 0, 0, self.HWND_MESSAGE,
+                                            None, instance, None) or 0
+        self._ready.set()
+        if not self._hwnd:
+            print("[Clipboard] Failed to create clipboard owner window")
+            return
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+    def _window_proc(self, hwnd, message, w_param, l_param):
+        try:
+            if message == self.WM_OFFER:
+                return self._put_delayed(hwnd)
+            if message == self.WM_RENDERFORMAT:
+                # Буфер уже открыт читающим приложением — открывать его здесь нельзя
+                if w_param == CF_UNICODETEXT:
+                    self._render()
+                    self._on_read()
+                return 0
+            if message == self.WM_RENDERALLFORMATS:
+                # Окно уничтожается, оставаясь владельцем: отдаём данные, чтобы буфер не опустел
+                if self._backend._open(hwnd):
+                    try:
+                        if self._user32.GetClipboardOwner() == hwnd:
+                            self._render()
+                    finally:
+                        self._user32.CloseClipboard()
+                return 0
+            if message == self.WM_DESTROYCLIPBOARD:
+                # Буфер очистили (наше восстановление или другое приложение) — ждать чтения больше нечего
+                with self._condition:
+                    self._text = None
+                    if self._read == self.READ_NONE:
+                        self._read = self.READ_LOST
+                    self._condition.notify_all()
+                return 0
+            if message == self.WM_CLOSE:
+                self._user32.DestroyWindow(hwnd)
+                return 0
+            if message == self.WM_DESTROY:
+                self._user32.PostQuitMessage(0)
+                return 0
+        except Exception as e:
+            print(f"[Clipboard] Owner window error: {e}")
+        return self._user32.DefWindowProcW(hwnd, message, w_param, l_param)
+
+    def _put_delayed(self, hwnd) -> int:
+        if not self._backend._open(hwnd):
+            print("[Clipboard] Failed to open clipboard for writing")
+            return 0
+        try:
+            self._user32.EmptyClipboard()
+            # После EmptyClipboard: если окно уже было владельцем, оно только что получило WM_DESTROYCLIPBOARD
+            with self._condition:
+                self._text = self._offered
+                self._read = self.READ_NONE
+            self._user32.SetClipboardData(CF_UNICODETEXT, None)
+            for format_id in self._exclude_formats:
+                # Для CanInclude…/CanUpload… значение 0 — «нельзя»; для Exclude… важно само наличие формата
+                handle = self._backend._write_global(memoryview(bytearray(4)))
+                if handle and not self._user32.SetClipboardData(format_id, handle):
+                    self._backend._kernel32.GlobalFree(handle)
+            return 1
+        finally:
+            self._user32.CloseClipboard()
+
+    def _render(self):
+        text = self._text
+        if text is None:
+            return
+        handle = self._backend._write_global(encode_text(text))
+        if handle and not self._user32.SetClipboardData(CF_UNICODETEXT, handle):
+            self._backend._kernel32.GlobalFree(handle)
+
+    def _on_read(self):
+        reader = self._user32.GetOpenClipboardWindow()
+        foreground = self._user32.GetForegroundWindow()
+        reader_pid = self._backend.get_window_process_id(reader) if reader else 0
+        target = not reader_pid or reader_pid == self._backend.get_window_process_id(foreground)
+        with self._condition:
+            if target:
+                self._read = self.READ_TARGET
+            elif self._read == self.READ_NONE:
+                self._read = self.READ_OTHER
+            self._condition.notify_all()
+
+class Win32ClipboardBackend(ClipboardBackend):
+    WM_NULL = 0x0000
+    SMTO_ABORTIFHUNG = 0x0002
+    GMEM_MOVEABLE = 0x0002
+    # Приложение, записывающее буфер, держит его открытым — ждём, но не дольше этого
+    OPEN_TIMEOUT = 0.1
+    # Приложение, читающее вставленный текст, держит буфер открытым; восстановление ждёт его дольше
+    RESTORE_OPEN_TIMEOUT = 0.5
+
+    def __init__(self):
+        user32 = self._user32 = ctypes.windll.user32
+        kernel32 = self._kernel32 = ctypes.windll.kernel32
+        gdi32 = self._gdi32 = ctypes.windll.gdi32
+
+        user32.OpenClipboard.argtypes = (wintypes.HWND,)
+        user32.OpenClipboard.restype = wintypes.BOOL
+        user32.CloseClipboard.restype = wintypes.BOOL
+        user32.EmptyClipboard.restype = wintypes.BOOL
+        user32.EnumClipboardFormats.argtypes = (wintypes.UINT,)
+        user32.EnumClipboardFormats.restype = wintypes.UINT
+        user32.IsClipboardFormatAvailable.argtypes = (wintypes.UINT,)
+        user32.IsClipboardFormatAvailable.restype = wintypes.BOOL
+        user32.GetClipboardData.argtypes = (wintypes.UINT,)
+        user32.GetClipboardData.restype = wintypes.HANDLE
+        user32.SetClipboardData.argtypes = (wintypes.UINT, wintypes.HANDLE)
+        user32.SetClipboardData.restype = wintypes.HANDLE
+        user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
+        user32.SendMessageTimeoutW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+                                               wintypes.UINT, wintypes.UINT, ctypes.POINTER(ctypes.c_size_t))
+        user32.SendMessageTimeoutW.restype = ctypes.c_size_t
+        user32.SendMessageW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+        user32.SendMessageW.restype = wintypes.LPARAM
+        user32.RegisterClipboardFormatW.argtypes = (wintypes.LPCWSTR,)
+        user32.RegisterClipboardFormatW.restype = wintypes.UINT
+        user32.GetOpenClipboardWindow.restype = wintypes.HWND
+        user32.GetClipboardOwner.restype = wintypes.HWND
+        user32.GetForegroundWindow.restype = wintypes.HWND
+        user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+        user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+
+        kernel32.GlobalAlloc.argtypes = (wintypes.UINT, ctypes.c_size_t)
+        kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+        kernel32.GlobalFree.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalFree.restype = wintypes.HGLOBAL
+        kernel32.GlobalLock.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalLock.restype = ctypes.c_void_p
+        kernel32.GlobalUnlock.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalUnlock.restype = wintypes.BOOL
+        kernel32.GlobalSize.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalSize.restype = ctypes.c_size_t
+
+        gdi32.GetEnhMetaFileBits.argtypes = (wintypes.HANDLE, wintypes.UINT, ctypes.c_void_p)
+        gdi32.GetEnhMetaFileBits.restype = wintypes.UINT
+        gdi32.SetEnhMetaFileBits.argtypes = (wintypes.UINT, ctypes.c_void_p)
+        gdi32.SetEnhMetaFileBits.restype = wintypes.HANDLE
+
+        # Создаётся при первой вставке
+        self._owner: _ClipboardOwnerWindow | None = None
+
+    def sequence_number(self) -> int:
+        return self._user32.GetClipboardSequenceNumber()
+
+    def get_text(self) -> str | None:
+        if not self._open():
+            return None
+        try:
+            if not self._user32.IsClipboardFormatAvailable(CF_UNICODETEXT):
+                return None
+            data = self._read_global(self._user32.GetClipboardData(CF_UNICODETEXT))
+            return None if data is None else decode_text(data)
+        finally:
+            self._user32.CloseClipboard()
+
+    def set_text(self, text: str):
+        self.restore(ClipboardSnapshot([(CF_UNICODETEXT, encode_text(text))]))
+
+    def snapshot(self) -> ClipboardSnapshot | None:
+        sequence = self.sequence_number()
+        if not self._open():
+            return None
+        try:
+            formats = []
+            has_unicode = bool(self._user32.IsClipboardFormatAvailable(CF_UNICODETEXT))
+            format_id = self._user32.EnumClipboardFormats(0)
+            while format_id:
+                data = self._read_format(format_id, has_unicode)
+                if data is not None:
+                    formats.append((format_id, data))
+                format_id = self._user32.EnumClipboardFormats(format_id)
+            return ClipboardSnapshot(formats, sequence)
+        finally:
+            self._user32.CloseClipboard()
+
+    def restore(self, snapshot: ClipboardSnapshot) -> bool:
+        if not self._open(timeout=self.RESTORE_OPEN_TIMEOUT):
+            print("[Clipboard] Failed to open clipboard for writing")
+            return False
+        try:
+            self._user32.EmptyClipboard()
+            for format_id, data in snapshot.formats:
+                if format_id == CF_ENHMETAFILE:
+                    handle = self._gdi32.SetEnhMetaFileBits(data.nbytes, as_pointer(data))
+                else:
+                    handle = self._write_global(data)
+                if not handle:
+                    continue
+                # После успешного SetClipboardData памятью владеет система
+                if not self._user32.SetClipboardData(format_id, handle) and format_id != CF_ENHMETAFILE:
+                    self._kernel32.GlobalFree(handle)
+            return True
+        finally:
+            self._user32.CloseClipboard()
+
+    def offer_text(self, text: str):
+        if self._owner is None:
+            self._owner = _ClipboardOwnerWindow(self)
+        if not self._owner.is_ready or not self._owner.offer(text):
+            self.set_text(text)
+
+    def wait_text_read(self, timeout: float) -> bool:
+        if self._owner is not None and self._owner.is_ready:
+            return self._owner.wait_read(timeout)
+
+        # Без окна-владельца: WM_NULL обрабатывается раньше клавиатурного ввода из очереди и не доказывает,
+        # что Ctrl+V прочитан, поэтому перед ним ждём с запасом
+        time.sleep(PASTE_FALLBACK_DELAY)
+        hwnd = self._user32.GetForegroundWindow()
+        if not hwnd:
+            return False
+        result = ctypes.c_size_t()
+        return bool(self._user32.SendMessageTimeoutW(hwnd, self.WM_NULL, 0, 0, self.SMTO_ABORTIFHUNG,
+                                                     int(timeout * 1000), ctypes.byref(result)))
+
+    def get_window_process_id(self, hwnd) -> int:
+        pid = wintypes.DWORD()
+        self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        return pid.value
+
+    def _read_format(self, format_id: int, has_unicode: bool) -> memoryview | None:
+        if format_id in _HANDLE_FORMATS or CF_PRIVATEFIRST <= format_id <= CF_GDIOBJLAST:
+            return None
+        if has_unicode and format_id in _SYNTHESIZED_TEXT_FORMATS:
+            return None
+
+        handle = self._user32.GetClipboardData(format_id)
+        if not handle:
+            return None
+        if format_id == CF_ENHMETAFILE:
+            size = self._gdi32.GetEnhMetaFileBits(handle, 0, None)
+            buffer = bytearray(size)
+            if not size or not self._gdi32.GetEnhMetaFileBits(handle, size, (ctypes.c_char * size).from_buffer(buffer)):
+                return None
+            return memoryview(buffer)
+        return self._read_global(handle)
+
+    def _read_global(self, handle) -> memoryview | None:
+        if not handle:
+            return None
+        size = self._kernel32.GlobalSize(handle)
+        address = self._kernel32.GlobalLock(handle)
+        if not address:
+            return None
+        try:
+            return copy_from_address(address, size)
+        finally:
+            self._kernel32.GlobalUnlock(handle)
+
+    def _write_global(self, data: memoryview):
+        handle = self._kernel32.GlobalAlloc(self.GMEM_MOVEABLE, max(data.nbytes, 1))
+        if not handle:
+            return None
+        address = self._kernel32.GlobalLock(handle)
+        if not address:
+            self._kernel32.GlobalFree(handle)
+            return None
+        try:
+            copy_to_address(address, data)
+        finally:
+            self._kernel32.GlobalUnlock(handle)
+        return handle
+
+    def _open(self, owner=None, timeout: float | None = None) -> bool:
+        # Владелец NULL: окно в потоке без цикла сообщений заблокировало бы чужой EmptyClipboard.
+        # Окно-владелец передаётся только из потока _ClipboardOwnerWindow, где цикл сообщений есть
+        deadline = time.perf_counter() + (self.OPEN_TIMEOUT if timeout is None else timeout)
+        while not self._user32.OpenClipboard(owner):
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+        return True
+
+class FakeClipboardBackend(ClipboardBackend):
+    """
+    Буфер обмена в памяти и «приложение» с настраиваемой задержкой ответа — для проверок без Windows.
+    simulate_copy/simulate_paste — то, что сделало бы активное окно в ответ на Ctrl+C/Ctrl+V.
+    Вставка, как в Chromium/Electron/UWP, читает буфер асинхронно: если буфер восстановить раньше,
+    в pasted попадёт восстановленный текст.
+    """
+    def __init__(self, text: str | None = None):
+        self._condition = threading.Condition()
+        self._formats: list[tuple[int, memoryview]] = [] if text is None else [(CF_UNICODETEXT, encode_text(text))]
+        self._sequence = 1
+        # Номер последовательности предложенного для вставки текста и прочитан ли он
+        self._offer_sequence: int | None = None
+        self._offer_read = False
+        self.pasted: list[str | None] = []
+
+    def sequence_number(self) -> int:
+        return self._sequence
+
+    def get_text(self) -> str | None:
+        for format_id, data in self._formats:
+            if format_id == CF_UNICODETEXT:
+                return decode_text(data)
+        return None
+
+    def set_text(self, text: str):
+        self.set_formats([(CF_UNICODETEXT, encode_text(text))])
+
+    def set_formats(self, formats: list[tuple[int, memoryview | bytes]]):
+        with self._condition:
+            self._formats = [(format_id, memoryview(data)) for format_id, data in formats]
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def snapshot(self) -> ClipboardSnapshot | None:
+        # Как и система, копируем каждый формат один раз: после EmptyClipboard прежние данные освобождаются
+        with self._condition:
+            return ClipboardSnapshot([(format_id, memoryview(bytearray(data))) for format_id, data in self._formats],
+                                     self._sequence)
+
+    def restore(self, snapshot: ClipboardSnapshot) -> bool:
+        self.set_formats([(format_id, memoryview(bytearray(data))) for format_id, data in snapshot.formats])
+        return True
+
+    def wait_for_change(self, since: int, timeout: float) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: self._sequence != since, timeout)
+
+    def offer_text(self, text: str):
+        with self._condition:
+            self.set_text(text)
+            self._offer_sequence = self._sequence
+            self._offer_read = False
+
+    def wait_text_read(self, timeout: float) -> bool:
+        # Как WM_DESTROYCLIPBOARD: если буфер перезаписали, ждать чтения предложенного текста бессмысленно
+        with self._condition:
+            self._condition.wait_for(lambda: self._offer_read or self._sequence != self._offer_sequence, timeout)
+            return self._offer_read
+
+    def simulate_copy(self, text: str | None, delay: float = 0.0):
+        """Приложение кладёт выделенный текст через delay секунд; None — выделения нет, буфер не меняется."""
+        if text is not None:
+            self._later(delay, lambda: self.set_text(text))
+
+    def simulate_paste(self, delay: float = 0.0):
+        """Приложение читает буфер через delay секунд — независимо от того, ждёт ли его кто-нибудь."""
+        def paste():
+            with self._condition:
+                self.pasted.append(self.get_text())
+                if self._sequence == self._offer_sequence:
+                    self._offer_read = True
+                self._condition.notify_all()
+
+        self._later(delay, paste)
+
+    @staticmethod
+    def _later(delay: float, function: Callable[[], None]):
+        timer = threading.Timer(delay, function)
+        timer.daemon = True
+        timer.start()
+
+def create_default_backend() -> ClipboardBackend:
+    if sys.platform == "win32":
+        return Win32ClipboardBackend()
+    return FakeClipboardBackend()
+
+class Clipboard:
+    """
+    Обмен текстом с активным приложением через буфер обмена без фиксированных пауз: после Ctrl+C ждём смены номера
+    последовательности буфера, после Ctrl+V — чтения текста приложением (отложенная отрисовка буфера);
+    каждый шаг ограничен дедлайном.
+    """
+    def __init__(self, backend: ClipboardBackend | None = None):
+        self._backend = backend if backend is not None else create_default_backend()
+
+    @property
+    def backend(self) -> ClipboardBackend:
+        return self._backend
+
+    def get_text(self) -> str | None:
+        return self._backend.get_text()
+
+    def set_text(self, text: str):
+        self._backend.set_text(text)
+
+    async def snapshot(self) -> ClipboardSnapshot | None:
+        """Все форматы буфера (текст, изображения, HTML, RTF, файлы) — чтобы вернуть их после вставки."""
+        return await self._run(self._backend.snapshot)
+
+    async def restore(self, snapshot: ClipboardSnapshot) -> bool:
+        return await self._run(self._backend.restore, snapshot)
+
+    async def copy(self, send_copy: Callable[[], None], timeout: float = COPY_TIMEOUT) -> str | None:
+        """send_copy отправляет Ctrl+C; None — приложение ничего не скопировало до дедлайна."""
+        deadline = time.perf_counter() + timeout
+        since = await self._run(self._backend.sequence_number)
+        send_copy()
+
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not await self._run(self._backend.wait_for_change, since, remaining):
+                return None
+            # Буфер сначала очищается, потом заполняется — если текста ещё нет, ждём следующего изменения.
+            # get_text ждёт OpenClipboard, пока буфер держит другой процесс, — не в потоке цикла
+            since, text = await self._run(self._read_changed)
+            if text is not None:
+                return text
+
+    async def paste(self, text: str, send_paste: Callable[[], None], timeout: float = PASTE_TIMEOUT) -> bool:
+        """Кладёт text в буфер, отправляет Ctrl+V и ждёт, пока приложение прочитает текст; False — не прочитало."""
+        await self._run(self._backend.offer_text, text)
+        send_paste()
+        return await self._run(self._backend.wait_text_read, timeout)
+
+    def _read_changed(self) -> tuple[int, str | None]:
+        return self._backend.sequence_number(), self._backend.get_text()
+
+    @staticmethod
+    async def _run(function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
@@ -22,6 +22,7 @@ class VolumeWindowConfig:
     def __init__(self, name: str):
         self.enable: cBool = cBool(name + "Enable", True)
         self.show_media: cBool = cBool(name + "ShowMedia", False)
+        self.show_external: cBool = cBool(name + "ShowExternal", False)
         self.step: cInt = cInt(name + "Step", 2)
         self.show_name: cBool = cBool(name + "ShowName", False)
         self.full_name: cBool = cBool(name + "FullName", False)
@@ -58,6 +59,9 @@ class LayoutSwitchConfig:
         self.last: cBool = cBool(name + "Last", False)
         self.last_hotkey: cStr = cStr(name + "LastHotkey", "pause")
         self.consider_spaces: cBool = cBool(name + "ConsiderSpaces", True)
+        self.auto_switch: cBool = cBool(name + "AutoSwitch", False)
+        self.remember_layout: cBool = cBool(name + "RememberLayout", False)
+        self.remember_per_process: cBool = cBool(name + "RememberPerProcess", False)
         self.no_last_switch: cBool = cBool(name + "NoLastSwitch", False)
         self.selected: cBool = cBool(name + "Selected", False)
         self.selected_hotkey: cStr = cStr(name + "SelectedHotkey", "shift+pause")
@@ -65,6 +69,10 @@ class LayoutSwitchConfig:
         self.case_hotkey: cStr = cStr(name + "CaseHotkey", "alt+pause")
         #self.block_locks: cBool = cBool(name + "BlockLocks", False)
 
+class DiagnosticsConfig:
+    def __init__(self, name: str):
+        self.profiling: cBool = cBool(name + "Profiling", False)
+
 class CommonConfig:
     def __init__(self, name: str = ""):
         self.taskbar: cBool = cBool(name + "TaskbarOffset", True)
@@ -90,6 +98,7 @@ class Config:
         self.audio_switch: AudioSwitchConfig = AudioSwitchConfig("AudioSwitch")
         self.layout_switch: LayoutSwitchConfig = LayoutSwitchConfig("LayoutSwitch")
         self.main_window: MainWindowConfig = MainWindowConfig("MainWindow")
+        self.diagnostics: DiagnosticsConfig = DiagnosticsConfig("Diagnostics")
         self.common: CommonConfig = CommonConfig()
         
 config: Config = Config()
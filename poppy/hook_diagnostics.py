@@ -0,0 +1,68 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+from .hooks import keyboard, mouse, ProfileEntry, get_hook_timeout_ms
+from .config import config
+
+class HookDiagnostics:
+    """Включает профилирование хуков по настройке и собирает замеры клавиатуры и мыши для страницы диагностики."""
+    def __init__(self):
+        from .app import App
+        self._app = App.instance()
+
+        self._timeout_ms = get_hook_timeout_ms()
+        self._last_warning: str | None = None
+        self._last_warning_time: float | None = None
+
+        keyboard.profiler.hook_warning(self._on_warning)
+        mouse.profiler.hook_warning(self._on_warning)
+
+        self.set_profiling(config.diagnostics.profiling.value)
+        config.diagnostics.profiling.valueChanged.connect(self.set_profiling)
+
+    @property
+    def timeout_ms(self) -> int:
+        return self._timeout_ms
+
+    @property
+    def is_profiling(self) -> bool:
+        return keyboard.is_profiling or mouse.is_profiling
+
+    @property
+    def last_warning(self) -> str | None:
+        return self._last_warning
+
+    @property
+    def last_warning_time(self) -> float | None:
+        return self._last_warning_time
+
+    def set_profiling(self, enabled: bool):
+        keyboard.set_profiling(enabled)
+        mouse.set_profiling(enabled)
+
+    def entries(self) -> list[tuple[str, ProfileEntry]]:
+        result = [("Keyboard", entry) for entry in keyboard.profiler.entries()]
+        result += [("Mouse", entry) for entry in mouse.profiler.entries()]
+        return result
+
+    def reset(self):
+        keyboard.profiler.reset()
+        mouse.profiler.reset()
+        self._last_warning = None
+        self._last_warning_time = None
+
+    def _on_warning(self, name: str, elapsed_ns: int, timeout_ns: int):
+        # Вызывается из потока хука
+        self._app.call_soon_threadsafe(self._set_warning, f"{name}: {elapsed_ns / 1e6:.1f} / {timeout_ns / 1e6:.0f} ms")
+
+    def _set_warning(self, text: str):
+        self._last_warning = text
+        self._last_warning_time = time.time()
@@ -1,6 +1,11 @@
 from ._keyboard import keyboard
-from ._keys import keys
+from ._keys import keys, PRINTABLE_KEYS, WORD_BOUNDARY_KEYS
 from ._key import Key, KeyEvent, KeyEventType, HotkeyType, KeyStroke
 from ._mouse import mouse
 from ._mouse_buttons import mouseButtons
-from ._mouse_button import MouseButton, MouseEvent, MouseEventType
\ No newline at end of file
+from ._mouse_button import MouseButton, MouseEvent, MouseEventType
+from ._keystroke_ring import KeystrokeRing
+from ._input_sequence import InputSequence, CompiledInput, InputBackend, SendInputBackend, RecordingBackend
+from ._recorder import EventRecorder, RecordedEvent, read_events, write_events
+from ._profiler import HookProfiler, ProfileEntry, RollingHistogram, get_hook_timeout_ms
+from ._input_thread import input_thread, InputThread
\ No newline at end of file
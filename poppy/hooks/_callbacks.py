@@ -1,31 +1,81 @@
-from collections import defaultdict
-from typing import TypeVar, Generic, Optional
+import threading
+from typing import TypeVar, Generic, Optional, Callable, Any
 
 TValue = TypeVar('TValue')
 TCallback = TypeVar('TCallback')
 
+# Обёртка, которая применяется к каждому callback'у при сборке снимка (например, замер времени)
+CallbackWrapper = Callable[[int, Any], Any]
+
 _id = 0
+_id_lock = threading.Lock()
+
+def next_callback_id() -> int:
+    global _id
+    with _id_lock:
+        _id += 1
+        return _id
 
 class Callbacks(Generic[TCallback]):
+    """
+    Читатель (поток хука) получает готовый кортеж без копирования и блокировок.
+    Кортеж пересобирается только при добавлении/удалении, запись защищена блокировкой.
+    """
     def __init__(self):
+        self._lock = threading.Lock()
         self._callbacks: dict[int, TCallback] = {}
+        self._snapshot: tuple[TCallback, ...] = ()
+        self._wrapper: CallbackWrapper | None = None
 
     def add(self, callback: TCallback) -> int:
-        global _id
-        _id += 1
-        self._callbacks[_id] = callback
-        return _id
+        callback_id = next_callback_id()
+        with self._lock:
+            self._callbacks[callback_id] = callback
+            self._rebuild()
+        return callback_id
 
     def remove(self, callback_id: int) -> bool:
-        return self._callbacks.pop(callback_id, None) is not None
+        with self._lock:
+            if self._callbacks.pop(callback_id, None) is None:
+                return False
+            self._rebuild()
+            return True
+
+    def replace(self, callback_id: int, callback: TCallback) -> bool:
+        with self._lock:
+            if callback_id not in self._callbacks:
+                return False
+            self._callbacks[callback_id] = callback
+            self._rebuild()
+            return True
 
     def clear(self):
-        self._callbacks.clear()
+        with self._lock:
+            self._callbacks.clear()
+            self._rebuild()
+
+    def items(self) -> list[tuple[int, TCallback]]:
+        with self._lock:
+            return list(self._callbacks.items())
+
+    def get_all(self) -> tuple[TCallback, ...]:
+        return self._snapshot
 
-    def get_all(self) -> list[TCallback]:
-        return list(self._callbacks.values())
+    def set_wrapper(self, wrapper: CallbackWrapper | None):
+        with self._lock:
+            self._wrapper = wrapper
+            self._rebuild()
+
+    def _rebuild(self):
+        wrapper = self._wrapper
+        if wrapper is None:
+            self._snapshot = tuple(self._callbacks.values())
+        else:
+            self._snapshot = tuple(wrapper(callback_id, callback) for callback_id, callback in self._callbacks.items())
 
 class ValuableCallback(Generic[TValue, TCallback]):
+    __slots__ = ("_value", "_callback")
+
     def __init__(self, value: TValue, callback: TCallback):
         self._value = value
         self._callback = callback
@@ -40,39 +90,64 @@ class ValuableCallback(Generic[TValue, TCallback]):
 
 class ValuableCallbacks(Generic[TValue, TCallback]):
     def __init__(self):
+        self._lock = threading.Lock()
         self._callbacks: dict[int, ValuableCallback[TValue, TCallback]] = {}
-        self._by_value: defaultdict[TValue, set[int]] = defaultdict(set)       # индекс для быстрого поиска
+        # Готовые кортежи callback'ов по значению; словарь заменяется целиком при каждом изменении
+        self._by_value: dict[TValue, tuple[TCallback, ...]] = {}
+        self._wrapper: CallbackWrapper | None = None
 
     def add(self, value: TValue, callback: TCallback) -> int:
-        global _id
-        _id += 1
-        self._callbacks[_id] = ValuableCallback(value, callback)
-        self._by_value[value].add(_id)
-        return _id
+        callback_id = next_callback_id()
+        with self._lock:
+            self._callbacks[callback_id] = ValuableCallback(value, callback)
+            self._rebuild()
+        return callback_id
 
     def remove(self, callback_id: int) -> Optional[ValuableCallback]:
-        callback = self._callbacks.pop(callback_id, None)
-        if callback is not None:
-            self._by_value[callback.value].discard(callback_id)
-            if not self._by_value[callback.value]:
-                del self._by_value[callback.value]
+        with self._lock:
+            callback = self._callbacks.pop(callback_id, None)
+            if callback is not None:
+                self._rebuild()
             return callback
-        return None
+
+    def replace(self, callback_id: int, callback: TCallback) -> bool:
+        with self._lock:
+            item = self._callbacks.get(callback_id)
+            if item is None:
+                return False
+            self._callbacks[callback_id] = ValuableCallback(item.value, callback)
+            self._rebuild()
+            return True
 
     def remove_by_value(self, value: TValue):
-        callback_ids = self._by_value.pop(value, None)
-        if callback_ids is None:
-            return
-        for lid in callback_ids:
-            self._callbacks.pop(lid, None)
+        with self._lock:
+            callback_ids = [lid for lid, item in self._callbacks.items() if item.value == value]
+            for lid in callback_ids:
+                del self._callbacks[lid]
+            if callback_ids:
+                self._rebuild()
     
     def clear(self):
-        self._callbacks.clear()
-        self._by_value.clear()
+        with self._lock:
+            self._callbacks.clear()
+            self._rebuild()
+
+    def items(self) -> list[tuple[int, ValuableCallback[TValue, TCallback]]]:
+        with self._lock:
+            return list(self._callbacks.items())
      
-    def get_by_value(self, value: TValue) -> list[TCallback]:
-        return [
-            self._callbacks[lid].callback
-            for lid in self._by_value.get(value, ())
-            if lid in self._callbacks
-        ]
\ No newline at end of file
+    def get_by_value(self, value: TValue) -> tuple[TCallback, ...]:
+        return self._by_value.get(value, ())
+
+    def set_wrapper(self, wrapper: CallbackWrapper | None):
+        with self._lock:
+            self._wrapper = wrapper
+            self._rebuild()
+
+    def _rebuild(self):
+        wrapper = self._wrapper
+        by_value: dict[TValue, list[TCallback]] = {}
+        for callback_id, item in self._callbacks.items():
+            callback = item.callback if wrapper is None else wrapper(callback_id, item.callback)
+            by_value.setdefault(item.value, []).append(callback)
+        self._by_value = {value: tuple(callbacks) for value, callbacks in by_value.items()}
@@ -0,0 +1,70 @@
+import threading
+import time
+from ._event_ring import EventRing, EventHandler
+
+class HookDispatcher:
+    """
+    Разносит события, записанные хуком в EventRing, по подписчикам в отдельном потоке.
+    Hook proc только вызывает post() и сразу возвращает управление системе.
+    """
+    def __init__(self, name: str, handler: EventHandler, capacity: int = 1024):
+        self._name = name
+        self._handler = handler
+        self._ring = EventRing(capacity)
+        self._wakeup = threading.Event()
+        self._waiting = False
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ring(self) -> EventRing:
+        return self._ring
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_handler(self, handler: EventHandler):
+        # Поток диспетчера читает self._handler на каждом проходе, замена вступает в силу со следующего drain()
+        self._handler = handler
+
+    def start(self):
+        if self.is_running:
+            return
+
+        self._ring.clear()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+            if self._thread.is_alive():
+                print(f"[!] {self._name} thread did not terminate cleanly")
+        self._thread = None
+
+    def post(self, code: int, flags: int, data: int = 0) -> bool:
+        if not self._ring.push(code, flags, data, time.perf_counter_ns()):
+            return False
+        if self._waiting:
+            self._wakeup.set()
+        return True
+
+    def _loop(self):
+        ring = self._ring
+        while self._running:
+            try:
+                ring.drain(self._handler)
+            except Exception as e:
+                print(f"[{self._name}] Dispatch error: {e}")
+                continue
+
+            # Сначала объявляем ожидание, потом перепроверяем буфер — иначе можно пропустить post()
+            self._wakeup.clear()
+            self._waiting = True
+            if not len(ring) and self._running:
+                self._wakeup.wait(0.5)
+            self._waiting = False
@@ -0,0 +1,68 @@
+from array import array
+from typing import Callable
+
+EventHandler = Callable[[int, int, int, int], None]
+
+class EventRing:
+    """
+    Кольцевой буфер фиксированного размера для одного писателя (hook proc) и одного читателя (dispatcher).
+    Записи хранятся в заранее выделенных массивах, поэтому push не создаёт объектов и не берёт блокировок:
+    писатель меняет только _head, читатель — только _tail.
+    """
+    def __init__(self, capacity: int = 1024):
+        size = 1
+        while size < capacity:
+            size <<= 1
+
+        self._mask = size - 1
+        self._codes = array('H', bytes(2 * size))
+        self._flags = array('H', bytes(2 * size))
+        self._data = array('q', bytes(8 * size))
+        self._times = array('q', bytes(8 * size))
+        self._head = 0
+        self._tail = 0
+        self._dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def push(self, code: int, flags: int, data: int, time_ns: int) -> bool:
+        head = self._head
+        if head - self._tail > self._mask:
+            # Буфер полон — теряем новое событие, но не блокируем хук
+            self._dropped += 1
+            return False
+
+        i = head & self._mask
+        self._codes[i] = code
+        self._flags[i] = flags
+        self._data[i] = data
+        self._times[i] = time_ns
+        self._head = head + 1
+        return True
+
+    def drain(self, handler: EventHandler) -> int:
+        tail = self._tail
+        head = self._head
+        mask = self._mask
+        count = head - tail
+
+        while tail != head:
+            i = tail & mask
+            code, flags, data, time_ns = self._codes[i], self._flags[i], self._data[i], self._times[i]
+            tail += 1
+            self._tail = tail
+            handler(code, flags, data, time_ns)
+
+        return count
+
+    def clear(self):
+        self._tail = self._head
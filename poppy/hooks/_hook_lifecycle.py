@@ -0,0 +1,66 @@
+import threading
+from typing import Callable
+
+class HookLifecycle:
+    """
+    Счётчик владельцев системного хука: хук ставится при первом захвате и снимается, когда отпущен последний.
+    Владелец — строка-имя функции приложения (например, "layout_switcher"); один владелец может захватить хук
+    несколько раз, тогда столько же раз его нужно отпустить.
+    """
+    def __init__(self, name: str, start: Callable[[], None], stop: Callable[[], None], is_running: Callable[[], bool]):
+        self._name = name
+        self._start = start
+        self._stop = stop
+        self._is_running = is_running
+        # RLock: отпустить хук можно и из callback'а, который сам выполняется под захватом
+        self._lock = threading.RLock()
+        self._owners: dict[str, int] = {}
+
+    @property
+    def owners(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._owners)
+
+    @property
+    def is_required(self) -> bool:
+        return bool(self._owners)
+
+    def acquire(self, owner: str):
+        with self._lock:
+            self._owners[owner] = self._owners.get(owner, 0) + 1
+            self._apply()
+
+    def release(self, owner: str):
+        with self._lock:
+            count = self._owners.get(owner, 0)
+            if count == 0:
+                print(f"[!] {self._name} hook released by {owner} without acquire")
+                return
+            if count == 1:
+                del self._owners[owner]
+            else:
+                self._owners[owner] = count - 1
+            self._apply()
+
+    def set_required(self, owner: str, required: bool):
+        # Идемпотентная форма для настроек: владелец либо держит хук один раз, либо не держит вовсе
+        with self._lock:
+            if required == (owner in self._owners):
+                return
+            if required:
+                self._owners[owner] = 1
+            else:
+                del self._owners[owner]
+            self._apply()
+
+    def release_all(self, owner: str):
+        with self._lock:
+            if self._owners.pop(owner, None) is not None:
+                self._apply()
+
+    def _apply(self):
+        running = self._is_running()
+        if self._owners and not running:
+            self._start()
+        elif not self._owners and running:
+            self._stop()
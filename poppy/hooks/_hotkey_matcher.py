@@ -0,0 +1,174 @@
+import threading
+from itertools import product
+from typing import Callable, Sequence, Optional
+from ._key import HotkeyType
+from ._callbacks import next_callback_id, CallbackWrapper
+
+HotkeyCallback = Callable[[], None]
+# Хоткей — последовательность групп кодов, каждая группа — допустимые альтернативы (например, левый/правый Ctrl)
+HotkeyGroups = Sequence[Sequence[int]]
+HotkeyValue = frozenset[frozenset[int]]
+
+class _Hotkey:
+    __slots__ = ("value", "masks", "callback", "hotkey_type")
+
+    def __init__(self, value: HotkeyValue, masks: tuple[int, ...], callback: HotkeyCallback, hotkey_type: HotkeyType):
+        self.value = value
+        self.masks = masks
+        self.callback = callback
+        self.hotkey_type = hotkey_type
+
+class HotkeyMatcher:
+    """
+    Состояние нажатых клавиш хранится как битовая маска (бит на код), которая меняется инкрементально.
+    Зарегистрированные хоткеи компилируются в словари маска → кортеж callback'ов, поэтому поиск на событие —
+    один dict.get без создания промежуточных множеств и списков.
+    """
+    def __init__(self, name: str):
+        self._name = name
+        self._lock = threading.Lock()
+        self._hotkeys: dict[int, _Hotkey] = {}
+        self._wrapper: CallbackWrapper | None = None
+
+        self._on_press: dict[int, tuple[HotkeyCallback, ...]] = {}
+        self._on_press_once: dict[int, tuple[HotkeyCallback, ...]] = {}
+        self._on_release: dict[int, tuple[HotkeyCallback, ...]] = {}
+
+        self._pressed = 0
+        # Цепочка уже сработавших состояний для ON_PRESS_ONCE: каждое следующее — надмножество предыдущего,
+        # отпускание клавиши снимает с вершины все состояния, где она была нажата
+        self._once_chain: list[int] = []
+
+    @property
+    def pressed_mask(self) -> int:
+        return self._pressed
+
+    @staticmethod
+    def make_value(groups: HotkeyGroups) -> HotkeyValue:
+        return frozenset(frozenset(group) for group in groups if group)
+
+    def is_pressed(self, code: int) -> bool:
+        return bool((self._pressed >> code) & 1)
+
+    def is_any_pressed(self, mask: int) -> bool:
+        return bool(self._pressed & mask)
+
+    def add(self, groups: HotkeyGroups, callback: HotkeyCallback, hotkey_type: HotkeyType) -> Optional[int]:
+        value = self.make_value(groups)
+        if not value:
+            return None
+
+        masks = tuple({sum(1 << code for code in set(combination)) for combination in product(*value)})
+
+        callback_id = next_callback_id()
+        with self._lock:
+            self._hotkeys[callback_id] = _Hotkey(value, masks, callback, hotkey_type)
+            self._compile()
+        return callback_id
+
+    def remove(self, callback_id: int) -> bool:
+        with self._lock:
+            if self._hotkeys.pop(callback_id, None) is None:
+                return False
+            self._compile()
+            return True
+
+    def replace(self, callback_id: int, callback: HotkeyCallback) -> bool:
+        with self._lock:
+            hotkey = self._hotkeys.get(callback_id)
+            if hotkey is None:
+                return False
+            self._hotkeys[callback_id] = _Hotkey(hotkey.value, hotkey.masks, callback, hotkey.hotkey_type)
+            self._compile()
+            return True
+
+    def items(self) -> list[tuple[int, HotkeyCallback, HotkeyType]]:
+        with self._lock:
+            return [(callback_id, hotkey.callback, hotkey.hotkey_type) for callback_id, hotkey in self._hotkeys.items()]
+
+    def remove_by_value(self, groups: HotkeyGroups, hotkey_type: HotkeyType | None = None):
+        value = self.make_value(groups)
+        with self._lock:
+            ids = [
+                callback_id for callback_id, hotkey in self._hotkeys.items()
+                if hotkey.value == value and (hotkey_type is None or hotkey.hotkey_type == hotkey_type)
+            ]
+            for callback_id in ids:
+                del self._hotkeys[callback_id]
+            if ids:
+                self._compile()
+
+    def clear(self):
+        with self._lock:
+            self._hotkeys.clear()
+            self._compile()
+
+    def set_wrapper(self, wrapper: CallbackWrapper | None):
+        with self._lock:
+            self._wrapper = wrapper
+            self._compile()
+
+    def reset(self):
+        self._pressed = 0
+        self._once_chain.clear()
+
+    def press(self, code: int):
+        self._pressed |= 1 << code
+
+    def release(self, code: int) -> int:
+        # Возвращает состояние до отпускания — по нему ищутся ON_RELEASE хоткеи
+        pressed = self._pressed
+        self._pressed = pressed & ~(1 << code)
+        return pressed
+
+    def trigger_press(self):
+        pressed = self._pressed
+
+        # ON_PRESS — срабатывает каждый раз
+        callbacks = self._on_press.get(pressed)
+        if callbacks:
+            self._run(callbacks, "ON_PRESS")
+
+        # ON_PRESS_ONCE — только если это состояние ещё не срабатывало
+        chain = self._once_chain
+        if not chain or chain[-1] != pressed:
+            chain.append(pressed)
+            callbacks = self._on_press_once.get(pressed)
+            if callbacks:
+                self._run(callbacks, "ON_PRESS_ONCE")
+
+    def trigger_release(self, pressed: int, code: int):
+        # ON_RELEASE: срабатывает при отпускании
+        callbacks = self._on_release.get(pressed)
+        if callbacks:
+            self._run(callbacks, "ON_RELEASE")
+
+        bit = 1 << code
+        chain = self._once_chain
+        while chain and chain[-1] & bit:
+            chain.pop()
+
+    def _run(self, callbacks: tuple[HotkeyCallback, ...], kind: str):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[{self._name} hotkey {kind}] Error: {e}")
+
+    def _compile(self):
+        tables: dict[HotkeyType, dict[int, list[HotkeyCallback]]] = {
+            HotkeyType.ON_PRESS: {},
+            HotkeyType.ON_PRESS_ONCE: {},
+            HotkeyType.ON_RELEASE: {},
+        }
+        wrapper = self._wrapper
+        for callback_id, hotkey in self._hotkeys.items():
+            table = tables[hotkey.hotkey_type]
+            callback = hotkey.callback if wrapper is None else wrapper(callback_id, hotkey.callback)
+            for mask in hotkey.masks:
+                table.setdefault(mask, []).append(callback)
+
+        # Присваиваем готовые таблицы целиком — поток хука никогда не видит их частично собранными
+        self._on_press = {mask: tuple(callbacks) for mask, callbacks in tables[HotkeyType.ON_PRESS].items()}
+        self._on_press_once = {mask: tuple(callbacks) for mask, callbacks in tables[HotkeyType.ON_PRESS_ONCE].items()}
+        self._on_release = {mask: tuple(callbacks) for mask, callbacks in tables[HotkeyType.ON_RELEASE].items()}
@@ -0,0 +1,218 @@
+import ctypes
+import sys
+from ctypes import wintypes
+from typing import Iterable
+from ._key import KeyStroke
+
+# === Константы ===
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+VK_BACK = 0x08
+VK_LEFT = 0x25
+VK_LSHIFT = 0xA0
+VK_LCONTROL = 0xA2
+VK_LMENU = 0xA4
+
+# === Структуры для SendInput ===
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
+    ]
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
+    ]
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+class _INPUT_UNION(ctypes.Union):
+    _fields_ = [
+        ("mi", MOUSEINPUT),
+        ("ki", KEYBDINPUT),
+        ("hi", HARDWAREINPUT),
+    ]
+
+# Полный размер структуры (с union) — иначе шаг массива не совпадёт с cbSize в SendInput
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("u", _INPUT_UNION),
+    ]
+
+# Запись последовательности: (vk, scan, flags)
+InputEntry = tuple[int, int, int]
+
+class CompiledInput:
+    """
+    Готовый непрерывный массив INPUT. Неизменяем, поэтому его можно сохранить и отправлять повторно
+    без пересборки.
+    """
+    __slots__ = ("_entries", "_array")
+
+    def __init__(self, entries: Iterable[InputEntry]):
+        self._entries: tuple[InputEntry, ...] = tuple(entries)
+        array = (INPUT * len(self._entries))()
+        for inp, (vk, scan, flags) in zip(array, self._entries):
+            inp.type = INPUT_KEYBOARD
+            inp.ki.wVk = vk
+            inp.ki.wScan = scan
+            inp.ki.dwFlags = flags
+        self._array = array
+
+    @property
+    def entries(self) -> tuple[InputEntry, ...]:
+        return self._entries
+
+    @property
+    def array(self) -> ctypes.Array:
+        return self._array
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"CompiledInput(count={len(self._entries)})"
+
+class InputSequence:
+    """
+    Построитель последовательности ввода: нажатия, отпускания, удержание модификаторов и Unicode-символы.
+    compile() собирает всё в один массив INPUT, который отправляется одним вызовом SendInput.
+    """
+    def __init__(self):
+        self._entries: list[InputEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def press(self, vk: int) -> "InputSequence":
+        self._entries.append((vk, 0, 0))
+        return self
+
+    def release(self, vk: int) -> "InputSequence":
+        self._entries.append((vk, 0, KEYEVENTF_KEYUP))
+        return self
+
+    def click(self, vk: int, count: int = 1) -> "InputSequence":
+        entries = self._entries
+        for _ in range(count):
+            entries.append((vk, 0, 0))
+            entries.append((vk, 0, KEYEVENTF_KEYUP))
+        return self
+
+    def backspace(self, count: int = 1) -> "InputSequence":
+        return self.click(VK_BACK, count)
+
+    def select_left(self, count: int) -> "InputSequence":
+        """Shift+← count раз: выделяет count символов перед курсором."""
+        entries = self._entries
+        entries.append((VK_LSHIFT, 0, 0))
+        # Стрелка — расширенная клавиша; без флага она приходит как клавиша цифрового блока
+        for _ in range(count):
+            entries.append((VK_LEFT, 0, KEYEVENTF_EXTENDEDKEY))
+            entries.append((VK_LEFT, 0, KEYEVENTF_EXTENDEDKEY | KEYEVENTF_KEYUP))
+        entries.append((VK_LSHIFT, 0, KEYEVENTF_KEYUP))
+        return self
+
+    def hotkey(self, vks: Iterable[int]) -> "InputSequence":
+        vks = list(vks)
+        for vk in vks:
+            self.press(vk)
+        for vk in reversed(vks):
+            self.release(vk)
+        return self
+
+    def keystroke(self, keystroke: KeyStroke) -> "InputSequence":
+        return self.keystrokes((keystroke,))
+
+    def keystrokes(self, keystrokes: Iterable[KeyStroke]) -> "InputSequence":
+        # Модификаторы держим, пока они нужны подряд идущим нажатиям, и отпускаем только при смене состояния
+        held = {VK_LCONTROL: False, VK_LMENU: False, VK_LSHIFT: False}
+        for ks in keystrokes:
+            if ks.vk is None:
+                continue
+            wanted = {VK_LCONTROL: ks.ctrl, VK_LMENU: ks.alt, VK_LSHIFT: ks.shift}
+            for vk in (VK_LSHIFT, VK_LMENU, VK_LCONTROL):
+                if held[vk] and not wanted[vk]:
+                    self.release(vk)
+                    held[vk] = False
+            for vk in (VK_LCONTROL, VK_LMENU, VK_LSHIFT):
+                if wanted[vk] and not held[vk]:
+                    self.press(vk)
+                    held[vk] = True
+            self.click(ks.vk)
+
+        for vk in (VK_LSHIFT, VK_LMENU, VK_LCONTROL):
+            if held[vk]:
+                self.release(vk)
+        return self
+
+    def text(self, text: str) -> "InputSequence":
+        entries = self._entries
+        # SendInput принимает UTF-16 code units, символы вне BMP уходят суррогатной парой
+        data = text.encode("utf-16-le")
+        for i in range(0, len(data), 2):
+            unit = data[i] | (data[i + 1] << 8)
+            entries.append((0, unit, KEYEVENTF_UNICODE))
+            entries.append((0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+        return self
+
+    def extend(self, other: "InputSequence | CompiledInput") -> "InputSequence":
+        self._entries.extend(other.entries if isinstance(other, CompiledInput) else other._entries)
+        return self
+
+    def compile(self) -> CompiledInput:
+        return CompiledInput(self._entries)
+
+class InputBackend:
+    def send(self, compiled: CompiledInput) -> int:
+        raise NotImplementedError
+
+class SendInputBackend(InputBackend):
+    def __init__(self):
+        self._send_input = ctypes.windll.user32.SendInput
+
+    def send(self, compiled: CompiledInput) -> int:
+        count = len(compiled)
+        if count == 0:
+            return 0
+        return self._send_input(count, compiled.array, ctypes.sizeof(INPUT))
+
+class RecordingBackend(InputBackend):
+    """Записывает отправленное в память вместо системы — для проверки и замеров без Windows."""
+    def __init__(self):
+        self.calls = 0
+        self.entries: list[InputEntry] = []
+
+    def send(self, compiled: CompiledInput) -> int:
+        self.calls += 1
+        self.entries.extend(compiled.entries)
+        return len(compiled)
+
+    def clear(self):
+        self.calls = 0
+        self.entries.clear()
+
+def create_default_backend() -> InputBackend:
+    if sys.platform == "win32":
+        return SendInputBackend()
+    return RecordingBackend()
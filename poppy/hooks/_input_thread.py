@@ -0,0 +1,191 @@
+import ctypes
+import itertools
+import queue
+import threading
+from ctypes import wintypes
+from typing import Callable
+from ._win32 import user32, kernel32, HOOKPROC, WM_QUIT, WM_APP, PM_NOREMOVE
+
+HookProcFunction = Callable[[int, int, int], int]
+
+# Сообщение потоку: выполнить поставленные в очередь вызовы (установка/снятие хуков)
+WM_INPUT_THREAD_CALL = WM_APP + 1
+
+class _Hook:
+    __slots__ = ("proc", "native_proc", "handle")
+
+    def __init__(self, proc: HookProcFunction):
+        self.proc = proc
+        self.native_proc: HOOKPROC | None = None
+        self.handle: wintypes.HHOOK | None = None
+
+class InputThread:
+    """
+    Один поток с циклом сообщений для всех low-level хуков. Хуки ставятся и снимаются в этом же потоке
+    (SetWindowsHookExW привязывает хук к вызывающему потоку); поток живёт, пока зарегистрирован хотя бы один хук.
+    Все события хуков приходят последовательно, поэтому общий счётчик next_sequence() задаёт их полный порядок.
+    """
+    def __init__(self, name: str = "Input thread"):
+        self._name = name
+        self._lock = threading.RLock()
+        self._hooks: dict[int, _Hook] = {}
+        # Хуки, установленные текущим циклом сообщений; снимаются им же при выходе
+        self._installed: dict[int, _Hook] = {}
+        self._calls: queue.SimpleQueue[tuple[Callable[[], None], threading.Event]] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._sequence = itertools.count(1)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_current(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def next_sequence(self) -> int:
+        # next() у itertools.count атомарен под GIL
+        return next(self._sequence)
+
+    def is_installed(self, hook_type: int) -> bool:
+        hook = self._hooks.get(hook_type)
+        return hook is not None and bool(hook.handle)
+
+    def add_hook(self, hook_type: int, proc: HookProcFunction) -> bool:
+        with self._lock:
+            if hook_type in self._hooks:
+                print(f"[!] {self._name}: hook {hook_type} is already installed")
+                return False
+
+            hook = _Hook(proc)
+            self._hooks[hook_type] = hook
+            if not self.is_running:
+                self._start()
+            self._call(lambda: self._install(hook_type, hook))
+
+            if not hook.handle:
+                del self._hooks[hook_type]
+                if not self._hooks:
+                    self._stop()
+                return False
+            return True
+
+    def remove_hook(self, hook_type: int):
+        with self._lock:
+            hook = self._hooks.pop(hook_type, None)
+            if hook is None:
+                return
+            if self._hooks:
+                self._call(lambda: self._uninstall(hook_type, hook))
+            else:
+                # Последний хук снимет сам цикл сообщений при выходе
+                self._stop()
+
+    def _start(self):
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._message_loop, name=self._name, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=1):
+            print(f"[!] {self._name} did not start in time")
+
+    def _stop(self):
+        thread = self._thread
+        if thread is None:
+            return
+
+        if thread.is_alive():
+            user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            # Остановка из callback'а в самом потоке: join повис бы, цикл выйдет после возврата из хука
+            if thread is not threading.current_thread():
+                thread.join(timeout=1)
+                if thread.is_alive():
+                    print(f"[!] {self._name} did not terminate cleanly")
+        self._thread = None
+
+    def _call(self, function: Callable[[], None]):
+        if self.is_current:
+            function()
+            return
+
+        done = threading.Event()
+        self._calls.put((function, done))
+        user32.PostThreadMessageW(self._thread_id, WM_INPUT_THREAD_CALL, 0, 0)
+        if not done.wait(timeout=1):
+            print(f"[!] {self._name}: call timed out")
+
+    def _run_calls(self):
+        while True:
+            try:
+                function, done = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                function()
+            except Exception as e:
+                print(f"[{self._name}] Error: {e}")
+            finally:
+                done.set()
+
+    def _install(self, hook_type: int, hook: _Hook):
+        # Вызов мог дождаться своей очереди уже после таймаута в add_hook: хук успели забыть (или заменить),
+        # и установленный сейчас остался бы никем не учтённым. Блокировка — чтобы add_hook не забыл его прямо сейчас
+        with self._lock:
+            if self._hooks.get(hook_type) is not hook:
+                print(f"[!] {self._name}: hook {hook_type} install skipped, the request has timed out")
+                return
+            self._set_hook(hook_type, hook)
+
+    def _set_hook(self, hook_type: int, hook: _Hook):
+        hook.native_proc = HOOKPROC(hook.proc)
+        hook.handle = user32.SetWindowsHookExW(hook_type, hook.native_proc, 0, 0)
+        if not hook.handle:
+            print(f"Failed to install hook {hook_type} (error {kernel32.GetLastError()})")
+            hook.native_proc = None
+            return
+        self._installed[hook_type] = hook
+        print(f"[+] Hook {hook_type} installed")
+
+    def _uninstall(self, hook_type: int, hook: _Hook):
+        if self._installed.get(hook_type) is hook:
+            del self._installed[hook_type]
+        if hook.handle:
+            user32.UnhookWindowsHookEx(hook.handle)
+            print(f"[-] Hook {hook_type} removed")
+        hook.handle = None
+        hook.native_proc = None
+
+    def _message_loop(self):
+        msg = wintypes.MSG()
+        self._thread_id = kernel32.GetCurrentThreadId()
+        # Создаём очередь сообщений потока до того, как кто-то вызовет PostThreadMessageW
+        user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)
+        installed = self._installed = {}
+        self._ready.set()
+
+        while True:
+            ret = user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
+            if ret == 0:        # WM_QUIT
+                break
+            elif ret == -1:
+                error_code = kernel32.GetLastError()
+                print(f"[!] GetMessageW failed with error {error_code}")
+                break
+            elif msg.message == WM_INPUT_THREAD_CALL and not msg.hWnd:
+                self._run_calls()
+            else:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+
+        # Вызовы, пришедшие после WM_QUIT, не должны ждать таймаута
+        self._run_calls()
+        for hook_type, hook in list(installed.items()):
+            if hook.handle:
+                user32.UnhookWindowsHookEx(hook.handle)
+                print(f"[-] Hook {hook_type} removed")
+            hook.handle = None
+            hook.native_proc = None
+        installed.clear()
+
+input_thread: InputThread = InputThread()
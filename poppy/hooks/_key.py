@@ -6,9 +6,25 @@ from enum import Enum, auto
 import time
 
 class Key:
-    def __init__(self, vk_code: int):
-        self._vk_code = vk_code
-        self._name = VK_NAMES.get(vk_code) or "Unknown"
+    """
+    Неизменяемая клавиша. Экземпляры для всех 256 VK создаются один раз и переиспользуются:
+    Key(vk) возвращает уже готовый объект, поэтому хук не создаёт новых Key на каждое событие.
+    """
+    __slots__ = ("_vk_code", "_name")
+
+    _table: list["Key"] = []
+
+    def __new__(cls, vk_code: int):
+        if 0 <= vk_code < len(cls._table):
+            return cls._table[vk_code]
+        return cls._create(vk_code)
+
+    @classmethod
+    def _create(cls, vk_code: int) -> "Key":
+        key = object.__new__(cls)
+        object.__setattr__(key, "_vk_code", vk_code)
+        object.__setattr__(key, "_name", VK_NAMES.get(vk_code) or "Unknown")
+        return key
 
     @property
     def vk(self) -> int: return self._vk_code
@@ -16,23 +32,44 @@ class Key:
     @property
     def name(self) -> str: return self._name
 
+    def __setattr__(self, name, value):
+        raise AttributeError("Key is immutable")
+
+    def __reduce__(self):
+        return Key, (self._vk_code,)
+
     def __repr__(self):
         return f"{self.name} (vk={self._vk_code})"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, Key):
             return self._vk_code == other._vk_code
         return False
 
+    def __hash__(self):
+        return self._vk_code
+
+Key._table = [Key._create(vk) for vk in range(256)]
+
 class KeyEventType(Enum):
     PRESS = auto()
     RELEASE = auto()
 
 class KeyEvent:
-    def __init__(self, event_type: KeyEventType, key: Key):
+    """Одно событие создаётся на нажатие/отпускание и передаётся всем подписчикам."""
+    __slots__ = ("_type", "_key", "_time_ns", "_seq", "_injected")
+
+    def __init__(self, event_type: KeyEventType, key: Key, time_ns: int | None = None, seq: int = 0, injected: bool = False):
         self._type = event_type
         self._key = key
-        self._time = time.time()
+        # Монотонное время (perf_counter_ns) — пригодно для измерения задержек, но не для даты
+        self._time_ns = time.perf_counter_ns() if time_ns is None else time_ns
+        # Номер события, общий для клавиатуры и мыши — задаёт их взаимный порядок
+        self._seq = seq
+        # Событие создано SendInput (в том числе самим приложением), а не физической клавиатурой
+        self._injected = injected
 
     @property
     def event_type(self) -> KeyEventType:
@@ -42,12 +79,24 @@ class KeyEvent:
     def key(self) -> Key:
         return self._key
 
+    @property
+    def time_ns(self) -> int:
+        return self._time_ns
+
     @property
     def time(self) -> float:
-        return self._time
+        return self._time_ns / 1e9
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def is_injected(self) -> bool:
+        return self._injected
 
     def __repr__(self):
-        return f"KeyEvent({self._type}, key={self._key}, time={self._time})"
+        return f"KeyEvent({self._type}, key={self._key}, time_ns={self._time_ns})"
 
 class HotkeyType(Enum):
     ON_PRESS = auto()
@@ -10,98 +10,47 @@
 
 import ctypes
 from ctypes import wintypes
-import threading
+import time
 from typing import Callable, Sequence, Union, Optional
 from contextlib import contextmanager
 from ._key import Key, KeyEvent, KeyEventType, HotkeyType, KeyStroke
-from ._keys import keys
-from ._utils import get_vk, parse_hotkey_string
+from ._utils import get_vk, get_vk_group, parse_hotkey_string, VK_GROUPS
 from ._callbacks import Callbacks, ValuableCallbacks
-
-# === Добавляем недостающие типы ===
-if not hasattr(wintypes, 'LRESULT'):
-    wintypes.LRESULT = ctypes.c_ssize_t
-if not hasattr(wintypes, 'HHOOK'):
-    wintypes.HHOOK = wintypes.HANDLE
-if not hasattr(wintypes, 'LPMSG'):
-    wintypes.LPMSG = ctypes.POINTER(wintypes.MSG)
-if not hasattr(wintypes, 'HKL'):
-    wintypes.HKL = wintypes.HANDLE
-
-# === WinAPI ===
-user32 = ctypes.windll.user32
-kernel32 = ctypes.windll.kernel32
+from ._hotkey_matcher import HotkeyMatcher
+from ._dispatcher import HookDispatcher
+from ._input_sequence import InputSequence, CompiledInput, InputBackend, create_default_backend
+from ._recorder import EventRecorder
+from ._profiler import HookProfiler
+from ._hook_lifecycle import HookLifecycle
+from ._input_thread import input_thread
+from ._win32 import user32, WH_KEYBOARD_LL
 
 # === Константы ===
-WH_KEYBOARD_LL = 13
 WM_KEYDOWN = 0x0100
 WM_KEYUP = 0x0101
 WM_SYSKEYDOWN = 0x0104
 WM_SYSKEYUP = 0x0105
-INPUT_KEYBOARD = 1
-KEYEVENTF_KEYUP = 0x0002
-KEYEVENTF_UNICODE = 0x0004
-INPUT_SIZE = 40 if ctypes.sizeof(ctypes.c_void_p) == 8 else 28
+LLKHF_INJECTED = 0x10
 
-# === Структуры для SendInput ===
-class KEYBDINPUT(ctypes.Structure):
+# Флаги записи в EventRing
+EVENT_RELEASE = 0x01
+EVENT_SYSTEM = 0x02
+EVENT_INJECTED = 0x04
+
+# === Структура для хука ===
+class KBDLLHOOKSTRUCT(ctypes.Structure):
     _fields_ = [
-        ("wVk", wintypes.WORD),
-        ("wScan", wintypes.WORD),
-        ("dwFlags", wintypes.DWORD),
+        ("vkCode", wintypes.DWORD),
+        ("scanCode", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
         ("time", wintypes.DWORD),
         ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
     ]
 
-class INPUT(ctypes.Structure):
-    _fields_ = [
-        ("type", wintypes.DWORD),
-        ("ki", KEYBDINPUT),
-    ]
-
-# === Типы ===
-# noinspection PyUnresolvedReferences
-HOOKPROC = ctypes.WINFUNCTYPE(wintypes.LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
-
-user32.SetWindowsHookExW.argtypes = (wintypes.INT, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD)
-user32.SetWindowsHookExW.restype = wintypes.HHOOK
-
-user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
-# noinspection PyUnresolvedReferences
-user32.CallNextHookEx.restype = wintypes.LRESULT
-
-user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
-user32.UnhookWindowsHookEx.restype = wintypes.BOOL
-
-user32.GetMessageW.argtypes = (wintypes.LPMSG, wintypes.HWND, wintypes.UINT, wintypes.UINT)
-user32.GetMessageW.restype = wintypes.BOOL
-
-user32.TranslateMessage.argtypes = (wintypes.LPMSG,)
-user32.DispatchMessageW.argtypes = (wintypes.LPMSG,)
-
-user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
-user32.PostThreadMessageW.restype = wintypes.BOOL
-
-kernel32.GetLastError.argtypes = ()
-kernel32.GetLastError.restype = wintypes.DWORD
-
-user32.GetKeyState.argtypes = (wintypes.INT,)
-user32.GetKeyState.restype = wintypes.SHORT
-
-user32.VkKeyScanExW.argtypes = (wintypes.WORD, wintypes.HKL)
-user32.VkKeyScanExW.restype = wintypes.SHORT
-
-user32.ToUnicodeEx.argtypes = (
-    wintypes.UINT,
-    wintypes.UINT,
-    ctypes.POINTER(wintypes.BYTE * 256),
-    wintypes.LPWSTR,
-    ctypes.c_int,
-    wintypes.UINT,
-    wintypes.HKL
-)
-user32.ToUnicodeEx.restype = ctypes.c_int
-
+SHIFT_MASK = (1 << 0xA0) | (1 << 0xA1)
+CTRL_MASK = (1 << 0xA2) | (1 << 0xA3)
+ALT_MASK = (1 << 0xA4) | (1 << 0xA5)
+WIN_MASK = (1 << 0x5B) | (1 << 0x5C)
 
 KeyEventCallback = Callable[[KeyEvent], Optional[bool]]
 HotkeyCallback = Callable[[], None]
@@ -110,45 +59,142 @@ HotkeyParameter = Union[Sequence[KeyParameter], str]
 
 class Keyboard:
     def __init__(self):
-        self._thread: threading.Thread | None = None
-        self._hook_proc: HOOKPROC | None = None
-        self._hook_handle: wintypes.HHOOK | None = None
-        
-        self._pressed_keys: set[int] = set()
+        self._lifecycle = HookLifecycle("Keyboard", self.start, self.stop, lambda: self.is_running)
         
         self._any_key_callbacks = Callbacks[KeyEventCallback]()
         self._key_callbacks = ValuableCallbacks[int, KeyEventCallback]()
-        self._hotkeys_on_press_callbacks = ValuableCallbacks[frozenset[int], HotkeyCallback]()
-        self._hotkeys_on_press_once_callbacks = ValuableCallbacks[frozenset[int], HotkeyCallback]()
-        self._hotkeys_on_release_callbacks = ValuableCallbacks[frozenset[int], HotkeyCallback]()
-        self._active_once_hotkeys: set[frozenset[int]] = set()
+        # Хранит и состояние нажатых клавиш (битовая маска), и скомпилированные хоткеи
+        self._hotkeys = HotkeyMatcher("Keyboard")
+
+        # Таблица подавления проверяется прямо в hook proc, поэтому хранит счётчики по vk
+        self._suppressed_keys: list[int] = [0] * 256
+        # Подписчики, уже предупреждённые о том, что в режиме диспетчера их подавление не работает
+        self._dispatch_warned: set[str] = set()
+        self._dispatcher: HookDispatcher | None = None
+        self._recorder: EventRecorder | None = None
+        # _profiler задан только пока профилирование включено — его проверяет hook proc
+        self._profiler: HookProfiler | None = None
+        self._hook_profiler: HookProfiler | None = None
+
+        self._input_backend: InputBackend = create_default_backend()
+        # Скомпилированные последовательности для строковых хоткеев (click_hotkey("ctrl+c") и т.п.)
+        self._compiled_hotkeys: dict[str, CompiledInput] = {}
         
     @property
     def is_running(self) -> bool:
-        return self._thread is not None and self._thread.is_alive()
+        return input_thread.is_installed(WH_KEYBOARD_LL)
+
+    @property
+    def lifecycle(self) -> HookLifecycle:
+        return self._lifecycle
+
+    def acquire_hook(self, owner: str):
+        """Хук установлен, пока его держит хотя бы один владелец; start()/stop() вызываются автоматически."""
+        self._lifecycle.acquire(owner)
+
+    def release_hook(self, owner: str):
+        self._lifecycle.release(owner)
+
+    def set_hook_required(self, owner: str, required: bool):
+        self._lifecycle.set_required(owner, required)
+
+    @property
+    def threaded_dispatch(self) -> bool:
+        return self._dispatcher is not None
+
+    @property
+    def is_profiling(self) -> bool:
+        return self._profiler is not None
+
+    @property
+    def profiler(self) -> HookProfiler:
+        if self._hook_profiler is None:
+            self._hook_profiler = HookProfiler("Keyboard")
+        return self._hook_profiler
+
+    @property
+    def input_backend(self) -> InputBackend:
+        return self._input_backend
+
+    def set_input_backend(self, backend: InputBackend):
+        self._input_backend = backend
 
     def start(self):
         if self.is_running:
             print("[!] Keyboard hook is already running")
             return
         
-        self._thread = threading.Thread(target=self._message_loop, daemon=True)
-        self._thread.start()
+        if self._dispatcher is not None:
+            self._dispatcher.start()
+        
+        if not input_thread.add_hook(WH_KEYBOARD_LL, self._create_hook_proc()):
+            print("Failed to install keyboard hook")
+            if self._dispatcher is not None:
+                self._dispatcher.stop()
     
     def stop(self):
-        if self.is_running:
-            user32.PostThreadMessageW(wintypes.DWORD(self._thread.native_id), 0x0012, 0, 0)     # WM_QUIT
-            self._thread.join(timeout=1)
-
-            if self._thread.is_alive():
-                print("[!] Keyboard thread did not terminate cleanly, forcing unhook")
-                if self._hook_handle:
-                    user32.UnhookWindowsHookEx(self._hook_handle)
-                    self._hook_handle = None
-                    self._hook_proc = None
-
-        self._thread = None
-        self._pressed_keys.clear()
+        input_thread.remove_hook(WH_KEYBOARD_LL)
+
+        if self._dispatcher is not None:
+            self._dispatcher.stop()
+
+        self._hotkeys.reset()
+
+    def set_threaded_dispatch(self, enabled: bool):
+        """
+        В этом режиме hook proc только записывает событие в кольцевой буфер и проверяет таблицу подавления,
+        а подписчики вызываются из отдельного потока. Возвращаемое callback'ами значение при этом не подавляет
+        событие — для подавления используйте suppress_key(). Подписчик, вернувший False (просьба подавить),
+        получает предупреждение в лог, а не молча теряет подавление.
+        """
+        if enabled == self.threaded_dispatch:
+            return
+
+        if enabled:
+            self._dispatcher = HookDispatcher("Keyboard dispatcher", self._get_dispatch_handler())
+            if self.is_running:
+                self._dispatcher.start()
+        else:
+            dispatcher = self._dispatcher
+            self._dispatcher = None
+            dispatcher.stop()
+
+    def set_recorder(self, recorder: EventRecorder | None):
+        self._recorder = recorder
+
+    def set_profiling(self, enabled: bool):
+        """
+        Замеряет время каждого подписчика и всего hook proc (см. profiler). Выключенное профилирование
+        ничего не стоит: подписчики вызываются напрямую, а hook proc только проверяет _profiler на None.
+        """
+        if enabled == self.is_profiling:
+            return
+
+        profiler = self.profiler if enabled else None
+        self._any_key_callbacks.set_wrapper(profiler.wrapper("hook") if profiler else None)
+        self._key_callbacks.set_wrapper(profiler.wrapper("key") if profiler else None)
+        self._hotkeys.set_wrapper(profiler.wrapper("hotkey") if profiler else None)
+        self._profiler = profiler
+
+        if self._dispatcher is not None:
+            self._dispatcher.set_handler(self._get_dispatch_handler())
+
+    def suppress_key(self, key: KeyParameter) -> bool:
+        vk = self._get_vk_form_key(key)
+        if vk is None or not 0 <= vk < 256:
+            return False
+        
+        self._suppressed_keys[vk] += 1
+        return True
+
+    def unsuppress_key(self, key: KeyParameter):
+        vk = self._get_vk_form_key(key)
+        if vk is not None and 0 <= vk < 256 and self._suppressed_keys[vk] > 0:
+            self._suppressed_keys[vk] -= 1
+    
+    def is_key_suppressed(self, key: KeyParameter) -> bool:
+        vk = self._get_vk_form_key(key)
+        return vk is not None and 0 <= vk < 256 and self._suppressed_keys[vk] > 0
     
     def hook(self, callback: KeyEventCallback) -> int:
         return self._any_key_callbacks.add(callback)
@@ -178,60 +224,26 @@ class Keyboard:
         self._key_callbacks.clear()
 
     def hook_hotkey(self, hotkey: HotkeyParameter, callback: HotkeyCallback, hotkey_type: HotkeyType = HotkeyType.ON_PRESS_ONCE) -> Optional[int]:
-        key_list = self._get_hotkey_list(hotkey)
-        vks = (self._get_vk_form_key(k) for k in key_list)
-        vk_set = frozenset(vk for vk in vks if vk is not None)
-        if not vk_set:
+        groups = self._get_hotkey_groups(hotkey)
+        if not groups:
             print(f"[!] Invalid keyboard hotkey: {hotkey}")
             return None
         
-        if hotkey_type == HotkeyType.ON_PRESS:
-            return self._hotkeys_on_press_callbacks.add(vk_set, callback)
-        if hotkey_type == HotkeyType.ON_PRESS_ONCE:
-            return self._hotkeys_on_press_once_callbacks.add(vk_set, callback)
-        if hotkey_type == HotkeyType.ON_RELEASE:
-            return self._hotkeys_on_release_callbacks.add(vk_set, callback)
-        
-        return None
+        return self._hotkeys.add(groups, callback, hotkey_type)
     
     def unhook_hotkey(self, callback_id: int):
-        callback = self._hotkeys_on_press_once_callbacks.remove(callback_id)
-        if callback:
-            self._active_once_hotkeys.discard(callback.value)
-            return 
-            
-        if self._hotkeys_on_release_callbacks.remove(callback_id):
-            return
-        
-        self._hotkeys_on_press_callbacks.remove(callback_id)
+        self._hotkeys.remove(callback_id)
     
     def unhook_hotkey_global(self, hotkey: HotkeyParameter, hotkey_type: HotkeyType | None = None):
-        key_list = self._get_hotkey_list(hotkey)
-        vks = (self._get_vk_form_key(k) for k in key_list)
-        vk_set = frozenset(vk for vk in vks if vk is not None)
-        if not vk_set:
+        groups = self._get_hotkey_groups(hotkey)
+        if not groups:
             print(f"[!] Invalid keyboard hotkey: {hotkey}")
             return
     
-        if hotkey_type is None:
-            self._hotkeys_on_press_callbacks.remove_by_value(vk_set)
-            self._hotkeys_on_press_once_callbacks.remove_by_value(vk_set)
-            self._hotkeys_on_release_callbacks.remove_by_value(vk_set)
-            self._active_once_hotkeys.discard(vk_set)
-        else:
-            if hotkey_type == HotkeyType.ON_PRESS:
-                self._hotkeys_on_press_callbacks.remove_by_value(vk_set)
-            elif hotkey_type == HotkeyType.ON_PRESS_ONCE:
-                self._hotkeys_on_press_once_callbacks.remove_by_value(vk_set)
-                self._active_once_hotkeys.discard(vk_set)
-            elif hotkey_type == HotkeyType.ON_RELEASE:
-                self._hotkeys_on_release_callbacks.remove_by_value(vk_set)
+        self._hotkeys.remove_by_value(groups, hotkey_type)
 
     def unhook_all_hotkeys(self):
-        self._hotkeys_on_press_callbacks.clear()
-        self._hotkeys_on_press_once_callbacks.clear()
-        self._hotkeys_on_release_callbacks.clear()
-        self._active_once_hotkeys.clear()
+        self._hotkeys.clear()
     
     def unhook_all(self):
         self.unhook_global()
@@ -255,27 +267,43 @@ class Keyboard:
         if vk is None:
             raise ValueError(f"Invalid keyboard key: {key}")
 
+        sequence = InputSequence()
         if press:
-            self._send_input(self._create_input(vk, key_down=True), "keyboard key press")
+            sequence.press(vk)
         if release:
-            self._send_input(self._create_input(vk, key_down=False), "keyboard key release")
+            sequence.release(vk)
+        self.send(sequence, "keyboard key")
 
     def click_hotkey(self, hotkey: HotkeyParameter):
-        key_list = self._get_hotkey_list(hotkey)
+        if isinstance(hotkey, str):
+            compiled = self._compiled_hotkeys.get(hotkey)
+            if compiled is None:
+                compiled = self.compile_hotkey(hotkey)
+                self._compiled_hotkeys[hotkey] = compiled
+        else:
+            compiled = self.compile_hotkey(hotkey)
+
+        self.send(compiled, "keyboard hotkey")
+
+    def compile_hotkey(self, hotkey: HotkeyParameter) -> CompiledInput:
         vks = []
-        for k in key_list:
+        for k in self._get_hotkey_list(hotkey):
             vk = self._get_vk_form_key(k)
             if vk is None:
                 raise ValueError(f"Invalid keyboard key in hotkey: {k}")
             vks.append(vk)
 
-        if not vks:
-            return
+        return InputSequence().hotkey(vks).compile()
 
-        for vk in vks:
-            self._send_input(self._create_input(vk, key_down=True), "keyboard hotkey press")
-        for vk in reversed(vks):
-            self._send_input(self._create_input(vk, key_down=False), "keyboard hotkey release")
+    def send(self, sequence: InputSequence | CompiledInput, action: str = "keyboard input") -> int:
+        compiled = sequence if isinstance(sequence, CompiledInput) else sequence.compile()
+        if not len(compiled):
+            return 0
+        
+        result = self._input_backend.send(compiled)
+        if result != len(compiled):
+            raise RuntimeError(f"SendInput {action} failed ({result}/{len(compiled)} events sent)")
+        return result
 
     @contextmanager
     def hold(self, *hold_keys: KeyParameter):
@@ -299,25 +327,23 @@ class Keyboard:
         if not text:
             return
     
-        for char in text:
-            # Нажатие и отпускание Unicode-символа
-            self._send_input(self._create_unicode_input(char, key_down=True), "keyboard type press")
-            self._send_input(self._create_unicode_input(char, key_down=False), "keyboard type release")
+        self.send(InputSequence().text(text), "keyboard type")
         
     def is_key_pressed(self, key: KeyParameter) -> bool:
-        return self._get_vk_form_key(key) in self._pressed_keys
+        vk = self._get_vk_form_key(key)
+        return vk is not None and self._hotkeys.is_pressed(vk)
 
     def is_win_pressed(self) -> bool:
-        return keys.left_win.vk in self._pressed_keys or keys.right_win.vk in self._pressed_keys
+        return self._hotkeys.is_any_pressed(WIN_MASK)
 
     def is_shift_pressed(self) -> bool:
-        return keys.left_shift.vk in self._pressed_keys or keys.right_shift.vk in self._pressed_keys
+        return self._hotkeys.is_any_pressed(SHIFT_MASK)
 
     def is_ctrl_pressed(self) -> bool:
-        return keys.left_ctrl.vk in self._pressed_keys or keys.right_ctrl.vk in self._pressed_keys
+        return self._hotkeys.is_any_pressed(CTRL_MASK)
 
     def is_alt_pressed(self) -> bool:
-        return keys.left_alt.vk in self._pressed_keys or keys.right_alt.vk in self._pressed_keys
+        return self._hotkeys.is_any_pressed(ALT_MASK)
     
     def vk_to_char(
             self,
@@ -379,21 +405,10 @@ class Keyboard:
         if keystroke.vk is None:
             return 
         
-        if keystroke.ctrl:
-            self.press_key(keys.left_ctrl)
-        if keystroke.alt:
-            self.press_key(keys.left_alt)
-        if keystroke.shift:
-            self.press_key(keys.left_shift)
-    
-        self.click_key(keystroke.vk)
-    
-        if keystroke.shift:
-            self.release_key(keys.left_shift)
-        if keystroke.alt:
-            self.release_key(keys.left_alt)
-        if keystroke.ctrl:
-            self.release_key(keys.left_ctrl)
+        self.send(InputSequence().keystroke(keystroke), "keyboard keystroke")
+
+    def click_keystrokes(self, keystrokes: Sequence[KeyStroke], backspaces: int = 0):
+        self.send(InputSequence().backspace(backspaces).keystrokes(keystrokes), "keyboard keystrokes")
     
     def get_caps_lock(self) -> bool:
         return bool(user32.GetKeyState(0x14) & 0x01)
@@ -420,164 +435,150 @@ class Keyboard:
             return parse_hotkey_string(hotkey)
         
         return hotkey
-    
-    def _create_input(self, vk: int, key_down: bool) -> INPUT:
-        flags = 0 if key_down else KEYEVENTF_KEYUP
-        # scan = 0 — используем VK
-        return INPUT(
-            type=INPUT_KEYBOARD,
-            ki=KEYBDINPUT(
-                wVk=wintypes.WORD(vk),
-                wScan=0,
-                dwFlags=flags,
-                time=0,
-                dwExtraInfo=None
-            )
-        )
 
-    def _create_unicode_input(self, char: str, key_down: bool = True) -> INPUT:
-        if len(char) != 1:
-            raise ValueError("char must be a single character")
-    
-        # Преобразуем в UTF-16 (Windows использует UTF-16)
-        utf16_code = ord(char)
-    
-        flags = KEYEVENTF_UNICODE
-        if not key_down:
-            flags |= KEYEVENTF_KEYUP
-    
-        return INPUT(
-            type=INPUT_KEYBOARD,
-            ki=KEYBDINPUT(
-                wVk=0,  # Для Unicode — 0
-                wScan=wintypes.WORD(utf16_code),
-                dwFlags=flags,
-                time=0,
-                dwExtraInfo=None
-            )
-        )
-    
-    def _send_input(self, press_input: INPUT, text: str):
-        result = user32.SendInput(1, ctypes.byref(press_input), INPUT_SIZE)
-        if result == 0:
-            raise RuntimeError(f"SendInput {text} failed")
-    
-    def _on_press(self, key: Key) -> bool:
+    def _get_hotkey_groups(self, hotkey: HotkeyParameter) -> list[tuple[int, ...]]:
+        groups = []
+        for key in self._get_hotkey_list(hotkey):
+            if isinstance(key, str):
+                group = get_vk_group(key)
+            else:
+                vk = self._get_vk_form_key(key)
+                group = VK_GROUPS.get(vk, (vk,))
+            if group:
+                groups.append(group)
+        return groups
+    
+    def _on_press(self, key: Key, time_ns: int | None = None, seq: int = 0, injected: bool = False,
+                  dispatched: bool = False) -> bool:
         #print(f"{key} pressed")
         
-        self._pressed_keys.add(key.vk)
+        self._hotkeys.press(key.vk)
         
+        event = KeyEvent(KeyEventType.PRESS, key, time_ns, seq, injected)
         suppress = False
 
         for callback in self._any_key_callbacks.get_all():
-            if self._process_callback(KeyEventType.PRESS, key, callback):
+            if self._process_callback(event, callback, dispatched):
                 suppress = True
             
         for callback in self._key_callbacks.get_by_value(key.vk):
-            if self._process_callback(KeyEventType.PRESS, key, callback):
+            if self._process_callback(event, callback, dispatched):
                 suppress = True
 
-        pressed_frozen = frozenset(self._pressed_keys)
-
-        # ON_PRESS — срабатывает каждый раз
-        for callback in self._hotkeys_on_press_callbacks.get_by_value(pressed_frozen):
-            try:
-                callback()
-            except Exception as e:
-                print(f"[Keyboard hotkey ON_PRESS] Error: {e}")
-    
-        # ON_PRESS_ONCE — только если ещё не сработало
-        if pressed_frozen not in self._active_once_hotkeys:
-            self._active_once_hotkeys.add(pressed_frozen)
-            for callback in self._hotkeys_on_press_once_callbacks.get_by_value(pressed_frozen):
-                try:
-                    callback()
-                except Exception as e:
-                    print(f"[keyboard hotkey ON_PRESS_ONCE] Error: {e}")
+        self._hotkeys.trigger_press()
         
         return suppress
     
-    def _on_release(self, key: Key) -> bool:
+    def _on_release(self, key: Key, time_ns: int | None = None, seq: int = 0, injected: bool = False,
+                    dispatched: bool = False) -> bool:
         #print(f"{key} released")
 
-        pressed_frozen = frozenset(self._pressed_keys)
-        
-        released_vk = key.vk
-        self._pressed_keys.discard(key.vk)
+        pressed = self._hotkeys.release(key.vk)
 
+        event = KeyEvent(KeyEventType.RELEASE, key, time_ns, seq, injected)
         suppress = False
 
         for callback in self._any_key_callbacks.get_all():
-            if self._process_callback(KeyEventType.RELEASE, key, callback):
+            if self._process_callback(event, callback, dispatched):
                 suppress = True
 
         for callback in self._key_callbacks.get_by_value(key.vk):
-            if self._process_callback(KeyEventType.RELEASE, key, callback):
+            if self._process_callback(event, callback, dispatched):
                 suppress = True
 
-        # ON_RELEASE: срабатывает при отпускании
-        for callback in self._hotkeys_on_release_callbacks.get_by_value(pressed_frozen):
-            try:
-                callback()
-            except Exception as e:
-                print(f"[Keyboard hotkey ON_RELEASE] Error: {e}")
-
-        to_remove = set()
-        for hk in self._active_once_hotkeys:
-            if released_vk in hk:
-                to_remove.add(hk)
-        self._active_once_hotkeys -= to_remove
+        self._hotkeys.trigger_release(pressed, key.vk)
         
         return suppress
     
-    def _process_callback(self, event_type: KeyEventType, key: Key, callback: KeyEventCallback) -> bool:
-        event = KeyEvent(event_type, key)
+    def _process_callback(self, event: KeyEvent, callback: KeyEventCallback, dispatched: bool = False) -> bool:
         try:
-            return callback(event) is False
+            suppress = callback(event) is False
         except Exception as e:
             print(f"Callback error for keyboard event={event}: {e}")
             return False
+
+        if suppress and dispatched and not self.is_key_suppressed(event.key.vk):
+            self._warn_dispatch_suppress(callback, event)
+        return suppress
+
+    def _warn_dispatch_suppress(self, callback: KeyEventCallback, event: KeyEvent):
+        # Событие уже ушло в систему: подавить его может только таблица suppress_key() в hook proc
+        name = getattr(callback, "__qualname__", repr(callback))
+        if name in self._dispatch_warned:
+            return
+        self._dispatch_warned.add(name)
+        print(f"[!] Keyboard callback {name} returned False for {event.key} in threaded dispatch: "
+              f"the event is not suppressed, use suppress_key()")
+    
+    def _handle_message(self, message: int, vk: int, time_ns: int | None = None, seq: int | None = None, injected: bool = False) -> bool:
+        # Синхронная обработка одного сообщения хука; её же использует воспроизведение записанных логов
+        if seq is None:
+            seq = input_thread.next_sequence()
+        key = Key(vk)
+        if message in (WM_KEYDOWN, WM_SYSKEYDOWN):
+            return self._on_press(key, time_ns, seq, injected)
+        if message in (WM_KEYUP, WM_SYSKEYUP):
+            return self._on_release(key, time_ns, seq, injected)
+        return False
+    
+    def _get_dispatch_handler(self) -> Callable[[int, int, int, int], None]:
+        if self._profiler is None:
+            return self._dispatch_event
+        return self._profiler.wrap_dispatch(self._dispatch_event)
+
+    def _dispatch_event(self, vk: int, flags: int, seq: int, time_ns: int):
+        key = Key(vk)
+        injected = bool(flags & EVENT_INJECTED)
+        if flags & EVENT_RELEASE:
+            self._on_release(key, time_ns, seq, injected, dispatched=True)
+        else:
+            self._on_press(key, time_ns, seq, injected, dispatched=True)
     
-    def _message_loop(self):
+    def _create_hook_proc(self) -> Callable[[int, int, int], int]:
+        suppressed_keys = self._suppressed_keys
+        next_sequence = input_thread.next_sequence
+        
         def low_level_keyboard_proc(nCode, wParam, lParam):
+            profiler = self._profiler
+            if profiler is not None:
+                start = time.perf_counter_ns()
+
+            suppress = False
             try:
-                suppress = False
                 if nCode >= 0:
-                    vk = ctypes.cast(lParam, ctypes.POINTER(ctypes.c_ulong)).contents.value
-                    key = Key(vk)
-                    if wParam in (WM_KEYDOWN, WM_SYSKEYDOWN):
-                        suppress = self._on_press(key) and wParam != WM_SYSKEYDOWN
-                    elif wParam in (WM_KEYUP, WM_SYSKEYUP):
-                        suppress = self._on_release(key) and wParam != WM_SYSKEYUP
-                return 1 if suppress else user32.CallNextHookEx(0, nCode, wParam, lParam)
+                    kb = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                    vk = kb.vkCode
+                    is_press = wParam in (WM_KEYDOWN, WM_SYSKEYDOWN)
+                    is_system = wParam in (WM_SYSKEYDOWN, WM_SYSKEYUP)
+                    
+                    recorder = self._recorder
+                    if recorder is not None:
+                        recorder.record_keyboard(wParam, vk, kb.flags)
+                    
+                    dispatcher = self._dispatcher
+                    if dispatcher is not None:
+                        flags = 0 if is_press else EVENT_RELEASE
+                        if is_system:
+                            flags |= EVENT_SYSTEM
+                        if kb.flags & LLKHF_INJECTED:
+                            flags |= EVENT_INJECTED
+                        # Номер события передаём в поле data записи кольцевого буфера
+                        dispatcher.post(vk, flags, next_sequence())
+                        suppress = suppressed_keys[vk & 0xFF] > 0
+                    else:
+                        suppress = self._handle_message(wParam, vk, None, next_sequence(), bool(kb.flags & LLKHF_INJECTED))
+                        suppress = suppress or suppressed_keys[vk & 0xFF] > 0
+                    
+                    suppress = suppress and not is_system
             except Exception as e:
                 print(f"keyboard hook error: {e}")
-                return user32.CallNextHookEx(0, nCode, wParam, lParam)
-    
-        self._hook_proc = HOOKPROC(low_level_keyboard_proc)
-        self._hook_handle = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._hook_proc, 0, 0)
-        if not self._hook_handle:
-            print("Failed to install keyboard hook")
-            return
-    
-        print("[+] Keyboard hook installed")
-
-        msg = wintypes.MSG()
-        while True:
-            ret = user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
-            if ret == 0:        # WM_QUIT
-                break
-            elif ret == -1:
-                error_code = kernel32.GetLastError()
-                print(f"[!] GetMessageW failed with error {error_code}")
-                break
-            else:
-                user32.TranslateMessage(ctypes.byref(msg))
-                user32.DispatchMessageW(ctypes.byref(msg))
+                suppress = False
+
+            # Время CallNextHookEx (следующие хуки в цепочке) в замер не входит
+            if profiler is not None:
+                profiler.record_hook(time.perf_counter_ns() - start)
+            return 1 if suppress else user32.CallNextHookEx(0, nCode, wParam, lParam)
     
-        user32.UnhookWindowsHookEx(self._hook_handle)
-        self._hook_handle = None
-        self._hook_proc = None
-        print("[-] Keyboard hook removed")
+        return low_level_keyboard_proc
              
 keyboard: Keyboard = Keyboard()
\ No newline at end of file
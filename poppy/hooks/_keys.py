@@ -1,336 +1,223 @@
 from ._key import Key
 
 class Keys:
+    # Константы класса: Key интернированы, обращение keys.x не создаёт объектов
+
     # Стандартные
-    @property
-    def cancel(self) -> Key: return Key(0x03)
-    @property
-    def backspace(self) -> Key: return Key(0x08)
-    @property
-    def tab(self) -> Key: return Key(0x09)
-    @property
-    def clear(self) -> Key: return Key(0x0C)
-    @property
-    def enter(self) -> Key: return Key(0x0D)
-    @property
-    def pause(self) -> Key: return Key(0x13)
-    @property
-    def caps_lock(self) -> Key: return Key(0x14)
-    @property
-    def kana_mode(self) -> Key: return Key(0x15)
-    @property
-    def junja_mode(self) -> Key: return Key(0x17)
-    @property
-    def final_mode(self) -> Key: return Key(0x18)
-    @property
-    def kanji_mode(self) -> Key: return Key(0x19)
-    @property
-    def esc(self) -> Key: return Key(0x1B)
-    @property
-    def convert(self) -> Key: return Key(0x1C)
-    @property
-    def nonconvert(self) -> Key: return Key(0x1D)
-    @property
-    def accept(self) -> Key: return Key(0x1E)
-    @property
-    def mode_change(self) -> Key: return Key(0x1F)
-    @property
-    def space(self) -> Key: return Key(0x20)
-    @property
-    def page_up(self) -> Key: return Key(0x21)
-    @property
-    def page_down(self) -> Key: return Key(0x22)
-    @property
-    def end(self) -> Key: return Key(0x23)
-    @property
-    def home(self) -> Key: return Key(0x24)
-    @property
-    def left(self) -> Key: return Key(0x25)
-    @property
-    def up(self) -> Key: return Key(0x26)
-    @property
-    def right(self) -> Key: return Key(0x27)
-    @property
-    def down(self) -> Key: return Key(0x28)
-    @property
-    def select(self) -> Key: return Key(0x29)
-    @property
-    def print_key(self) -> Key: return Key(0x2A)
-    @property
-    def execute(self) -> Key: return Key(0x2B)
-    @property
-    def print_screen(self) -> Key: return Key(0x2C)
-    @property
-    def insert(self) -> Key: return Key(0x2D)
-    @property
-    def delete(self) -> Key: return Key(0x2E)
-    @property
-    def help(self) -> Key: return Key(0x2F)
+    cancel = Key(0x03)
+    backspace = Key(0x08)
+    tab = Key(0x09)
+    clear = Key(0x0C)
+    enter = Key(0x0D)
+    pause = Key(0x13)
+    caps_lock = Key(0x14)
+    kana_mode = Key(0x15)
+    junja_mode = Key(0x17)
+    final_mode = Key(0x18)
+    kanji_mode = Key(0x19)
+    esc = Key(0x1B)
+    convert = Key(0x1C)
+    nonconvert = Key(0x1D)
+    accept = Key(0x1E)
+    mode_change = Key(0x1F)
+    space = Key(0x20)
+    page_up = Key(0x21)
+    page_down = Key(0x22)
+    end = Key(0x23)
+    home = Key(0x24)
+    left = Key(0x25)
+    up = Key(0x26)
+    right = Key(0x27)
+    down = Key(0x28)
+    select = Key(0x29)
+    print_key = Key(0x2A)
+    execute = Key(0x2B)
+    print_screen = Key(0x2C)
+    insert = Key(0x2D)
+    delete = Key(0x2E)
+    help = Key(0x2F)
     
     # Цифры
-    @property
-    def n0(self) -> Key: return Key(0x30)
-    @property
-    def n1(self) -> Key: return Key(0x31)
-    @property
-    def n2(self) -> Key: return Key(0x32)
-    @property
-    def n3(self) -> Key: return Key(0x33)
-    @property
-    def n4(self) -> Key: return Key(0x34)
-    @property
-    def n5(self) -> Key: return Key(0x35)
-    @property
-    def n6(self) -> Key: return Key(0x36)
-    @property
-    def n7(self) -> Key: return Key(0x37)
-    @property
-    def n8(self) -> Key: return Key(0x38)
-    @property
-    def n9(self) -> Key: return Key(0x39)
+    n0 = Key(0x30)
+    n1 = Key(0x31)
+    n2 = Key(0x32)
+    n3 = Key(0x33)
+    n4 = Key(0x34)
+    n5 = Key(0x35)
+    n6 = Key(0x36)
+    n7 = Key(0x37)
+    n8 = Key(0x38)
+    n9 = Key(0x39)
     
     # Буквы
-    @property
-    def a(self) -> Key: return Key(0x41)
-    @property
-    def b(self) -> Key: return Key(0x42)
-    @property
-    def c(self) -> Key: return Key(0x43)
-    @property
-    def d(self) -> Key: return Key(0x44)
-    @property
-    def e(self) -> Key: return Key(0x45)
-    @property
-    def f(self) -> Key: return Key(0x46)
-    @property
-    def g(self) -> Key: return Key(0x47)
-    @property
-    def h(self) -> Key: return Key(0x48)
-    @property
-    def i(self) -> Key: return Key(0x49)
-    @property
-    def j(self) -> Key: return Key(0x4A)
-    @property
-    def k(self) -> Key: return Key(0x4B)
-    @property
-    def l(self) -> Key: return Key(0x4C)
-    @property
-    def m(self) -> Key: return Key(0x4D)
-    @property
-    def n(self) -> Key: return Key(0x4E)
-    @property
-    def o(self) -> Key: return Key(0x4F)
-    @property
-    def p(self) -> Key: return Key(0x50)
-    @property
-    def q(self) -> Key: return Key(0x51)
-    @property
-    def r(self) -> Key: return Key(0x52)
-    @property
-    def s(self) -> Key: return Key(0x53)
-    @property
-    def t(self) -> Key: return Key(0x54)
-    @property
-    def u(self) -> Key: return Key(0x55)
-    @property
-    def v(self) -> Key: return Key(0x56)
-    @property
-    def w(self) -> Key: return Key(0x57)
-    @property
-    def x(self) -> Key: return Key(0x58)
-    @property
-    def y(self) -> Key: return Key(0x59)
-    @property
-    def z(self) -> Key: return Key(0x5A)
+    a = Key(0x41)
+    b = Key(0x42)
+    c = Key(0x43)
+    d = Key(0x44)
+    e = Key(0x45)
+    f = Key(0x46)
+    g = Key(0x47)
+    h = Key(0x48)
+    i = Key(0x49)
+    j = Key(0x4A)
+    k = Key(0x4B)
+    l = Key(0x4C)
+    m = Key(0x4D)
+    n = Key(0x4E)
+    o = Key(0x4F)
+    p = Key(0x50)
+    q = Key(0x51)
+    r = Key(0x52)
+    s = Key(0x53)
+    t = Key(0x54)
+    u = Key(0x55)
+    v = Key(0x56)
+    w = Key(0x57)
+    x = Key(0x58)
+    y = Key(0x59)
+    z = Key(0x5A)
 
     # win
-    @property
-    def left_win(self) -> Key: return Key(0x5B)
-    @property
-    def right_win(self) -> Key: return Key(0x5C)
-    @property
-    def menu(self) -> Key: return Key(0x5D)
+    left_win = Key(0x5B)
+    right_win = Key(0x5C)
+    menu = Key(0x5D)
     
     # Numpad
-    @property
-    def numpad_0(self) -> Key: return Key(0x60)
-    @property
-    def numpad_1(self) -> Key: return Key(0x61)
-    @property
-    def numpad_2(self) -> Key: return Key(0x62)
-    @property
-    def numpad_3(self) -> Key: return Key(0x63)
-    @property
-    def numpad_4(self) -> Key: return Key(0x64)
-    @property
-    def numpad_5(self) -> Key: return Key(0x65)
-    @property
-    def numpad_6(self) -> Key: return Key(0x66)
-    @property
-    def numpad_7(self) -> Key: return Key(0x67)
-    @property
-    def numpad_8(self) -> Key: return Key(0x68)
-    @property
-    def numpad_9(self) -> Key: return Key(0x69)
-    @property
-    def numpad_multiply(self) -> Key: return Key(0x6A)
-    @property
-    def numpad_add(self) -> Key: return Key(0x6B)
-    @property
-    def numpad_separator(self) -> Key: return Key(0x6C)
-    @property
-    def numpad_subtract(self) -> Key: return Key(0x6D)
-    @property
-    def numpad_decimal(self) -> Key: return Key(0x6E)
-    @property
-    def numpad_divide(self) -> Key: return Key(0x6F)
+    numpad_0 = Key(0x60)
+    numpad_1 = Key(0x61)
+    numpad_2 = Key(0x62)
+    numpad_3 = Key(0x63)
+    numpad_4 = Key(0x64)
+    numpad_5 = Key(0x65)
+    numpad_6 = Key(0x66)
+    numpad_7 = Key(0x67)
+    numpad_8 = Key(0x68)
+    numpad_9 = Key(0x69)
+    numpad_multiply = Key(0x6A)
+    numpad_add = Key(0x6B)
+    numpad_separator = Key(0x6C)
+    numpad_subtract = Key(0x6D)
+    numpad_decimal = Key(0x6E)
+    numpad_divide = Key(0x6F)
     
     # F1–F24
-    @property
-    def f1(self) -> Key: return Key(0x70)
-    @property
-    def f2(self) -> Key: return Key(0x71)
-    @property
-    def f3(self) -> Key: return Key(0x72)
-    @property
-    def f4(self) -> Key: return Key(0x73)
-    @property
-    def f5(self) -> Key: return Key(0x74)
-    @property
-    def f6(self) -> Key: return Key(0x75)
-    @property
-    def f7(self) -> Key: return Key(0x76)
-    @property
-    def f8(self) -> Key: return Key(0x77)
-    @property
-    def f9(self) -> Key: return Key(0x78)
-    @property
-    def f10(self) -> Key: return Key(0x79)
-    @property
-    def f11(self) -> Key: return Key(0x7A)
-    @property
-    def f12(self) -> Key: return Key(0x7B)
-    @property
-    def f13(self) -> Key: return Key(0x7C)
-    @property
-    def f14(self) -> Key: return Key(0x7D)
-    @property
-    def f15(self) -> Key: return Key(0x7E)
-    @property
-    def f16(self) -> Key: return Key(0x7F)
-    @property
-    def f17(self) -> Key: return Key(0x80)
-    @property
-    def f18(self) -> Key: return Key(0x81)
-    @property
-    def f19(self) -> Key: return Key(0x82)
-    @property
-    def f20(self) -> Key: return Key(0x83)
-    @property
-    def f21(self) -> Key: return Key(0x84)
-    @property
-    def f22(self) -> Key: return Key(0x85)
-    @property
-    def f23(self) -> Key: return Key(0x86)
-    @property
-    def f24(self) -> Key: return Key(0x87)
+    f1 = Key(0x70)
+    f2 = Key(0x71)
+    f3 = Key(0x72)
+    f4 = Key(0x73)
+    f5 = Key(0x74)
+    f6 = Key(0x75)
+    f7 = Key(0x76)
+    f8 = Key(0x77)
+    f9 = Key(0x78)
+    f10 = Key(0x79)
+    f11 = Key(0x7A)
+    f12 = Key(0x7B)
+    f13 = Key(0x7C)
+    f14 = Key(0x7D)
+    f15 = Key(0x7E)
+    f16 = Key(0x7F)
+    f17 = Key(0x80)
+    f18 = Key(0x81)
+    f19 = Key(0x82)
+    f20 = Key(0x83)
+    f21 = Key(0x84)
+    f22 = Key(0x85)
+    f23 = Key(0x86)
+    f24 = Key(0x87)
     
     # Специальные
-    @property
-    def num_lock(self) -> Key: return Key(0x90)
-    @property
-    def scroll_lock(self) -> Key: return Key(0x91)
-    @property
-    def left_shift(self) -> Key: return Key(0xA0)
-    @property
-    def right_shift(self) -> Key: return Key(0xA1)
-    @property
-    def left_ctrl(self) -> Key: return Key(0xA2)
-    @property
-    def right_ctrl(self) -> Key: return Key(0xA3)
-    @property
-    def left_alt(self) -> Key: return Key(0xA4)
-    @property
-    def right_alt(self) -> Key: return Key(0xA5)
-    @property
-    def browser_back(self) -> Key: return Key(0xA6)
-    @property
-    def browser_forward(self) -> Key: return Key(0xA7)
-    @property
-    def browser_refresh(self) -> Key: return Key(0xA8)
-    @property
-    def browser_stop(self) -> Key: return Key(0xA9)
-    @property
-    def browser_search(self) -> Key: return Key(0xAA)
-    @property
-    def browser_favorites(self) -> Key: return Key(0xAB)
-    @property
-    def browser_home(self) -> Key: return Key(0xAC)
-    @property
-    def volume_mute(self) -> Key: return Key(0xAD)
-    @property
-    def volume_down(self) -> Key: return Key(0xAE)
-    @property
-    def volume_up(self) -> Key: return Key(0xAF)
-    @property
-    def next_track(self) -> Key: return Key(0xB0)
-    @property
-    def previous_track(self) -> Key: return Key(0xB1)
-    @property
-    def stop(self) -> Key: return Key(0xB2)
-    @property
-    def play_pause(self) -> Key: return Key(0xB3)
-    @property
-    def launch_mail(self) -> Key: return Key(0xB4)
-    @property
-    def launch_media_select(self) -> Key: return Key(0xB5)
-    @property
-    def launch_app_1(self) -> Key: return Key(0xB6)
-    @property
-    def launch_app_2(self) -> Key: return Key(0xB7)
+    num_lock = Key(0x90)
+    scroll_lock = Key(0x91)
+    left_shift = Key(0xA0)
+    right_shift = Key(0xA1)
+    left_ctrl = Key(0xA2)
+    right_ctrl = Key(0xA3)
+    left_alt = Key(0xA4)
+    right_alt = Key(0xA5)
+    browser_back = Key(0xA6)
+    browser_forward = Key(0xA7)
+    browser_refresh = Key(0xA8)
+    browser_stop = Key(0xA9)
+    browser_search = Key(0xAA)
+    browser_favorites = Key(0xAB)
+    browser_home = Key(0xAC)
+    volume_mute = Key(0xAD)
+    volume_down = Key(0xAE)
+    volume_up = Key(0xAF)
+    next_track = Key(0xB0)
+    previous_track = Key(0xB1)
+    stop = Key(0xB2)
+    play_pause = Key(0xB3)
+    launch_mail = Key(0xB4)
+    launch_media_select = Key(0xB5)
+    launch_app_1 = Key(0xB6)
+    launch_app_2 = Key(0xB7)
 
     # OEM-клавиши
-    @property
-    def semicolon(self) -> Key: return Key(0xBA)
-    @property
-    def equal(self) -> Key: return Key(0xBB)
-    @property
-    def comma(self) -> Key: return Key(0xBC)
-    @property
-    def minus(self) -> Key: return Key(0xBD)
-    @property
-    def period(self) -> Key: return Key(0xBE)
-    @property
-    def slash(self) -> Key: return Key(0xBF)
-    @property
-    def backquote(self) -> Key: return Key(0xC0)
-    @property
-    def left_bracket(self) -> Key: return Key(0xDB)
-    @property
-    def backslash(self) -> Key: return Key(0xDC)
-    @property
-    def right_bracket(self) -> Key: return Key(0xDD)
-    @property
-    def quote(self) -> Key: return Key(0xDE)
+    semicolon = Key(0xBA)
+    equal = Key(0xBB)
+    comma = Key(0xBC)
+    minus = Key(0xBD)
+    period = Key(0xBE)
+    slash = Key(0xBF)
+    backquote = Key(0xC0)
+    left_bracket = Key(0xDB)
+    backslash = Key(0xDC)
+    right_bracket = Key(0xDD)
+    quote = Key(0xDE)
 
     # Системные/редкие
-    @property
-    def attn(self) -> Key: return Key(0xF6)
-    @property
-    def crsel(self) -> Key: return Key(0xF7)
-    @property
-    def exsel(self) -> Key: return Key(0xF8)
-    @property
-    def ereof(self) -> Key: return Key(0xF9)
-    @property
-    def play(self) -> Key: return Key(0xFA)
-    @property
-    def zoom(self) -> Key: return Key(0xFB)
-    @property
-    def no_name(self) -> Key: return Key(0xFC)
-    @property
-    def pa1(self) -> Key: return Key(0xFD)
-    @property
-    def oem_clear(self) -> Key: return Key(0xFE)
+    attn = Key(0xF6)
+    crsel = Key(0xF7)
+    exsel = Key(0xF8)
+    ereof = Key(0xF9)
+    play = Key(0xFA)
+    zoom = Key(0xFB)
+    no_name = Key(0xFC)
+    pa1 = Key(0xFD)
+    oem_clear = Key(0xFE)
+
+keys: Keys = Keys()
+
+# Клавиши, печатающие символ (буквы, цифры, пробел, знаки препинания, цифровая клавиатура)
+PRINTABLE_KEYS: frozenset[Key] = frozenset(
+    [Key(vk) for vk in range(0x30, 0x3A)] +
+    [Key(vk) for vk in range(0x41, 0x5B)] +
+    [
+        keys.space,
+        keys.semicolon,         # ;
+        keys.equal,             # =
+        keys.comma,             # ,
+        keys.minus,             # -
+        keys.period,            # .
+        keys.slash,             # /
+        keys.backquote,         # `
+        keys.left_bracket,      # [
+        keys.backslash,         # \
+        keys.right_bracket,     # ]
+        keys.quote,             # '
+        # Цифровая клавиатура (печатает, если Num Lock включён)
+        keys.numpad_0,
+        keys.numpad_1,
+        keys.numpad_2,
+        keys.numpad_3,
+        keys.numpad_4,
+        keys.numpad_5,
+        keys.numpad_6,
+        keys.numpad_7,
+        keys.numpad_8,
+        keys.numpad_9,
+        keys.numpad_decimal,    # точка
+        keys.numpad_add,        # +
+        keys.numpad_subtract,   # -
+        keys.numpad_multiply,   # *
+        keys.numpad_divide,     # /
+    ]
+)
 
-keys: Keys = Keys()
\ No newline at end of file
+# Клавиши, после которых набранный текст перестаёт быть одной последовательностью (перевод строки, навигация)
+WORD_BOUNDARY_KEYS: frozenset[Key] = frozenset([
+    keys.enter, keys.esc, keys.tab, keys.left, keys.right, keys.up, keys.down,
+    keys.delete, keys.home, keys.end, keys.page_up, keys.page_down,
+])
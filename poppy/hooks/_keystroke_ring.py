@@ -0,0 +1,130 @@
+from array import array
+from ._key import KeyStroke
+
+VK_SPACE = 0x20
+
+STROKE_SHIFT = 0x01
+# Слово начинается с этой записи, даже если перед ней нет пробела (например, продолжение набора после переключения)
+STROKE_WORD_START = 0x02
+
+class KeystrokeRing:
+    """
+    Набранный текст как кольцевой буфер нажатий фиксированного размера: vk, флаги и номер события хранятся в массивах,
+    KeyStroke создаются только при чтении. При переполнении теряются самые старые нажатия.
+    Слова разделяются пробелами и отметками mark_word_start; пробелы после слова относятся к нему.
+    """
+    def __init__(self, capacity: int = 256):
+        size = 1
+        while size < capacity:
+            size <<= 1
+
+        self._mask = size - 1
+        self._vks = array('B', bytes(size))
+        self._flags = array('B', bytes(size))
+        self._seqs = array('q', bytes(8 * size))
+        self._head = 0
+        self._tail = 0
+        self._word_start_pending = False
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    @property
+    def last_seq(self) -> int:
+        """Номер события последнего нажатия; 0 — буфер пуст."""
+        if self._head == self._tail:
+            return 0
+        return self._seqs[(self._head - 1) & self._mask]
+
+    def append(self, vk: int, shift: bool = False, seq: int = 0):
+        head = self._head
+        if head - self._tail > self._mask:
+            self._tail += 1
+
+        flags = STROKE_SHIFT if shift else 0
+        if self._word_start_pending:
+            flags |= STROKE_WORD_START
+            self._word_start_pending = False
+
+        i = head & self._mask
+        self._vks[i] = vk & 0xFF
+        self._flags[i] = flags
+        self._seqs[i] = seq
+        self._head = head + 1
+
+    def pop(self) -> bool:
+        if self._head == self._tail:
+            return False
+        self._head -= 1
+        return True
+
+    def clear(self):
+        self._tail = self._head
+        self._word_start_pending = False
+
+    def mark_word_start(self):
+        self._word_start_pending = True
+
+    def discard_before(self, seq: int):
+        """Оставляет столько последних нажатий, сколько их сделано после события seq."""
+        mask = self._mask
+        keep = 0
+        for position in range(self._tail, self._head):
+            if self._seqs[position & mask] > seq:
+                keep += 1
+        self._tail = self._head - keep
+
+    def word_count(self) -> int:
+        count = 0
+        in_word = False
+        mask = self._mask
+        for position in range(self._tail, self._head):
+            i = position & mask
+            if self._vks[i] == VK_SPACE:
+                in_word = False
+            elif not in_word or self._flags[i] & STROKE_WORD_START:
+                count += 1
+                in_word = True
+        return count
+
+    def last_words_start(self, words: int) -> int:
+        """Число нажатий от начала последних words слов до конца буфера (весь буфер, если слов меньше)."""
+        mask = self._mask
+        position = self._head
+        found = 0
+        in_word = False
+        while position > self._tail:
+            i = (position - 1) & mask
+            is_space = self._vks[i] == VK_SPACE
+            if in_word and is_space:
+                found += 1
+                if found == words:
+                    break
+                in_word = False
+            if not is_space:
+                in_word = True
+            position -= 1
+            if in_word and self._flags[i] & STROKE_WORD_START:
+                found += 1
+                if found == words:
+                    break
+                in_word = False
+        return self._head - position
+
+    def last(self, count: int) -> list[KeyStroke]:
+        count = min(count, len(self))
+        mask = self._mask
+        return [
+            KeyStroke(vk=self._vks[position & mask], shift=bool(self._flags[position & mask] & STROKE_SHIFT))
+            for position in range(self._head - count, self._head)
+        ]
+
+    def last_words(self, words: int) -> list[KeyStroke]:
+        return self.last(self.last_words_start(words))
+
+    def keystrokes(self) -> list[KeyStroke]:
+        return self.last(len(self))
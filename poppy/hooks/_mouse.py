@@ -10,7 +10,7 @@
 
 import ctypes
 from ctypes import wintypes
-import threading
+import time
 from typing import Callable, Sequence, Union, Optional
 from contextlib import contextmanager
 from ._mouse_button import MouseButton, MouseEvent, MouseEventType
@@ -18,21 +18,15 @@ from ._mouse_buttons import mouseButtons
 from ._key import HotkeyType
 from ._utils import get_mouse, parse_hotkey_string
 from ._callbacks import Callbacks, ValuableCallbacks
-
-# === Добавляем недостающие типы ===
-if not hasattr(wintypes, 'LRESULT'):
-    wintypes.LRESULT = ctypes.c_ssize_t
-if not hasattr(wintypes, 'HHOOK'):
-    wintypes.HHOOK = wintypes.HANDLE
-if not hasattr(wintypes, 'LPMSG'):
-    wintypes.LPMSG = ctypes.POINTER(wintypes.MSG)
-
-# === WinAPI ===
-user32 = ctypes.windll.user32
-kernel32 = ctypes.windll.kernel32
+from ._hotkey_matcher import HotkeyMatcher
+from ._recorder import EventRecorder
+from ._profiler import HookProfiler
+from ._hook_lifecycle import HookLifecycle
+from ._input_thread import input_thread
+from ._win32 import user32, POINT, WH_MOUSE_LL
+from ._move_coalescer import MoveCoalescer
 
 # === Константы ===
-WH_MOUSE_LL = 14
 WM_LBUTTONDOWN = 0x0201
 WM_LBUTTONUP = 0x0202
 WM_RBUTTONDOWN = 0x0204
@@ -90,9 +84,6 @@ class INPUT(ctypes.Structure):
     ]
 
 # === Структура для хука ===
-class POINT(ctypes.Structure):
-    _fields_ = [("x", wintypes.LONG), ("y", wintypes.LONG)]
-
 class MSLLHOOKSTRUCT(ctypes.Structure):
     _fields_ = [
         ("pt", POINT),
@@ -102,36 +93,6 @@ class MSLLHOOKSTRUCT(ctypes.Structure):
         ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
     ]
 
-# === Типы ===
-# noinspection PyUnresolvedReferences
-HOOKPROC = ctypes.WINFUNCTYPE(wintypes.LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
-
-user32.SetWindowsHookExW.argtypes = (wintypes.INT, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD)
-user32.SetWindowsHookExW.restype = wintypes.HHOOK
-
-user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
-# noinspection PyUnresolvedReferences
-user32.CallNextHookEx.restype = wintypes.LRESULT
-
-user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
-user32.UnhookWindowsHookEx.restype = wintypes.BOOL
-
-user32.GetMessageW.argtypes = (wintypes.LPMSG, wintypes.HWND, wintypes.UINT, wintypes.UINT)
-user32.GetMessageW.restype = wintypes.BOOL
-
-user32.TranslateMessage.argtypes = (wintypes.LPMSG,)
-user32.DispatchMessageW.argtypes = (wintypes.LPMSG,)
-
-user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
-user32.PostThreadMessageW.restype = wintypes.BOOL
-
-kernel32.GetLastError.argtypes = ()
-kernel32.GetLastError.restype = wintypes.DWORD
-
-user32.GetCursorPos.argtypes = (ctypes.POINTER(POINT),)
-user32.GetCursorPos.restype = wintypes.BOOL
-
-
 MouseEventCallback = Callable[[MouseEvent], Optional[bool]]
 HotkeyCallback = Callable[[], None]
 MouseButtonParameter = Union[MouseButton, str, int]
@@ -139,49 +100,79 @@ MouseHotkeyParameter = Union[Sequence[MouseButtonParameter], str]
 
 class Mouse:
     def __init__(self):
-        self._thread: threading.Thread | None = None
-        self._hook_proc: HOOKPROC | None = None
-        self._hook_handle: wintypes.HHOOK | None = None
-
-        self._pressed_buttons: set[int] = set()
+        self._lifecycle = HookLifecycle("Mouse", self.start, self.stop, lambda: self.is_running)
 
         self._any_button_callbacks = Callbacks[MouseEventCallback]()
         self._button_callbacks = ValuableCallbacks[int, MouseEventCallback]()
 
         self._move_callbacks = Callbacks[MouseEventCallback]()
+        self._move_coalescer = MoveCoalescer("Mouse move coalescer")
+        # Проверяется в hook proc до разбора MSLLHOOKSTRUCT: без подписчиков движение сразу уходит дальше по цепочке
+        self._move_wanted = False
         self._scroll_callbacks = Callbacks[MouseEventCallback]()
 
-        self._hotkeys_on_press_callbacks = ValuableCallbacks[frozenset[int], HotkeyCallback]()
-        self._hotkeys_on_press_once_callbacks = ValuableCallbacks[frozenset[int], HotkeyCallback]()
-        self._hotkeys_on_release_callbacks = ValuableCallbacks[frozenset[int], HotkeyCallback]()
-        self._active_once_hotkeys: set[frozenset[int]] = set()
+        # Хранит и состояние нажатых кнопок (битовая маска), и скомпилированные хоткеи
+        self._hotkeys = HotkeyMatcher("Mouse")
+        self._recorder: EventRecorder | None = None
+        # _profiler задан только пока профилирование включено — его проверяет hook proc
+        self._profiler: HookProfiler | None = None
+        self._hook_profiler: HookProfiler | None = None
 
     @property
     def is_running(self) -> bool:
-        return self._thread is not None and self._thread.is_alive()
+        return input_thread.is_installed(WH_MOUSE_LL)
+
+    @property
+    def lifecycle(self) -> HookLifecycle:
+        return self._lifecycle
+
+    def acquire_hook(self, owner: str):
+        """Хук установлен, пока его держит хотя бы один владелец; start()/stop() вызываются автоматически."""
+        self._lifecycle.acquire(owner)
+
+    def release_hook(self, owner: str):
+        self._lifecycle.release(owner)
+
+    def set_hook_required(self, owner: str, required: bool):
+        self._lifecycle.set_required(owner, required)
+
+    @property
+    def is_profiling(self) -> bool:
+        return self._profiler is not None
+
+    @property
+    def profiler(self) -> HookProfiler:
+        if self._hook_profiler is None:
+            self._hook_profiler = HookProfiler("Mouse")
+        return self._hook_profiler
 
     def start(self):
         if self.is_running:
             print("[!] Mouse hook is already running")
             return
         
-        self._thread = threading.Thread(target=self._message_loop, daemon=True)
-        self._thread.start()
+        if not input_thread.add_hook(WH_MOUSE_LL, self._create_hook_proc()):
+            print("Failed to install mouse hook")
 
     def stop(self):
-        if self.is_running:
-            user32.PostThreadMessageW(wintypes.DWORD(self._thread.native_id), 0x0012, 0, 0)     # WM_QUIT
-            self._thread.join(timeout=1)
-
-            if self._thread.is_alive():
-                print("[!] Mouse thread did not terminate cleanly, forcing unhook")
-                if self._hook_handle:
-                    user32.UnhookWindowsHookEx(self._hook_handle)
-                    self._hook_handle = None
-                    self._hook_proc = None
-
-        self._thread = None
-        self._pressed_buttons.clear()
+        input_thread.remove_hook(WH_MOUSE_LL)
+        self._hotkeys.reset()
+    
+    def set_recorder(self, recorder: EventRecorder | None):
+        self._recorder = recorder
+
+    def set_profiling(self, enabled: bool):
+        if enabled == self.is_profiling:
+            return
+
+        profiler = self.profiler if enabled else None
+        self._any_button_callbacks.set_wrapper(profiler.wrapper("hook") if profiler else None)
+        self._button_callbacks.set_wrapper(profiler.wrapper("button") if profiler else None)
+        self._move_callbacks.set_wrapper(profiler.wrapper("move") if profiler else None)
+        self._move_coalescer.callbacks.set_wrapper(profiler.wrapper("move (coalesced)") if profiler else None)
+        self._scroll_callbacks.set_wrapper(profiler.wrapper("scroll") if profiler else None)
+        self._hotkeys.set_wrapper(profiler.wrapper("hotkey") if profiler else None)
+        self._profiler = profiler
     
     def hook(self, callback: MouseEventCallback) -> int:
         return self._any_button_callbacks.add(callback)
@@ -211,69 +202,48 @@ class Mouse:
         self._button_callbacks.clear()
 
     def hook_hotkey(self, hotkey: MouseHotkeyParameter, callback: HotkeyCallback, hotkey_type: HotkeyType = HotkeyType.ON_PRESS_ONCE) -> Optional[int]:
-        key_list = self._get_hotkey_list(hotkey)
-        codes = (self._get_code_form_button(k) for k in key_list)
-        code_set = frozenset(code for code in codes if code is not None)
-        if not code_set:
+        groups = self._get_hotkey_groups(hotkey)
+        if not groups:
             print(f"[!] Invalid mouse hotkey: {hotkey}")
             return None
 
-        if hotkey_type == HotkeyType.ON_PRESS:
-            return self._hotkeys_on_press_callbacks.add(code_set, callback)
-        if hotkey_type == HotkeyType.ON_PRESS_ONCE:
-            return self._hotkeys_on_press_once_callbacks.add(code_set, callback)
-        if hotkey_type == HotkeyType.ON_RELEASE:
-            return self._hotkeys_on_release_callbacks.add(code_set, callback)
-
-        return None
+        return self._hotkeys.add(groups, callback, hotkey_type)
 
     def unhook_hotkey(self, callback_id: int):
-        callback = self._hotkeys_on_press_once_callbacks.remove(callback_id)
-        if callback:
-            self._active_once_hotkeys.discard(callback.value)
-            return
-
-        if self._hotkeys_on_release_callbacks.remove(callback_id):
-            return
-
-        self._hotkeys_on_press_callbacks.remove(callback_id)
+        self._hotkeys.remove(callback_id)
 
     def unhook_hotkey_global(self, hotkey: MouseHotkeyParameter, hotkey_type: HotkeyType | None = None):
-        key_list = self._get_hotkey_list(hotkey)
-        codes = (self._get_code_form_button(k) for k in key_list)
-        code_set = frozenset(code for code in codes if code is not None)
-        if not code_set:
+        groups = self._get_hotkey_groups(hotkey)
+        if not groups:
             print(f"[!] Invalid mouse hotkey: {hotkey}")
             return
 
-        if hotkey_type is None:
-            self._hotkeys_on_press_callbacks.remove_by_value(code_set)
-            self._hotkeys_on_press_once_callbacks.remove_by_value(code_set)
-            self._hotkeys_on_release_callbacks.remove_by_value(code_set)
-            self._active_once_hotkeys.discard(code_set)
-        else:
-            if hotkey_type == HotkeyType.ON_PRESS:
-                self._hotkeys_on_press_callbacks.remove_by_value(code_set)
-            elif hotkey_type == HotkeyType.ON_PRESS_ONCE:
-                self._hotkeys_on_press_once_callbacks.remove_by_value(code_set)
-                self._active_once_hotkeys.discard(code_set)
-            elif hotkey_type == HotkeyType.ON_RELEASE:
-                self._hotkeys_on_release_callbacks.remove_by_value(code_set)
+        self._hotkeys.remove_by_value(groups, hotkey_type)
 
     def unhook_all_hotkeys(self):
-        self._hotkeys_on_press_callbacks.clear()
-        self._hotkeys_on_press_once_callbacks.clear()
-        self._hotkeys_on_release_callbacks.clear()
-        self._active_once_hotkeys.clear()
-
-    def hook_move(self, callback: MouseEventCallback) -> int:
-        return self._move_callbacks.add(callback)
+        self._hotkeys.clear()
+
+    def hook_move(self, callback: MouseEventCallback, coalesce: bool = False) -> int:
+        """
+        coalesce=True — не чаще одного вызова за кадр монитора с последней позицией курсора, из отдельного потока.
+        Возвращаемое значение такого callback'а не подавляет движение.
+        """
+        if coalesce:
+            callback_id = self._move_coalescer.add(callback)
+        else:
+            callback_id = self._move_callbacks.add(callback)
+        self._update_move_wanted()
+        return callback_id
 
     def unhook_move(self, callback_id: int):
-        self._move_callbacks.remove(callback_id)
+        if not self._move_callbacks.remove(callback_id):
+            self._move_coalescer.remove(callback_id)
+        self._update_move_wanted()
 
     def unhook_move_global(self):
         self._move_callbacks.clear()
+        self._move_coalescer.clear()
+        self._update_move_wanted()
 
     def hook_scroll(self, callback: MouseEventCallback) -> int:
         return self._scroll_callbacks.add(callback)
@@ -344,7 +314,8 @@ class Mouse:
                 self.send_button(code, release=True)
 
     def is_button_pressed(self, button: MouseButtonParameter) -> bool:
-        return self._get_code_form_button(button) in self._pressed_buttons
+        code = self._get_code_form_button(button)
+        return code is not None and self._hotkeys.is_pressed(code)
 
     def get_position(self) -> tuple[int, int]:
         pt = POINT()
@@ -366,6 +337,10 @@ class Mouse:
             return parse_hotkey_string(hotkey)
 
         return hotkey
+
+    def _get_hotkey_groups(self, hotkey: MouseHotkeyParameter) -> list[tuple[int, ...]]:
+        codes = (self._get_code_form_button(k) for k in self._get_hotkey_list(hotkey))
+        return [(code,) for code in codes if code is not None]
     
     def _send_input(self, inp: INPUT, action: str):
         result = user32.SendInput(1, ctypes.byref(inp), INPUT_SIZE)
@@ -385,164 +360,146 @@ class Mouse:
             )
         )
 
-    def _on_press(self, x: int, y: int, button: MouseButton) -> bool:
+    def _on_press(self, x: int, y: int, button: MouseButton, time_ns: int | None = None, seq: int = 0) -> bool:
         #print(f"{button} pressed")
 
-        self._pressed_buttons.add(button.code)
+        self._hotkeys.press(button.code)
 
+        event = MouseEvent(MouseEventType.PRESS, x, y, button, time_ns=time_ns, seq=seq)
         suppress = False
 
         for callback in self._any_button_callbacks.get_all():
-            if self._process_callback(MouseEventType.PRESS, callback, x, y, button):
+            if self._process_callback(event, callback):
                 suppress = True
 
         for callback in self._button_callbacks.get_by_value(button.code):
-            if self._process_callback(MouseEventType.PRESS, callback, x, y, button):
+            if self._process_callback(event, callback):
                 suppress = True
 
-        pressed_frozen = frozenset(self._pressed_buttons)
-
-        # ON_PRESS — срабатывает каждый раз
-        for callback in self._hotkeys_on_press_callbacks.get_by_value(pressed_frozen):
-            try:
-                callback()
-            except Exception as e:
-                print(f"[Mouse hotkey ON_PRESS] Error: {e}")
-
-        # ON_PRESS_ONCE — только если ещё не сработало
-        if pressed_frozen not in self._active_once_hotkeys:
-            self._active_once_hotkeys.add(pressed_frozen)
-            for callback in self._hotkeys_on_press_once_callbacks.get_by_value(pressed_frozen):
-                try:
-                    callback()
-                except Exception as e:
-                    print(f"[Mouse hotkey ON_PRESS_ONCE] Error: {e}")
+        self._hotkeys.trigger_press()
 
         return suppress
 
-    def _on_release(self, x: int, y: int, button: MouseButton) -> bool:
+    def _on_release(self, x: int, y: int, button: MouseButton, time_ns: int | None = None, seq: int = 0) -> bool:
         #print(f"{button} released")
 
-        pressed_frozen = frozenset(self._pressed_buttons)
-
-        released_code = button.code
-        self._pressed_buttons.discard(button.code)
+        pressed = self._hotkeys.release(button.code)
 
+        event = MouseEvent(MouseEventType.RELEASE, x, y, button, time_ns=time_ns, seq=seq)
         suppress = False
 
         for callback in self._any_button_callbacks.get_all():
-            if self._process_callback(MouseEventType.RELEASE, callback, x, y, button):
+            if self._process_callback(event, callback):
                 suppress = True
 
         for callback in self._button_callbacks.get_by_value(button.code):
-            if self._process_callback(MouseEventType.RELEASE, callback, x, y, button):
+            if self._process_callback(event, callback):
                 suppress = True
 
-        # ON_RELEASE: срабатывает при отпускании
-        for callback in self._hotkeys_on_release_callbacks.get_by_value(pressed_frozen):
-            try:
-                callback()
-            except Exception as e:
-                print(f"[Mouse hotkey ON_RELEASE] Error: {e}")
-
-        to_remove = set()
-        for hk in self._active_once_hotkeys:
-            if released_code in hk:
-                to_remove.add(hk)
-        self._active_once_hotkeys -= to_remove
+        self._hotkeys.trigger_release(pressed, button.code)
 
         return suppress
 
-    def _on_move(self, x: int, y: int) -> bool:
+    def _update_move_wanted(self):
+        self._move_wanted = bool(self._move_callbacks.get_all()) or self._move_coalescer.is_active
+
+    def _on_move(self, x: int, y: int, time_ns: int | None = None, seq: int = 0) -> bool:
         #print(f"move x: {x} y: {y}")
 
+        if self._move_coalescer.is_active:
+            self._move_coalescer.post(x, y, time.perf_counter_ns() if time_ns is None else time_ns, seq)
+
+        callbacks = self._move_callbacks.get_all()
+        if not callbacks:
+            return False
+
+        event = MouseEvent(MouseEventType.MOVE, x, y, time_ns=time_ns, seq=seq)
         suppress = False
 
-        for callback in self._move_callbacks.get_all():
-            if self._process_callback(MouseEventType.MOVE, callback, x, y):
+        for callback in callbacks:
+            if self._process_callback(event, callback):
                 suppress = True
 
         return suppress
 
-    def _on_scroll(self, x: int, y: int, delta: int) -> bool:
+    def _on_scroll(self, x: int, y: int, delta: int, time_ns: int | None = None, seq: int = 0) -> bool:
         #print(f"scroll delta: {delta}")
 
+        event = MouseEvent(MouseEventType.SCROLL, x, y, delta=delta, time_ns=time_ns, seq=seq)
         suppress = False
 
         for callback in self._scroll_callbacks.get_all():
-            if self._process_callback(MouseEventType.SCROLL, callback, x, y, delta=delta):
+            if self._process_callback(event, callback):
                 suppress = True
 
         return suppress
 
-    def _process_callback(self, event_type: MouseEventType, callback: MouseEventCallback, x: int, y: int, button: Optional[MouseButton] = None, delta: int = 0) -> bool:
-        event = MouseEvent(event_type, x, y, button, delta)
+    def _process_callback(self, event: MouseEvent, callback: MouseEventCallback) -> bool:
         try:
             return callback(event) is False
         except Exception as e:
             print(f"Callback error for mouse event={event}: {e}")
             return False
     
-    def _message_loop(self):
+    def _handle_message(self, message: int, x: int, y: int, mouse_data: int = 0, time_ns: int | None = None, seq: int | None = None) -> bool:
+        # Синхронная обработка одного сообщения хука; её же использует воспроизведение записанных логов
+        if seq is None:
+            seq = input_thread.next_sequence()
+        if message == WM_MOUSEMOVE:
+            return self._on_move(x, y, time_ns=time_ns, seq=seq)
+        elif message == WM_MOUSEWHEEL:
+            delta = ctypes.c_short(mouse_data >> 16).value // 120
+            return self._on_scroll(x, y, delta, time_ns=time_ns, seq=seq)
+        elif message == WM_LBUTTONDOWN:
+            return self._on_press(x, y, mouseButtons.left, time_ns=time_ns, seq=seq)
+        elif message == WM_LBUTTONUP:
+            return self._on_release(x, y, mouseButtons.left, time_ns=time_ns, seq=seq)
+        elif message == WM_RBUTTONDOWN:
+            return self._on_press(x, y, mouseButtons.right, time_ns=time_ns, seq=seq)
+        elif message == WM_RBUTTONUP:
+            return self._on_release(x, y, mouseButtons.right, time_ns=time_ns, seq=seq)
+        elif message == WM_MBUTTONDOWN:
+            return self._on_press(x, y, mouseButtons.middle, time_ns=time_ns, seq=seq)
+        elif message == WM_MBUTTONUP:
+            return self._on_release(x, y, mouseButtons.middle, time_ns=time_ns, seq=seq)
+        elif message == WM_XBUTTONDOWN:
+            return self._on_press(x, y, mouseButtons.x1 if mouse_data == 0x10000 else mouseButtons.x2, time_ns=time_ns, seq=seq)
+        elif message == WM_XBUTTONUP:
+            return self._on_release(x, y, mouseButtons.x1 if mouse_data == 0x10000 else mouseButtons.x2, time_ns=time_ns, seq=seq)
+        return False
+
+    def _create_hook_proc(self) -> Callable[[int, int, int], int]:
+        next_sequence = input_thread.next_sequence
+
         def low_level_mouse_proc(nCode, wParam, lParam):
+            # Быстрый путь: движение без подписчиков и без записи не разбираем вовсе
+            if wParam == WM_MOUSEMOVE and not self._move_wanted and self._recorder is None:
+                return user32.CallNextHookEx(0, nCode, wParam, lParam)
+
+            profiler = self._profiler
+            if profiler is not None:
+                start = time.perf_counter_ns()
+
+            suppress = False
             try:
-                suppress = False
                 if nCode >= 0:
                     # lParam указывает на MSLLHOOKSTRUCT
                     ms = ctypes.cast(lParam, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
                     x, y = ms.pt.x, ms.pt.y
 
-                    if wParam == WM_MOUSEMOVE:
-                        suppress = self._on_move(x, y)
-                    elif wParam == WM_MOUSEWHEEL:
-                        delta = ctypes.c_short(ms.mouseData >> 16).value // 120
-                        suppress = self._on_scroll(x, y, delta) 
-                    elif wParam == WM_LBUTTONDOWN:
-                        suppress = self._on_press(x, y, mouseButtons.left)
-                    elif wParam == WM_LBUTTONUP:
-                        suppress = self._on_release(x, y, mouseButtons.left)
-                    elif wParam == WM_RBUTTONDOWN:
-                        suppress = self._on_press(x, y, mouseButtons.right)
-                    elif wParam == WM_RBUTTONUP:
-                        suppress = self._on_release(x, y, mouseButtons.right)
-                    elif wParam == WM_MBUTTONDOWN:
-                        suppress = self._on_press(x, y, mouseButtons.middle)
-                    elif wParam == WM_MBUTTONUP:
-                        suppress = self._on_release(x, y, mouseButtons.middle)
-                    elif wParam == WM_XBUTTONDOWN:
-                        suppress = self._on_press(x, y, mouseButtons.x1 if ms.mouseData == 0x10000 else mouseButtons.x2)
-                    elif wParam == WM_XBUTTONUP:
-                        suppress = self._on_release(x, y, mouseButtons.x1 if ms.mouseData == 0x10000 else mouseButtons.x2)
-
-                return 1 if suppress else user32.CallNextHookEx(0, nCode, wParam, lParam)
+                    recorder = self._recorder
+                    if recorder is not None:
+                        recorder.record_mouse(wParam, x, y, ms.mouseData, ms.flags)
+
+                    suppress = self._handle_message(wParam, x, y, ms.mouseData, None, next_sequence())
             except Exception as e:
                 print(f"Mouse hook error: {e}")
-                return user32.CallNextHookEx(0, nCode, wParam, lParam)
+                suppress = False
 
-        self._hook_proc = HOOKPROC(low_level_mouse_proc)
-        self._hook_handle = user32.SetWindowsHookExW(WH_MOUSE_LL, self._hook_proc, 0, 0)
-        if not self._hook_handle:
-            print("Failed to install mouse hook")
-            return
+            if profiler is not None:
+                profiler.record_hook(time.perf_counter_ns() - start)
+            return 1 if suppress else user32.CallNextHookEx(0, nCode, wParam, lParam)
 
-        print("[+] Mouse hook installed")
-
-        msg = wintypes.MSG()
-        while True:
-            ret = user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
-            if ret == 0:        # WM_QUIT
-                break
-            elif ret == -1:
-                error_code = kernel32.GetLastError()
-                print(f"[!] GetMessageW failed with error {error_code}")
-                break
-            else:
-                user32.TranslateMessage(ctypes.byref(msg))
-                user32.DispatchMessageW(ctypes.byref(msg))
-
-        user32.UnhookWindowsHookEx(self._hook_handle)
-        self._hook_handle = None
-        self._hook_proc = None
-        print("[-] Mouse hook removed")
+        return low_level_mouse_proc
 
 mouse: Mouse = Mouse()
\ No newline at end of file
@@ -1,11 +1,24 @@
+import time
 from enum import Enum, auto
 from typing import Optional
 from ._utils import MOUSE_NAMES
 
 class MouseButton:
-    def __init__(self, code: int):
-        self._code = code
-        self._name = MOUSE_NAMES.get(code)
+    __slots__ = ("_code", "_name")
+
+    _table: list["MouseButton"] = []
+
+    def __new__(cls, code: int):
+        if 0 <= code < len(cls._table):
+            return cls._table[code]
+        return cls._create(code)
+
+    @classmethod
+    def _create(cls, code: int) -> "MouseButton":
+        button = object.__new__(cls)
+        object.__setattr__(button, "_code", code)
+        object.__setattr__(button, "_name", MOUSE_NAMES.get(code))
+        return button
 
     @property
     def code(self) -> int: return self._code
@@ -13,14 +26,27 @@ class MouseButton:
     @property
     def name(self) -> str: return self._name
 
+    def __setattr__(self, name, value):
+        raise AttributeError("MouseButton is immutable")
+
+    def __reduce__(self):
+        return MouseButton, (self._code,)
+
     def __repr__(self):
         return f"{self.name} (vk={self._code})"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, MouseButton):
             return self._code == other._code
         return False
 
+    def __hash__(self):
+        return self._code
+
+MouseButton._table = [MouseButton._create(code) for code in range(len(MOUSE_NAMES))]
+
 class MouseEventType(Enum):
     PRESS = auto()
     RELEASE = auto()
@@ -28,12 +54,16 @@ class MouseEventType(Enum):
     SCROLL = auto()
 
 class MouseEvent:
-    def __init__(self, event_type: MouseEventType, x: int, y: int, button: Optional[MouseButton] = None, delta: int = 0):
+    __slots__ = ("_type", "_x", "_y", "_button", "_delta", "_time_ns", "_seq")
+
+    def __init__(self, event_type: MouseEventType, x: int, y: int, button: Optional[MouseButton] = None, delta: int = 0, time_ns: int | None = None, seq: int = 0):
         self._type = event_type
         self._x = x
         self._y = y
         self._button = button
         self._delta = delta  # для колеса
+        self._time_ns = time.perf_counter_ns() if time_ns is None else time_ns
+        self._seq = seq
 
     @property
     def event_type(self) -> MouseEventType:
@@ -55,6 +85,14 @@ class MouseEvent:
     def delta(self) -> int:
         return self._delta
 
+    @property
+    def time_ns(self) -> int:
+        return self._time_ns
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
     def __repr__(self):
         if self._type == MouseEventType.SCROLL:
             return f"MouseEvent(SCROLL, delta={self._delta}, x={self._x}, y={self._y})"
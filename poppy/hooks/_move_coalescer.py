@@ -0,0 +1,115 @@
+import sys
+import threading
+import time
+from typing import Callable, Optional
+from ._callbacks import Callbacks
+from ._mouse_button import MouseEvent, MouseEventType
+from ._win32 import user32, gdi32, VREFRESH
+
+DEFAULT_REFRESH_RATE = 60
+
+MoveCallback = Callable[[MouseEvent], Optional[bool]]
+
+def get_refresh_rate() -> int:
+    if sys.platform != "win32":
+        return DEFAULT_REFRESH_RATE
+
+    hdc = user32.GetDC(0)
+    if not hdc:
+        return DEFAULT_REFRESH_RATE
+    try:
+        rate = gdi32.GetDeviceCaps(hdc, VREFRESH)
+    finally:
+        user32.ReleaseDC(0, hdc)
+    # 0 и 1 означают «частота по умолчанию для устройства»
+    return rate if rate > 1 else DEFAULT_REFRESH_RATE
+
+class MoveCoalescer:
+    """
+    Доставляет подписчикам не больше одной позиции курсора за кадр монитора. Hook proc только
+    перезаписывает последнюю позицию, промежуточные движения отбрасываются. Поток работает,
+    пока есть хотя бы один подписчик.
+    """
+    def __init__(self, name: str):
+        self._name = name
+        self._callbacks = Callbacks[MoveCallback]()
+        self._interval = 1 / get_refresh_rate()
+        self._latest: tuple[int, int, int, int] | None = None
+        self._wakeup = threading.Event()
+        self._waiting = False
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def callbacks(self) -> Callbacks[MoveCallback]:
+        return self._callbacks
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self._callbacks.get_all())
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def add(self, callback: MoveCallback) -> int:
+        callback_id = self._callbacks.add(callback)
+        self._start()
+        return callback_id
+
+    def remove(self, callback_id: int) -> bool:
+        removed = self._callbacks.remove(callback_id)
+        if removed and not self.is_active:
+            self._stop()
+        return removed
+
+    def clear(self):
+        self._callbacks.clear()
+        self._stop()
+
+    def post(self, x: int, y: int, time_ns: int, seq: int = 0):
+        self._latest = (x, y, time_ns, seq)
+        if self._waiting:
+            self._wakeup.set()
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+        self._thread.start()
+
+    def _stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _loop(self):
+        # _latest никогда не сбрасывается: поток сравнивает его с последней доставленной позицией,
+        # поэтому post() между чтением и доставкой не теряется
+        delivered = self._latest
+        while self._running:
+            latest = self._latest
+            if latest is delivered:
+                # Сначала объявляем ожидание, потом перепроверяем — иначе можно пропустить post()
+                self._wakeup.clear()
+                self._waiting = True
+                if self._latest is delivered and self._running:
+                    self._wakeup.wait(0.5)
+                self._waiting = False
+                continue
+
+            delivered = latest
+            x, y, time_ns, seq = latest
+            event = MouseEvent(MouseEventType.MOVE, x, y, time_ns=time_ns, seq=seq)
+            for callback in self._callbacks.get_all():
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"[{self._name}] Callback error for mouse event={event}: {e}")
+
+            # Следующая позиция — не раньше следующего кадра
+            time.sleep(self._interval)
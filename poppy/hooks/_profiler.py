@@ -0,0 +1,173 @@
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, NamedTuple
+from ._callbacks import Callbacks, CallbackWrapper
+
+# Если LowLevelHooksTimeout не задан в реестре
+DEFAULT_HOOK_TIMEOUT_MS = 300
+# Начиная с Windows 7 система не ждёт хук дольше 1000 мс, даже если в реестре указано больше
+MAX_HOOK_TIMEOUT_MS = 1000
+
+HOOK_PROC_ID = 0
+DISPATCH_ID = -1
+
+WarningCallback = Callable[[str, int, int], None]
+
+def get_hook_timeout_ms() -> int:
+    if sys.platform != "win32":
+        return DEFAULT_HOOK_TIMEOUT_MS
+
+    import winreg
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Control Panel\Desktop") as key:
+            value, _ = winreg.QueryValueEx(key, "LowLevelHooksTimeout")
+        return max(1, min(int(value), MAX_HOOK_TIMEOUT_MS))
+    except (OSError, ValueError):
+        return DEFAULT_HOOK_TIMEOUT_MS
+
+class RollingHistogram:
+    """Последние window замеров (нс) в кольцевом массиве; перцентили считаются по запросу."""
+    def __init__(self, window: int = 1024):
+        self._samples = array('q', bytes(8 * window))
+        self._window = window
+        self._count = 0
+        self._max = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def max(self) -> int:
+        return self._max
+
+    def add(self, value_ns: int):
+        self._samples[self._count % self._window] = value_ns
+        self._count += 1
+        if value_ns > self._max:
+            self._max = value_ns
+
+    def clear(self):
+        self._count = 0
+        self._max = 0
+
+    def values(self) -> list[int]:
+        return sorted(self._samples[:min(self._count, self._window)])
+
+    def percentile(self, p: float) -> int:
+        values = self.values()
+        if not values:
+            return 0
+        return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+    def buckets(self) -> list[tuple[int, int]]:
+        """Гистограмма окна по степеням двойки: (верхняя граница, нс; количество)."""
+        counts: dict[int, int] = {}
+        for value in self.values():
+            bound = 1 << max(0, value - 1).bit_length()
+            counts[bound] = counts.get(bound, 0) + 1
+        return sorted(counts.items())
+
+class ProfileEntry(NamedTuple):
+    callback_id: int
+    label: str
+    count: int
+    p50_ns: int
+    p99_ns: int
+    max_ns: int
+
+class HookProfiler:
+    """
+    Замеры времени подписчиков и всего hook proc. Подписчики оборачиваются только на время профилирования,
+    поэтому в выключенном состоянии в снимках callback'ов лежат исходные функции.
+    """
+    def __init__(self, name: str, window: int = 1024, warn_ratio: float = 0.5):
+        self._name = name
+        self._window = window
+        self._lock = threading.Lock()
+        self._histograms: dict[int, tuple[str, RollingHistogram]] = {}
+        self._timeout_ns = get_hook_timeout_ms() * 1_000_000
+        self._warn_ns = int(self._timeout_ns * warn_ratio)
+        self._last_warning_ns = 0
+        self._warning_callbacks = Callbacks[WarningCallback]()
+        self._hook_histogram = self._histogram(HOOK_PROC_ID, "hook proc")
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def timeout_ns(self) -> int:
+        return self._timeout_ns
+
+    def hook_warning(self, callback: WarningCallback) -> int:
+        return self._warning_callbacks.add(callback)
+
+    def unhook_warning(self, callback_id: int):
+        self._warning_callbacks.remove(callback_id)
+
+    def wrap(self, callback_id: int, label: str, callback: Callable) -> Callable:
+        histogram = self._histogram(callback_id, label)
+        add = histogram.add
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            try:
+                return callback(*args)
+            finally:
+                add(clock() - start)
+        return timed
+
+    def wrapper(self, kind: str) -> CallbackWrapper:
+        # Для Callbacks.set_wrapper / HotkeyMatcher.set_wrapper: подпись — вид подписки и имя функции
+        def wrap(callback_id: int, callback: Callable) -> Callable:
+            name = getattr(callback, "__qualname__", None) or repr(callback)
+            return self.wrap(callback_id, f"{kind}: {name}", callback)
+        return wrap
+
+    def record_hook(self, elapsed_ns: int):
+        self._hook_histogram.add(elapsed_ns)
+        if elapsed_ns >= self._warn_ns:
+            self._warn(elapsed_ns)
+
+    def wrap_dispatch(self, handler: Callable) -> Callable:
+        return self.wrap(DISPATCH_ID, "dispatch", handler)
+
+    def entries(self) -> list[ProfileEntry]:
+        with self._lock:
+            items = list(self._histograms.items())
+        return [
+            ProfileEntry(callback_id, label, histogram.count, histogram.percentile(50), histogram.percentile(99), histogram.max)
+            for callback_id, (label, histogram) in items
+        ]
+
+    def reset(self):
+        # Обёртки держат ссылки на свои гистограммы, поэтому очищаем их на месте
+        with self._lock:
+            for _, histogram in self._histograms.values():
+                histogram.clear()
+
+    def _histogram(self, callback_id: int, label: str) -> RollingHistogram:
+        with self._lock:
+            item = self._histograms.get(callback_id)
+            if item is None:
+                item = (label, RollingHistogram(self._window))
+                self._histograms[callback_id] = item
+            return item[1]
+
+    def _warn(self, elapsed_ns: int):
+        # Не чаще раза в секунду — предупреждение вызывается прямо из hook proc
+        now = time.perf_counter_ns()
+        if now - self._last_warning_ns < 1_000_000_000:
+            return
+        self._last_warning_ns = now
+
+        print(f"[!] {self._name} hook took {elapsed_ns / 1e6:.1f} ms (timeout {self._timeout_ns / 1e6:.0f} ms)")
+        for callback in self._warning_callbacks.get_all():
+            try:
+                callback(self._name, elapsed_ns, self._timeout_ns)
+            except Exception as e:
+                print(f"[{self._name} profiler] Error: {e}")
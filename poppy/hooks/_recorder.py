@@ -0,0 +1,103 @@
+import struct
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+# Формат лога: заголовок (MAGIC + версия), затем записи фиксированного размера
+MAGIC = b"PPYR"
+VERSION = 1
+_HEADER = struct.Struct("<4sH")
+# device, message (wParam), vk, flags, x, y, mouseData, время от начала записи (нс)
+_RECORD = struct.Struct("<BHHIiiIq")
+
+DEVICE_KEYBOARD = 0
+DEVICE_MOUSE = 1
+
+class RecordedEvent(NamedTuple):
+    device: int
+    message: int
+    vk: int = 0
+    flags: int = 0
+    x: int = 0
+    y: int = 0
+    mouse_data: int = 0
+    time_ns: int = 0
+
+class EventRecorder:
+    """
+    Пишет сырые события хуков в компактный бинарный лог. Вызывается прямо из hook proc,
+    поэтому запись — только struct.pack в буфер; на диск буфер сбрасывается крупными блоками.
+    """
+    def __init__(self, flush_size: int = 64 * 1024):
+        self._flush_size = flush_size
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file: BinaryIO | None = None
+        self._start_ns = 0
+        self._count = 0
+
+    @property
+    def is_recording(self) -> bool:
+        return self._file is not None
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def start(self, path: str):
+        if self.is_recording:
+            self.stop()
+
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._buffer.clear()
+        self._count = 0
+        self._start_ns = time.perf_counter_ns()
+
+    def stop(self):
+        with self._lock:
+            file = self._file
+            self._file = None
+            if file is None:
+                return
+            file.write(self._buffer)
+            self._buffer.clear()
+        file.close()
+
+    def record_keyboard(self, message: int, vk: int, flags: int = 0, time_ns: int | None = None):
+        self._record(DEVICE_KEYBOARD, message, vk, flags, 0, 0, 0, time_ns)
+
+    def record_mouse(self, message: int, x: int, y: int, mouse_data: int = 0, flags: int = 0, time_ns: int | None = None):
+        self._record(DEVICE_MOUSE, message, 0, flags, x, y, mouse_data, time_ns)
+
+    def _record(self, device: int, message: int, vk: int, flags: int, x: int, y: int, mouse_data: int, time_ns: int | None):
+        if time_ns is None:
+            time_ns = time.perf_counter_ns()
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer += _RECORD.pack(device, message, vk, flags, x, y, mouse_data, time_ns - self._start_ns)
+            self._count += 1
+            if len(self._buffer) >= self._flush_size:
+                self._file.write(self._buffer)
+                self._buffer.clear()
+
+def write_events(path: str, events: Iterable[RecordedEvent]):
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION))
+        file.write(b"".join(_RECORD.pack(*event) for event in events))
+
+def read_events(path: str) -> Iterator[RecordedEvent]:
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Invalid event log: {path}")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported event log format: {path}")
+
+    body = memoryview(data)[_HEADER.size:]
+    usable = len(body) - len(body) % _RECORD.size
+    for fields in _RECORD.iter_unpack(body[:usable]):
+        yield RecordedEvent(*fields)
@@ -0,0 +1,247 @@
+import random
+import time
+import tracemalloc
+from typing import Callable, Iterable, Sequence
+from ._recorder import RecordedEvent, DEVICE_KEYBOARD, DEVICE_MOUSE
+from ._callbacks import Callbacks, ValuableCallbacks
+from ._hotkey_matcher import HotkeyMatcher
+from ._keyboard import Keyboard, WM_KEYDOWN, WM_KEYUP
+from ._mouse import Mouse, WM_MOUSEMOVE, WM_MOUSEWHEEL, WM_LBUTTONDOWN, WM_LBUTTONUP, WM_RBUTTONDOWN, WM_RBUTTONUP
+
+def percentile(sorted_values: Sequence[int], p: float) -> int:
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class SubscriberStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies_ns: list[int] = []
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+        self.alloc_calls = 0
+
+    @property
+    def calls(self) -> int:
+        return len(self.latencies_ns)
+
+    def summary(self) -> str:
+        values = sorted(self.latencies_ns)
+        line = (f"{self.name:<60} calls={self.calls:<7} "
+                f"p50={percentile(values, 50) / 1000:7.1f}us p99={percentile(values, 99) / 1000:7.1f}us "
+                f"max={(values[-1] if values else 0) / 1000:7.1f}us")
+        if self.alloc_calls:
+            line += (f"  peak={self.peak_bytes / self.alloc_calls:7.0f}B/call"
+                     f" retained={self.retained_bytes / self.alloc_calls:6.0f}B/call")
+        return line
+
+class ReplayReport:
+    def __init__(self, events: int, event_latencies_ns: list[int], subscribers: list[SubscriberStats]):
+        self.events = events
+        self.event_latencies_ns = event_latencies_ns
+        self.subscribers = subscribers
+
+    def format(self) -> str:
+        values = sorted(self.event_latencies_ns)
+        total = sum(values)
+        lines = [
+            f"events={self.events} total={total / 1e6:.1f}ms "
+            f"rate={self.events / (total / 1e9) if total else 0:,.0f} events/sec",
+            "per event: " + " ".join(f"p{p}={percentile(values, p) / 1000:.1f}us" for p in (50, 90, 99, 99.9))
+            + f" max={(values[-1] if values else 0) / 1000:.1f}us",
+        ]
+        lines.extend(stats.summary() for stats in self.subscribers)
+        return "\n".join(lines)
+
+class _Probe:
+    __slots__ = ("_callback", "_stats", "_track_allocations")
+
+    def __init__(self, callback: Callable, stats: SubscriberStats):
+        self._callback = callback
+        self._stats = stats
+        self._track_allocations = False
+
+    def __call__(self, *args):
+        stats = self._stats
+        if self._track_allocations:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                return self._callback(*args)
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                stats.peak_bytes += max(0, peak - before)
+                stats.retained_bytes += current - before
+                stats.alloc_calls += 1
+
+        start = time.perf_counter_ns()
+        try:
+            return self._callback(*args)
+        finally:
+            stats.latencies_ns.append(time.perf_counter_ns() - start)
+
+class ReplayHarness:
+    """
+    Воспроизводит записанный лог через те же обработчики, что вызывает hook proc, без Win32 и без пауз.
+    На время прогона каждый подписчик оборачивается замером времени (и, по желанию, выделений памяти).
+    """
+    def __init__(self, keyboard: Keyboard, mouse: Mouse):
+        self._keyboard = keyboard
+        self._mouse = mouse
+        self._restore: list[Callable[[], None]] = []
+        self._probes: list[_Probe] = []
+
+    def run(self, events: Sequence[RecordedEvent], track_allocations: bool = False) -> ReplayReport:
+        self._instrument()
+        try:
+            latencies = self._replay(events)
+            if track_allocations:
+                # Отдельный проход: tracemalloc сильно искажает время, поэтому задержки меряем без него
+                for probe in self._probes:
+                    probe._track_allocations = True
+                tracemalloc.start()
+                try:
+                    self._replay(events)
+                finally:
+                    tracemalloc.stop()
+            stats = [probe._stats for probe in self._probes]
+        finally:
+            self._uninstrument()
+
+        return ReplayReport(len(events), latencies, stats)
+
+    def _replay(self, events: Iterable[RecordedEvent]) -> list[int]:
+        keyboard_handle = self._keyboard._handle_message
+        mouse_handle = self._mouse._handle_message
+        self._keyboard._hotkeys.reset()
+        self._mouse._hotkeys.reset()
+
+        latencies = []
+        append = latencies.append
+        clock = time.perf_counter_ns
+        for event in events:
+            start = clock()
+            if event.device == DEVICE_KEYBOARD:
+                keyboard_handle(event.message, event.vk, event.time_ns)
+            elif event.device == DEVICE_MOUSE:
+                mouse_handle(event.message, event.x, event.y, event.mouse_data, event.time_ns)
+            append(clock() - start)
+        return latencies
+
+    def _instrument(self):
+        keyboard, mouse = self._keyboard, self._mouse
+        self._probes.clear()
+        self._wrap_callbacks(keyboard._any_key_callbacks, "keyboard hook")
+        self._wrap_valuable(keyboard._key_callbacks, "keyboard key")
+        self._wrap_hotkeys(keyboard._hotkeys, "keyboard hotkey")
+        self._wrap_callbacks(mouse._any_button_callbacks, "mouse hook")
+        self._wrap_valuable(mouse._button_callbacks, "mouse button")
+        self._wrap_callbacks(mouse._move_callbacks, "mouse move")
+        self._wrap_callbacks(mouse._scroll_callbacks, "mouse scroll")
+        self._wrap_hotkeys(mouse._hotkeys, "mouse hotkey")
+
+    def _uninstrument(self):
+        for restore in reversed(self._restore):
+            restore()
+        self._restore.clear()
+
+    def _probe(self, callback: Callable, kind: str) -> _Probe:
+        name = getattr(callback, "__qualname__", None) or repr(callback)
+        probe = _Probe(callback, SubscriberStats(f"{kind}: {name}"))
+        self._probes.append(probe)
+        return probe
+
+    def _wrap_callbacks(self, callbacks: Callbacks, kind: str):
+        original = callbacks.items()
+        for callback_id, callback in original:
+            callbacks.replace(callback_id, self._probe(callback, kind))
+        self._restore.append(lambda: self._restore_callbacks(callbacks, original))
+
+    def _wrap_valuable(self, callbacks: ValuableCallbacks, kind: str):
+        original = [(callback_id, item.callback) for callback_id, item in callbacks.items()]
+        for callback_id, item in callbacks.items():
+            callbacks.replace(callback_id, self._probe(item.callback, f"{kind} {item.value}"))
+        self._restore.append(lambda: self._restore_callbacks(callbacks, original))
+
+    @staticmethod
+    def _restore_callbacks(callbacks: Callbacks | ValuableCallbacks | HotkeyMatcher, original: list[tuple[int, Callable]]):
+        # replace() пропускает подписчиков, отписавшихся во время прогона
+        for callback_id, callback in original:
+            callbacks.replace(callback_id, callback)
+
+    def _wrap_hotkeys(self, matcher: HotkeyMatcher, kind: str):
+        original = matcher.items()
+        for callback_id, callback, hotkey_type in original:
+            matcher.replace(callback_id, self._probe(callback, f"{kind} {hotkey_type.name}"))
+        self._restore.append(lambda: self._restore_callbacks(matcher, [(i, c) for i, c, _ in original]))
+
+# === Синтетические трассы ===
+
+_LETTERS = [0x41 + i for i in range(26)]
+_VK_SPACE = 0x20
+_VK_BACK = 0x08
+_VK_LSHIFT = 0xA0
+_VK_LCONTROL = 0xA2
+
+def typing_trace(words: int = 1000, wpm: int = 80, seed: int = 1) -> list[RecordedEvent]:
+    """Набор текста: слова из букв, иногда с Shift, опечатки с Backspace и редкие ctrl+c/ctrl+v."""
+    rnd = random.Random(seed)
+    interval_ns = int(60e9 / (wpm * 5))
+    now = 0
+    events = []
+
+    def tap(vk: int):
+        nonlocal now
+        events.append(RecordedEvent(DEVICE_KEYBOARD, WM_KEYDOWN, vk, time_ns=now))
+        now += rnd.randint(interval_ns // 4, interval_ns // 2)
+        events.append(RecordedEvent(DEVICE_KEYBOARD, WM_KEYUP, vk, time_ns=now))
+        now += rnd.randint(interval_ns // 2, interval_ns)
+
+    def chord(modifier: int, vk: int):
+        nonlocal now
+        events.append(RecordedEvent(DEVICE_KEYBOARD, WM_KEYDOWN, modifier, time_ns=now))
+        now += interval_ns // 4
+        tap(vk)
+        events.append(RecordedEvent(DEVICE_KEYBOARD, WM_KEYUP, modifier, time_ns=now))
+        now += interval_ns
+
+    for _ in range(words):
+        if rnd.random() < 0.02:
+            chord(_VK_LCONTROL, rnd.choice((0x43, 0x56)))
+        for i in range(rnd.randint(2, 9)):
+            vk = rnd.choice(_LETTERS)
+            if i == 0 and rnd.random() < 0.1:
+                chord(_VK_LSHIFT, vk)
+            else:
+                tap(vk)
+            if rnd.random() < 0.03:
+                tap(_VK_BACK)
+        tap(_VK_SPACE)
+    return events
+
+def gaming_mouse_trace(seconds: float = 10.0, rate_hz: int = 1000, seed: int = 1) -> list[RecordedEvent]:
+    """Игровая мышь: движение с частотой опроса rate_hz, частые клики ЛКМ/ПКМ и прокрутка."""
+    rnd = random.Random(seed)
+    step_ns = int(1e9 / rate_hz)
+    x, y = 960, 540
+    left_down = right_down = False
+    events = []
+
+    for i in range(int(seconds * rate_hz)):
+        now = i * step_ns
+        x = max(0, min(1919, x + rnd.randint(-6, 6)))
+        y = max(0, min(1079, y + rnd.randint(-4, 4)))
+        events.append(RecordedEvent(DEVICE_MOUSE, WM_MOUSEMOVE, x=x, y=y, time_ns=now))
+
+        roll = rnd.random()
+        if roll < 0.004:
+            left_down = not left_down
+            events.append(RecordedEvent(DEVICE_MOUSE, WM_LBUTTONDOWN if left_down else WM_LBUTTONUP, x=x, y=y, time_ns=now))
+        elif roll < 0.005:
+            right_down = not right_down
+            events.append(RecordedEvent(DEVICE_MOUSE, WM_RBUTTONDOWN if right_down else WM_RBUTTONUP, x=x, y=y, time_ns=now))
+        elif roll < 0.006:
+            delta = rnd.choice((120, -120)) & 0xFFFF
+            events.append(RecordedEvent(DEVICE_MOUSE, WM_MOUSEWHEEL, x=x, y=y, mouse_data=delta << 16, time_ns=now))
+    return events
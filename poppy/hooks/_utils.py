@@ -131,6 +131,20 @@ MOUSE_NAMES = {
 
 NAME_TO_MOUSE = {name: vk for vk, name in MOUSE_NAMES.items()}
 
+# Модификаторы без указания стороны в хоткеях соответствуют и левой, и правой клавише
+MODIFIER_GROUPS = {
+    "shift": (0xA0, 0xA1),
+    "ctrl": (0xA2, 0xA3),
+    "alt": (0xA4, 0xA5),
+    "win": (0x5B, 0x5C),
+    "windows": (0x5B, 0x5C),
+}
+VK_GROUPS = {
+    0x10: MODIFIER_GROUPS["shift"],     # VK_SHIFT
+    0x11: MODIFIER_GROUPS["ctrl"],      # VK_CONTROL
+    0x12: MODIFIER_GROUPS["alt"],       # VK_MENU
+}
+
 def get_vk(name: str) -> int | None:
     if name in ('shift', 'ctrl', 'alt', 'win'):
         name = f"left {name}"
@@ -138,6 +152,13 @@ def get_vk(name: str) -> int | None:
         name = name.replace("num", "numpad")
     return NAME_TO_VK.get(name.lower()) or None
 
+def get_vk_group(name: str) -> tuple[int, ...]:
+    group = MODIFIER_GROUPS.get(name.lower())
+    if group is not None:
+        return group
+    vk = get_vk(name)
+    return () if vk is None else (vk,)
+
 def get_mouse(name: str) -> int | None:
     return NAME_TO_MOUSE.get(name.lower()) or None
 
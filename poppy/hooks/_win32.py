@@ -0,0 +1,96 @@
+import ctypes
+import sys
+from ctypes import wintypes
+
+# === Добавляем недостающие типы ===
+if not hasattr(wintypes, 'LRESULT'):
+    wintypes.LRESULT = ctypes.c_ssize_t
+if not hasattr(wintypes, 'HHOOK'):
+    wintypes.HHOOK = wintypes.HANDLE
+if not hasattr(wintypes, 'LPMSG'):
+    wintypes.LPMSG = ctypes.POINTER(wintypes.MSG)
+if not hasattr(wintypes, 'HKL'):
+    wintypes.HKL = wintypes.HANDLE
+
+# === Константы ===
+WH_KEYBOARD_LL = 13
+WH_MOUSE_LL = 14
+WM_QUIT = 0x0012
+WM_APP = 0x8000
+PM_NOREMOVE = 0x0000
+VREFRESH = 116
+
+class POINT(ctypes.Structure):
+    _fields_ = [("x", wintypes.LONG), ("y", wintypes.LONG)]
+
+# === WinAPI ===
+# Все argtypes задаются здесь один раз; на других платформах модули хуков импортируются без WinAPI
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    gdi32 = ctypes.windll.gdi32
+
+    # noinspection PyUnresolvedReferences
+    HOOKPROC = ctypes.WINFUNCTYPE(wintypes.LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+    user32.SetWindowsHookExW.argtypes = (wintypes.INT, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD)
+    user32.SetWindowsHookExW.restype = wintypes.HHOOK
+
+    user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+    # noinspection PyUnresolvedReferences
+    user32.CallNextHookEx.restype = wintypes.LRESULT
+
+    user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+    user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+
+    user32.GetMessageW.argtypes = (wintypes.LPMSG, wintypes.HWND, wintypes.UINT, wintypes.UINT)
+    user32.GetMessageW.restype = wintypes.BOOL
+
+    user32.PeekMessageW.argtypes = (wintypes.LPMSG, wintypes.HWND, wintypes.UINT, wintypes.UINT, wintypes.UINT)
+    user32.PeekMessageW.restype = wintypes.BOOL
+
+    user32.TranslateMessage.argtypes = (wintypes.LPMSG,)
+    user32.DispatchMessageW.argtypes = (wintypes.LPMSG,)
+
+    user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+    user32.PostThreadMessageW.restype = wintypes.BOOL
+
+    kernel32.GetLastError.argtypes = ()
+    kernel32.GetLastError.restype = wintypes.DWORD
+
+    kernel32.GetCurrentThreadId.argtypes = ()
+    kernel32.GetCurrentThreadId.restype = wintypes.DWORD
+
+    user32.GetKeyState.argtypes = (wintypes.INT,)
+    user32.GetKeyState.restype = wintypes.SHORT
+
+    user32.VkKeyScanExW.argtypes = (wintypes.WORD, wintypes.HKL)
+    user32.VkKeyScanExW.restype = wintypes.SHORT
+
+    user32.ToUnicodeEx.argtypes = (
+        wintypes.UINT,
+        wintypes.UINT,
+        ctypes.POINTER(wintypes.BYTE * 256),
+        wintypes.LPWSTR,
+        ctypes.c_int,
+        wintypes.UINT,
+        wintypes.HKL
+    )
+    user32.ToUnicodeEx.restype = ctypes.c_int
+
+    user32.GetCursorPos.argtypes = (ctypes.POINTER(POINT),)
+    user32.GetCursorPos.restype = wintypes.BOOL
+
+    user32.GetDC.argtypes = (wintypes.HWND,)
+    user32.GetDC.restype = wintypes.HDC
+
+    user32.ReleaseDC.argtypes = (wintypes.HWND, wintypes.HDC)
+    user32.ReleaseDC.restype = ctypes.c_int
+
+    gdi32.GetDeviceCaps.argtypes = (wintypes.HDC, ctypes.c_int)
+    gdi32.GetDeviceCaps.restype = ctypes.c_int
+else:
+    user32 = None
+    kernel32 = None
+    gdi32 = None
+    HOOKPROC = ctypes.CFUNCTYPE(wintypes.LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
@@ -20,14 +20,22 @@ class KeyboardHandler:
         from .app import App
         self._app = App.instance()
         
-        self._ctrl_pressed = False
-        self._alt_pressed = False
-        self._shift_pressed = False
-        self._foreign_key_pressed = False
         self._switch_device_hotkey_id: int | None = None
+        self._started = False
         
         self._setup_hooks()
 
+        # Хук клавиатуры нужен, только пока включена хотя бы одна функция, которая его использует
+        for option in (
+            config.keyboard_window.enable,
+            config.keyboard_window.show_modifiers,
+            config.volume_window.enable,
+            config.media_window.enable,
+            config.audio_switch.hotkey,
+            config.audio_switch.hotkey_value,
+        ):
+            option.valueChanged.connect(self._update_hook)
+
     def _setup_hooks(self):
         # --- Lock-клавиши ---
         keyboard.hook_hotkey([keys.caps_lock], lambda: self._on_lock_key("Caps"))
@@ -35,18 +43,13 @@ class KeyboardHandler:
         keyboard.hook_hotkey([keys.num_lock], lambda: self._on_lock_key("Num"))
         keyboard.hook_hotkey([keys.insert], lambda: self._on_lock_key("Insert"))
 
-        # --- Модификаторы ---
-        keyboard.hook_key(keys.left_ctrl, self._on_ctrl_event)
-        keyboard.hook_key(keys.right_ctrl, self._on_ctrl_event)
-        keyboard.hook_key(keys.left_alt, self._on_alt_event)
-        keyboard.hook_key(keys.right_alt, self._on_alt_event)
-        keyboard.hook_key(keys.left_shift, self._on_shift_event)
-        keyboard.hook_key(keys.right_shift, self._on_shift_event)
-
         # --- Громкость ---
         keyboard.hook_key(keys.volume_up, self._volume_buttons)
         keyboard.hook_key(keys.volume_down, self._volume_buttons)
         keyboard.hook_key(keys.volume_mute, self._volume_buttons)
+        self._volume_keys_suppressed = False
+        self._set_volume_keys_suppressed(config.volume_window.enable.value)
+        config.volume_window.enable.valueChanged.connect(self._set_volume_keys_suppressed)
         
         # --- Мультимедиа ---
         keyboard.hook_key(keys.play_pause, self._media_buttons)
@@ -57,23 +60,30 @@ class KeyboardHandler:
         self._set_switch_device_hotkey(config.audio_switch.hotkey_value.value)
         config.audio_switch.hotkey_value.valueChanged.connect(self._set_switch_device_hotkey)
 
-        # --- Все остальные клавиши ---
-        keyboard.hook(self._on_any_key)
-
     def start(self):
-        if not keyboard.is_running:
-            keyboard.start()
+        # Подписчики не должны задерживать системный хук — выполняем их в потоке диспетчера.
+        # Их возвращаемое значение здесь ничего не подавляет: медиаклавиши подавляются через suppress_key()
+        keyboard.set_threaded_dispatch(True)
+        self._started = True
+        self._update_hook()
 
     def stop(self):
-        if keyboard.is_running:
-            keyboard.stop()
+        self._started = False
+        keyboard.set_hook_required("keyboard_handler", False)
+
+    def _update_hook(self, *_):
+        keyboard.set_hook_required("keyboard_handler", self._started and self._is_hook_needed())
+
+    @staticmethod
+    def _is_hook_needed() -> bool:
+        # Смену раскладки сообщает LayoutState, хук нужен только lock-клавишам
+        keyboard_popup = config.keyboard_window.enable.value and config.keyboard_window.show_modifiers.value
+        switch_device = config.audio_switch.hotkey.value and bool(config.audio_switch.hotkey_value.value)
+        return bool(keyboard_popup or config.volume_window.enable.value or config.media_window.enable.value or switch_device)
     
     def _on_lock_key(self, lock_name: str):
         self._app.call_soon_threadsafe(lambda: QTimer.singleShot(20, lambda: self._app.show_lock_popup(lock_name)))
 
-    def _show_layout(self):
-        self._app.call_soon_threadsafe(lambda: QTimer.singleShot(20, self._app.show_layout))
-
     def _show_volume(self, callback: callable, device_changed: bool = False):
         self._app.call_soon_threadsafe(callback)
         self._app.call_soon_threadsafe(self._app.show_volume_popup, device_changed)
@@ -85,69 +95,38 @@ class KeyboardHandler:
         if hotkey:
             self._switch_device_hotkey_id = keyboard.hook_hotkey(hotkey, self._on_change_device)
     
+    def _set_volume_keys_suppressed(self, suppressed: bool):
+        # Подавляем клавиши громкости → системный попап не появится
+        if suppressed == self._volume_keys_suppressed:
+            return
+        
+        self._volume_keys_suppressed = suppressed
+        for key in (keys.volume_up, keys.volume_down, keys.volume_mute):
+            if suppressed:
+                keyboard.suppress_key(key)
+            else:
+                keyboard.unsuppress_key(key)
+    
     def _volume_buttons(self, e: KeyEvent):
         if not config.volume_window.enable.value:
-            return True
+            return
         
+        # Автоповтор даёт ~30 нажатий в секунду: AudioManager сводит их в одну запись за кадр и один показ окна
         if e.event_type == KeyEventType.PRESS:
             if e.key == keys.volume_up:
-                self._show_volume(self._app.audio_manager.volume_up)
+                self._app.audio_manager.change_volume(1, show_popup=True)
             elif e.key == keys.volume_down:
-                self._show_volume(self._app.audio_manager.volume_down)
+                self._app.audio_manager.change_volume(-1, show_popup=True)
             elif e.key == keys.volume_mute:
-                self._show_volume(self._app.audio_manager.toggle_mute)
-
-        return False  # Подавляем событие → системный попап не появится
+                self._app.audio_manager.request_toggle_mute(show_popup=True)
 
     def _media_buttons(self, e: KeyEvent):
         if e.event_type == KeyEventType.PRESS:
             self._app.call_soon_threadsafe(self._app.show_media_popup)
     
-    # --- Обработчики модификаторов ---
-    def _on_ctrl_event(self, e: KeyEvent):
-        if e.event_type == KeyEventType.PRESS:
-            self._ctrl_pressed = True
-        elif e.event_type == KeyEventType.RELEASE:
-            if not self._ctrl_pressed:
-                return 
-            self._ctrl_pressed = False
-            if self._shift_pressed and not self._foreign_key_pressed:
-                self._show_layout()
-            self._foreign_key_pressed = False
-
-    def _on_alt_event(self, e: KeyEvent):
-        if e.event_type == KeyEventType.PRESS:
-            self._alt_pressed = True
-        elif e.event_type == KeyEventType.RELEASE:
-            if not self._alt_pressed:
-                return
-            self._alt_pressed = False
-            if self._shift_pressed and not self._foreign_key_pressed:
-                self._show_layout()
-            self._foreign_key_pressed = False
-
-    def _on_shift_event(self, e: KeyEvent):
-        if e.event_type == KeyEventType.PRESS:
-            self._shift_pressed = True
-        elif e.event_type == KeyEventType.RELEASE:
-            if not self._shift_pressed:
-                return
-            self._shift_pressed = False
-            if (self._ctrl_pressed or self._alt_pressed) and not self._foreign_key_pressed:
-                self._show_layout()
-            self._foreign_key_pressed = False
-    
     def _on_change_device(self):
         if not config.audio_switch.hotkey.value:
             return
 
         self._show_volume(self._app.audio_manager.switch_device, True)
 
-    # --- Обработчик любых клавиш ---
-    def _on_any_key(self, e: KeyEvent):
-        if e.key.name in ('ctrl', 'right ctrl', 'shift', 'right shift', 'alt', 'right alt', 'caps lock', 'num lock', 'scroll lock', 'insert'):
-            return
-        
-        if e.event_type == KeyEventType.PRESS:
-            if (self._ctrl_pressed or self._alt_pressed) and self._shift_pressed:
-                self._foreign_key_pressed = True
\ No newline at end of file
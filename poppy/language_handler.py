@@ -28,6 +28,11 @@ class LanguageHandler:
             return []
     
     def get_layout(self) -> int:
+        thread_id = self.get_focus_thread()
+        return self.get_thread_layout(thread_id) if thread_id else 0
+
+    def get_focus_thread(self) -> int:
+        """Поток окна, которое получает ввод: каретка, фокус или активное окно foreground-потока."""
         try:
             hwnd_fg = user32.GetForegroundWindow()
             if not hwnd_fg:
@@ -51,13 +56,17 @@ class LanguageHandler:
                 hwnd = gti.hwndActive
 
             if hwnd:
-                layout_thread_id = user32.GetWindowThreadProcessId(hwnd, None)
-            else:
-                layout_thread_id = target_thread_id
+                return user32.GetWindowThreadProcessId(hwnd, None)
+            return target_thread_id
 
-            hkl = user32.GetKeyboardLayout(layout_thread_id)
-            return hkl & 0xFFFF
+        except Exception as e:
+            print(f"[LanguageHandler] Ошибка получения потока ввода: {e}")
+            return 0
 
+    def get_thread_layout(self, thread_id: int) -> int:
+        try:
+            hkl = user32.GetKeyboardLayout(thread_id)
+            return hkl & 0xFFFF
         except Exception as e:
             print(f"[LanguageHandler] Ошибка получения layout_id: {e}")
             return 0
@@ -0,0 +1,198 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ctypes
+import ntpath
+import sys
+from collections import OrderedDict
+from ctypes import wintypes
+from typing import Generic, Hashable, TypeVar
+from .layout_state import LayoutState
+from .config import config
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+# Окон и процессов, для которых помним раскладку; самые давно активные вытесняются
+WINDOW_CAPACITY = 256
+PROCESS_NAME_CAPACITY = 128
+
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+
+    kernel32.QueryFullProcessImageNameW.argtypes = (wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR,
+                                                    ctypes.POINTER(wintypes.DWORD))
+    kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+
+    kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.FILETIME),
+                                         ctypes.POINTER(wintypes.FILETIME), ctypes.POINTER(wintypes.FILETIME),
+                                         ctypes.POINTER(wintypes.FILETIME))
+    kernel32.GetProcessTimes.restype = wintypes.BOOL
+
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    kernel32.CloseHandle.restype = wintypes.BOOL
+
+    user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+else:
+    user32 = None
+    kernel32 = None
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class LruCache(Generic[K, V]):
+    """Словарь ограниченного размера: при переполнении удаляется запись, к которой дольше всего не обращались."""
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._items: OrderedDict[K, V] = OrderedDict()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        value = self._items.get(key, default)
+        if key in self._items:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self._capacity:
+            self._items.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        return self._items.pop(key, default)
+
+    def clear(self):
+        self._items.clear()
+
+def get_window_process_id(hwnd: int) -> int:
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value
+
+def get_process_start_time(pid: int) -> int:
+    """Время создания процесса (FILETIME); вместе с PID однозначно задаёт процесс — PID после выхода переиспользуется."""
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return 0
+    try:
+        creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                        ctypes.byref(kernel), ctypes.byref(user)):
+            return 0
+        return (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+    finally:
+        kernel32.CloseHandle(handle)
+
+def get_process_name(pid: int) -> str | None:
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None
+    try:
+        size = wintypes.DWORD(260)
+        buffer = ctypes.create_unicode_buffer(size.value)
+        if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+            return None
+        return ntpath.basename(buffer.value).lower()
+    finally:
+        kernel32.CloseHandle(handle)
+
+class LayoutMemory:
+    """
+    Запоминает раскладку для каждого окна (или программы) и восстанавливает её, когда окно снова становится активным.
+    Работает по уведомлениям LayoutState: смена foreground-окна — восстановить, layout_changed — запомнить.
+    Имя программы кэшируется по PID и времени создания процесса: переключение окон не запрашивает путь к exe каждый раз,
+    а процесс, получивший PID завершившегося, не наследует его имя (и раскладку).
+    """
+    def __init__(self, layout_state: LayoutState):
+        self._layout_state = layout_state
+        self._layouts: LruCache[int | str, int] = LruCache(WINDOW_CAPACITY)
+        self._process_names: LruCache[tuple[int, int], str | None] = LruCache(PROCESS_NAME_CAPACITY)
+        # Окно (или программа), к которому относится текущая раскладка
+        self._key: int | str | None = None
+        self._enabled = False
+
+        self.set_enabled(config.layout_switch.remember_layout.value)
+        config.layout_switch.remember_layout.valueChanged.connect(self.set_enabled)
+        config.layout_switch.remember_per_process.valueChanged.connect(self._on_mode_changed)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def set_enabled(self, enabled: bool):
+        if enabled == self._enabled:
+            return
+
+        self._enabled = enabled
+        if enabled:
+            self._layout_state.foreground_changed.connect(self._on_foreground_changed)
+            self._layout_state.layout_changed.connect(self._on_layout_changed)
+            self._key = self._get_key(self._layout_state.foreground_window)
+        else:
+            self._layout_state.foreground_changed.disconnect(self._on_foreground_changed)
+            self._layout_state.layout_changed.disconnect(self._on_layout_changed)
+            self.clear()
+
+    def clear(self):
+        self._layouts.clear()
+        self._process_names.clear()
+        self._key = None
+
+    def _on_mode_changed(self, *args):
+        # Окна и программы — разные ключи, старые записи не подходят
+        self.clear()
+        self._key = self._get_key(self._layout_state.foreground_window)
+
+    def _on_foreground_changed(self, hwnd: int):
+        # Прежнее окно оставили с той раскладкой, что была опубликована последней
+        previous_layout = self._layout_state.published_layout
+        if self._key is not None and previous_layout:
+            self._layouts.put(self._key, previous_layout)
+
+        self._key = self._get_key(hwnd)
+        if self._key is None:
+            return
+
+        layout = self._layouts.get(self._key)
+        if layout and layout != self._layout_state.layout and layout in self._layout_state.layouts:
+            self._layout_state.set_layout(layout)
+
+    def _on_layout_changed(self, layout: int):
+        if self._key is not None:
+            self._layouts.put(self._key, layout)
+
+    def _get_key(self, hwnd: int) -> int | str | None:
+        if not hwnd:
+            return None
+        if not config.layout_switch.remember_per_process.value:
+            return hwnd
+
+        pid = get_window_process_id(hwnd)
+        if not pid:
+            return None
+        process = (pid, get_process_start_time(pid))
+        if process not in self._process_names:
+            self._process_names.put(process, get_process_name(pid))
+        # Без доступа к процессу (например, запущен от администратора) помним хотя бы окно
+        return self._process_names.get(process) or hwnd
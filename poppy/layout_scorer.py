@@ -0,0 +1,293 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import mmap
+import os
+import struct
+from typing import NamedTuple, Sequence
+from .layout_tables import LayoutTables, STATE_NONE, STATE_SHIFT
+
+# Формат файла таблицы биграмм (<язык>.bin, собирается tools/build_ngrams.py):
+# заголовок NGRAM_HEADER, затем 2**bits знаковых байт — квантованный log2 P(b|a) * NGRAM_SCALE по слоту хэша биграммы
+NGRAM_MAGIC = b"PNGR"
+NGRAM_VERSION = 1
+NGRAM_HEADER = struct.Struct("<4sBBbx")     # magic, version, bits, floor (значение для невстреченных биграмм)
+NGRAM_SCALE = 4
+
+BOUNDARY = " "
+# Автопереключение: слово короче не оценивается, длиннее — перестаёт отслеживаться (цена нажатия ограничена)
+MIN_WORD_KEYS = 3
+MAX_WORD_KEYS = 32
+# На сколько бит на биграмму другая раскладка должна быть правдоподобнее текущей
+AUTO_SWITCH_MARGIN = 1.5
+
+# Длинное выделение оценивается по началу: для выбора раскладки этого достаточно, а время остаётся предсказуемым
+MAX_SCORED_CHARS = 256
+
+# Первичный идентификатор языка (младшие 10 бит LANGID) → имя файла таблицы
+_LANGUAGE_CODES = {
+    0x07: "de",
+    0x09: "en",
+    0x0A: "es",
+    0x0C: "fr",
+    0x10: "it",
+    0x15: "pl",
+    0x19: "ru",
+    0x22: "uk",
+    0x23: "be",
+    0x3F: "kk",
+}
+
+def get_language_code(layout: int) -> str | None:
+    return _LANGUAGE_CODES.get(layout & 0x3FF)
+
+def bigram_slot(first: str, second: str, mask: int) -> int:
+    return (((ord(first) << 16) | ord(second)) * 0x9E3779B1 >> 13) & mask
+
+def normalize(text: str) -> str:
+    """Нижний регистр, всё кроме букв — одна граница слова; границы и по краям."""
+    result = [BOUNDARY]
+    for char in text[:MAX_SCORED_CHARS].lower():
+        if char.isalpha():
+            result.append(char)
+        elif result[-1] != BOUNDARY:
+            result.append(BOUNDARY)
+    if result[-1] != BOUNDARY:
+        result.append(BOUNDARY)
+    return "".join(result)
+
+class NgramTable:
+    """Таблица биграмм одного языка; файл отображается в память при первой оценке."""
+    def __init__(self, path: str):
+        self._path = path
+        self._mmap: mmap.mmap | None = None
+        self._values: memoryview | None = None
+        self._mask = 0
+        self._failed = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._values is not None
+
+    def load(self) -> bool:
+        return self._values is not None or self._open()
+
+    def value(self, first: str, second: str) -> int:
+        """Квантованный log2 P(second|first) * NGRAM_SCALE; таблица должна быть загружена (load)."""
+        return self._values[bigram_slot(first, second, self._mask)]
+
+    def score(self, normalized: str) -> float | None:
+        """Средний log2 вероятности биграммы; None, если таблица недоступна или в тексте нет букв."""
+        if not self.load():
+            return None
+        if len(normalized) < 3:
+            return None
+
+        values = self._values
+        mask = self._mask
+        total = 0
+        for i in range(len(normalized) - 1):
+            total += values[bigram_slot(normalized[i], normalized[i + 1], mask)]
+        return total / ((len(normalized) - 1) * NGRAM_SCALE)
+
+    def close(self):
+        if self._values is not None:
+            self._values.release()
+            self._values = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _open(self) -> bool:
+        if self._failed:
+            return False
+        try:
+            with open(self._path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, bits, _ = NGRAM_HEADER.unpack_from(mapped)
+            if magic != NGRAM_MAGIC or version != NGRAM_VERSION or len(mapped) != NGRAM_HEADER.size + (1 << bits):
+                mapped.close()
+                raise ValueError("unsupported format")
+        except Exception as e:
+            print(f"[NgramTable] Failed to load {self._path}: {e}")
+            self._failed = True
+            return False
+
+        self._mmap = mapped
+        self._values = memoryview(mapped)[NGRAM_HEADER.size:].cast("b")
+        self._mask = (1 << bits) - 1
+        return True
+
+class LayoutChoice(NamedTuple):
+    source: int
+    target: int
+    score: float
+
+class LayoutScorer:
+    """
+    Выбирает исходную раскладку выделенного текста: для каждой раскладки, в которой текст набирается, текст
+    конвертируется в следующую раскладку, и сравнивается правдоподобие результата на языке цели с правдоподобием
+    исходного текста на языке источника. Без таблиц для языка оценка нейтральна (0) и решает порядок раскладок.
+    """
+    def __init__(self, layout_tables: LayoutTables, directory: str):
+        self._layout_tables = layout_tables
+        self._directory = directory
+        self._ngrams: dict[str, NgramTable | None] = {}
+
+    def ngram_table(self, layout: int) -> NgramTable | None:
+        code = get_language_code(layout)
+        if code is None:
+            return None
+        if code not in self._ngrams:
+            path = os.path.join(self._directory, f"{code}.bin")
+            self._ngrams[code] = NgramTable(path) if os.path.exists(path) else None
+        return self._ngrams[code]
+
+    def score(self, text: str, source: int, target: int) -> float:
+        """> 0 — текст больше похож на набранный не в той раскладке."""
+        source_table = self.ngram_table(source)
+        target_table = self.ngram_table(target)
+        if source_table is None or target_table is None:
+            return 0.0
+
+        converted = self._layout_tables.convert(text, source, target)
+        source_score = source_table.score(normalize(text))
+        target_score = target_table.score(normalize(converted))
+        if source_score is None or target_score is None:
+            return 0.0
+        return target_score - source_score
+
+    def rank(self, text: str, layouts: Sequence[int], preferred: int | None = None) -> list[LayoutChoice]:
+        candidates = self._layout_tables.candidates(text, layouts)
+        choices = []
+        for source in candidates:
+            target = layouts[(layouts.index(source) + 1) % len(layouts)]
+            score = self.score(text, source, target) if len(candidates) > 1 else 0.0
+            choices.append(LayoutChoice(source, target, score))
+
+        # При равной оценке (пунктуация, цифры) выигрывает текущая раскладка окна, затем порядок списка
+        choices.sort(key=lambda choice: (-choice.score, choice.source != preferred, candidates.index(choice.source)))
+        return choices
+
+    def best(self, text: str, layouts: Sequence[int], preferred: int | None = None) -> LayoutChoice | None:
+        choices = self.rank(text, layouts, preferred)
+        return choices[0] if choices else None
+
+    def close(self):
+        for table in self._ngrams.values():
+            if table is not None:
+                table.close()
+        self._ngrams.clear()
+
+class _WordState:
+    __slots__ = ("layout", "table", "ngrams", "previous", "total", "count")
+
+    def __init__(self, layout: int, table, ngrams: NgramTable):
+        self.layout = layout
+        self.table = table
+        self.ngrams = ngrams
+        self.previous = BOUNDARY
+        self.total = 0
+        self.count = 0
+
+class IncrementalScorer:
+    """
+    Правдоподобие набираемого слова во всех раскладках сразу: каждое нажатие добавляет по одной биграмме на раскладку,
+    так что цена нажатия — O(число раскладок) и не зависит от длины слова (длина ограничена MAX_WORD_KEYS).
+    """
+    def __init__(self, layout_scorer: LayoutScorer, layout_tables: LayoutTables):
+        self._layout_scorer = layout_scorer
+        self._layout_tables = layout_tables
+        self._states: list[_WordState] = []
+        # Снимки (previous, total, count) всех раскладок до каждого нажатия — для backspace
+        self._history: list[tuple] = []
+        self._overflow = False
+
+    @property
+    def layouts(self) -> list[int]:
+        return [state.layout for state in self._states]
+
+    @property
+    def length(self) -> int:
+        return len(self._history)
+
+    def reset(self):
+        """Раскладки, для которых есть и таблица символов, и таблица биграмм; вызывать при смене списка раскладок."""
+        states = []
+        for layout in self._layout_tables.layouts:
+            table = self._layout_tables.table(layout)
+            ngrams = self._layout_scorer.ngram_table(layout)
+            if table is not None and ngrams is not None and ngrams.load():
+                states.append(_WordState(layout, table, ngrams))
+        self._states = states
+        self.clear()
+
+    def clear(self):
+        for state in self._states:
+            state.previous = BOUNDARY
+            state.total = 0
+            state.count = 0
+        self._history.clear()
+        self._overflow = False
+
+    def push(self, vk: int, shift: bool):
+        if len(self._history) >= MAX_WORD_KEYS:
+            self._overflow = True
+            return
+
+        key_state = STATE_SHIFT if shift else STATE_NONE
+        self._history.append(tuple((state.previous, state.total, state.count) for state in self._states))
+        for state in self._states:
+            char = state.table.char(vk, key_state)
+            char = char.lower() if char is not None and char.isalpha() else BOUNDARY
+            if char == BOUNDARY and state.previous == BOUNDARY:
+                continue
+            state.total += state.ngrams.value(state.previous, char)
+            state.count += 1
+            state.previous = char
+
+    def pop(self):
+        if self._overflow or not self._history:
+            return
+        for state, (previous, total, count) in zip(self._states, self._history.pop()):
+            state.previous = previous
+            state.total = total
+            state.count = count
+
+    def scores(self) -> dict[int, float]:
+        """Средний log2 вероятности биграммы для каждой раскладки, с завершающей границей слова."""
+        if self._overflow or len(self._history) < MIN_WORD_KEYS:
+            return {}
+
+        result = {}
+        for state in self._states:
+            total, count = state.total, state.count
+            if state.previous != BOUNDARY:
+                total += state.ngrams.value(state.previous, BOUNDARY)
+                count += 1
+            if count:
+                result[state.layout] = total / (count * NGRAM_SCALE)
+        return result
+
+    def suggest(self, current: int, margin: float = AUTO_SWITCH_MARGIN) -> int | None:
+        """Раскладка, в которой слово явно правдоподобнее, чем в текущей; None — оставить как есть."""
+        scores = self.scores()
+        current_score = scores.get(current)
+        if current_score is None:
+            return None
+
+        best = max(scores, key=scores.get)
+        if best != current and scores[best] - current_score >= margin:
+            return best
+        return None
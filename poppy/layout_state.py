@@ -0,0 +1,298 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ctypes
+import sys
+from ctypes import wintypes
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QWidget
+from .language_handler import LanguageHandler
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_FOCUS = 0x8005
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+HSHELL_LANGUAGE = 8
+WM_SETTINGCHANGE = 0x001A
+WM_INPUTLANGCHANGE = 0x0051
+
+# Через сколько перечитать раскладку после собственного запроса: окно может его отклонить, и уведомления не будет
+VERIFY_DELAY_MS = 100
+
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+
+    # noinspection PyUnresolvedReferences
+    WINEVENTPROC = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG,
+                                      wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+
+    user32.SetWinEventHook.argtypes = (wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+                                       wintypes.DWORD, wintypes.DWORD, wintypes.DWORD)
+    user32.SetWinEventHook.restype = wintypes.HANDLE
+
+    user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    user32.UnhookWinEvent.restype = wintypes.BOOL
+
+    user32.RegisterShellHookWindow.argtypes = (wintypes.HWND,)
+    user32.RegisterShellHookWindow.restype = wintypes.BOOL
+
+    user32.DeregisterShellHookWindow.argtypes = (wintypes.HWND,)
+    user32.DeregisterShellHookWindow.restype = wintypes.BOOL
+
+    user32.RegisterWindowMessageW.argtypes = (wintypes.LPCWSTR,)
+    user32.RegisterWindowMessageW.restype = wintypes.UINT
+
+    user32.GetForegroundWindow.argtypes = ()
+    user32.GetForegroundWindow.restype = wintypes.HWND
+
+    user32.GetShellWindow.argtypes = ()
+    user32.GetShellWindow.restype = wintypes.HWND
+
+    user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+else:
+    user32 = None
+    WINEVENTPROC = ctypes.CFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG,
+                                    wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+
+class _ShellHookWindow(QWidget):
+    """
+    Скрытое окно, которому оболочка присылает HSHELL_LANGUAGE при смене языка ввода. Ему же приходят
+    WM_INPUTLANGCHANGE и широковещательный WM_SETTINGCHANGE — после них перечитывается список раскладок.
+    """
+    def __init__(self, on_language, on_settings):
+        super().__init__()
+        self._on_language = on_language
+        self._on_settings = on_settings
+        self._message = user32.RegisterWindowMessageW("SHELLHOOK")
+        self._hwnd = int(self.winId())
+        self._registered = bool(user32.RegisterShellHookWindow(self._hwnd))
+        if not self._registered:
+            print("[LayoutState] RegisterShellHookWindow failed")
+
+    def close_hook(self):
+        if self._registered:
+            user32.DeregisterShellHookWindow(self._hwnd)
+            self._registered = False
+        self.deleteLater()
+
+    def nativeEvent(self, event_type, message):
+        if bytes(event_type) == b"windows_generic_MSG":
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == self._message and msg.wParam & 0x7FFF == HSHELL_LANGUAGE:
+                self._on_language()
+                self._on_settings()
+            elif msg.message in (WM_INPUTLANGCHANGE, WM_SETTINGCHANGE):
+                self._on_settings()
+        return super().nativeEvent(event_type, message)
+
+class LayoutState(QObject):
+    """
+    Кэш раскладок: список раскладок и раскладка потока, который сейчас получает ввод. Поток запоминается по
+    WinEvent'ам смены foreground-окна и фокуса, раскладка перечитывается одним GetKeyboardLayout по событию
+    фокуса и по уведомлениям о смене языка. Между событиями layout и layouts не обращаются к системе.
+    WinEvent'ы (WINEVENT_OUTOFCONTEXT) приходят через очередь сообщений потока, который их установил, —
+    здесь это GUI-поток, так что обработчики и сигналы выполняются в цикле приложения.
+
+    Смена языка приходит от оболочки (HSHELL_LANGUAGE) и от индикатора языка на панели задач (смена имени
+    объекта в процессе оболочки) — так замечаются и Win+Space, и языковая панель, и переключение самим окном.
+    Одна смена часто порождает несколько уведомлений, поэтому layout_changed публикуется не сразу,
+    а один раз за итерацию цикла и только если итоговая раскладка отличается от опубликованной.
+
+    Список раскладок перечитывается по HSHELL_LANGUAGE, WM_INPUTLANGCHANGE и WM_SETTINGCHANGE (тоже раз за итерацию
+    цикла); layouts_changed публикуется при любом отличии — и при добавлении, и при удалении раскладки.
+    """
+    layout_changed = pyqtSignal(int)
+    layouts_changed = pyqtSignal()
+    # hwnd нового foreground-окна; раскладка его потока к этому моменту уже прочитана
+    foreground_changed = pyqtSignal(int)
+
+    def __init__(self, language_handler: LanguageHandler):
+        super().__init__()
+        self._language_handler = language_handler
+        self._layouts: list[int] | None = None
+        # Поток окна с фокусом ввода; 0 — неизвестен, раскладку нужно искать полностью
+        self._thread_id = 0
+        self._layout = 0
+        self._published_layout = 0
+        self._foreground_window = 0
+
+        self._win_event_proc: WINEVENTPROC | None = None
+        self._win_event_hooks: list[int] = []
+        self._shell_window: _ShellHookWindow | None = None
+        self._verify_timer = QTimer(self)
+        self._verify_timer.setSingleShot(True)
+        self._verify_timer.setInterval(VERIFY_DELAY_MS)
+        self._verify_timer.timeout.connect(self.refresh)
+        self._publish_timer = QTimer(self)
+        self._publish_timer.setSingleShot(True)
+        self._publish_timer.setInterval(0)
+        self._publish_timer.timeout.connect(self._publish)
+        self._layouts_timer = QTimer(self)
+        self._layouts_timer.setSingleShot(True)
+        self._layouts_timer.setInterval(0)
+        self._layouts_timer.timeout.connect(self.reload_layouts)
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._win_event_hooks)
+
+    @property
+    def foreground_window(self) -> int:
+        return self._foreground_window
+
+    @property
+    def published_layout(self) -> int:
+        """Раскладка из последнего layout_changed."""
+        return self._published_layout
+
+    @property
+    def layouts(self) -> list[int]:
+        if self._layouts is None:
+            self._layouts = self._language_handler.get_all_layouts()
+        return self._layouts
+
+    @property
+    def layout(self) -> int:
+        # Без уведомлений (не запущен) кэшу нельзя доверять — каждый раз спрашиваем систему
+        if not self._layout or not self.is_started:
+            self._resolve()
+        return self._layout
+
+    def start(self):
+        if user32 is None or self.is_started:
+            return
+
+        self._win_event_proc = WINEVENTPROC(self._on_win_event)
+        self._hook_win_event(EVENT_SYSTEM_FOREGROUND)
+        self._hook_win_event(EVENT_OBJECT_FOCUS)
+        # Только события процесса оболочки: без фильтра смена имени приходит от каждого окна системы
+        shell_pid = self._get_shell_process_id()
+        if shell_pid:
+            self._hook_win_event(EVENT_OBJECT_NAMECHANGE, shell_pid)
+
+        self._shell_window = _ShellHookWindow(self.refresh, self._schedule_reload_layouts)
+        self._foreground_window = user32.GetForegroundWindow() or 0
+        self._resolve()
+        self._published_layout = self._layout
+
+    def stop(self):
+        for hook in self._win_event_hooks:
+            user32.UnhookWinEvent(hook)
+        self._win_event_hooks.clear()
+        self._win_event_proc = None
+
+        if self._shell_window is not None:
+            self._shell_window.close_hook()
+            self._shell_window = None
+        self._verify_timer.stop()
+        self._publish_timer.stop()
+        self._layouts_timer.stop()
+
+    def invalidate(self):
+        """Забыть поток и список раскладок; следующее обращение опросит систему заново."""
+        self._thread_id = 0
+        self._layouts = None
+
+    def refresh(self) -> int:
+        """Перечитать раскладку известного потока ввода (один вызов GetKeyboardLayout)."""
+        if not self._thread_id:
+            self._resolve()
+        else:
+            self._update(self._language_handler.get_thread_layout(self._thread_id))
+        return self._layout
+
+    def reload_layouts(self) -> bool:
+        """Перечитать список раскладок; True и layouts_changed — если он изменился."""
+        if self._layouts is None:
+            # Список ещё не читали — сравнивать не с чем, прочитаем при обращении
+            return False
+        layouts = self._language_handler.get_all_layouts()
+        # Пустой список — ошибка чтения, а не удаление всех раскладок
+        if not layouts or layouts == self._layouts:
+            return False
+        self._layouts = layouts
+        self.layouts_changed.emit()
+        return True
+
+    def set_layout(self, layout: int):
+        self._language_handler.set_layout(layout)
+        # Запрос асинхронный: считаем его выполненным сразу и сверяемся с окном чуть позже
+        self._update(layout)
+        self._verify_timer.start()
+
+    def set_next_layout(self, current_layout: int | None = None) -> int:
+        if current_layout is None:
+            current_layout = self.layout
+        layouts = self.layouts
+        if current_layout not in layouts:
+            return current_layout
+
+        next_layout = layouts[(layouts.index(current_layout) + 1) % len(layouts)]
+        self.set_layout(next_layout)
+        return next_layout
+
+    def _resolve(self):
+        self._thread_id = self._language_handler.get_focus_thread()
+        if self._thread_id:
+            self._update(self._language_handler.get_thread_layout(self._thread_id))
+
+    def _schedule_reload_layouts(self):
+        if not self._layouts_timer.isActive():
+            self._layouts_timer.start()
+
+    def _hook_win_event(self, event: int, process_id: int = 0):
+        hook = user32.SetWinEventHook(event, event, None, self._win_event_proc, process_id, 0, WINEVENT_OUTOFCONTEXT)
+        if hook:
+            self._win_event_hooks.append(hook)
+        else:
+            print(f"[LayoutState] SetWinEventHook({event:#x}) failed")
+
+    @staticmethod
+    def _get_shell_process_id() -> int:
+        hwnd = user32.GetShellWindow()
+        if not hwnd:
+            return 0
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        return pid.value
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        try:
+            if event == EVENT_OBJECT_NAMECHANGE:
+                # Индикатор языка сменил подпись — раскладка окна с фокусом могла измениться
+                self.refresh()
+            elif thread_id:
+                self._thread_id = thread_id
+                self._update(self._language_handler.get_thread_layout(thread_id))
+                if event == EVENT_SYSTEM_FOREGROUND and hwnd and hwnd != self._foreground_window:
+                    self._foreground_window = hwnd
+                    self.foreground_changed.emit(hwnd)
+        except Exception as e:
+            print(f"[LayoutState] Error: {e}")
+
+    def _update(self, layout: int):
+        if not layout:
+            return
+
+        if self._layouts is not None and layout not in self._layouts:
+            # Появилась раскладка, которой не было в списке, — пользователь добавил её в систему
+            self.reload_layouts()
+
+        if layout != self._layout:
+            self._layout = layout
+            if not self._publish_timer.isActive():
+                self._publish_timer.start()
+
+    def _publish(self):
+        if self._layout != self._published_layout:
+            self._published_layout = self._layout
+            self.layout_changed.emit(self._layout)
@@ -8,128 +8,267 @@
 #
 # You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import pyperclip
-from .language_handler import LanguageHandler
+from typing import Callable
+from .layout_state import LayoutState
+from .layout_tables import LayoutTables
+from .layout_scorer import LayoutScorer, IncrementalScorer
+from .clipboard import Clipboard, ClipboardSnapshot
+from .utils import Utils
 from .hooks import *
 from .config import config
 import asyncio
+import time
+
+# Повторное нажатие сочетания в течение этого времени перебирает варианты конвертации без нового копирования
+CYCLE_TIMEOUT = 3.0
+
+class _ConversionCycle:
+    """Исходный выделенный текст, его варианты и вариант, который сейчас вставлен вместо выделения."""
+    __slots__ = ("kind", "variants", "index", "window", "deadline", "clipboard", "clipboard_sequence")
+
+    def __init__(self, kind: str, variants: list[tuple[str, int | None]], window: int):
+        self.kind = kind
+        # (текст, раскладка, которую включить вместе с ним); последний вариант — исходный текст
+        self.variants = variants
+        self.index = 0
+        self.window = window
+        self.deadline = time.monotonic() + CYCLE_TIMEOUT
+        # Буфер пользователя, восстановленный после вставки, и номер буфера сразу после восстановления
+        self.clipboard: ClipboardSnapshot | None = None
+        self.clipboard_sequence = 0
+
+    @property
+    def text(self) -> str:
+        return self.variants[self.index][0]
+
+    @staticmethod
+    def caret_length(text: str) -> int:
+        # Перевод строки из буфера вставляется как \r\n, но курсор проходит его за одно нажатие
+        return len(text.replace("\r\n", "\n"))
 
 class LayoutSwitcher:
     def __init__(self):
         from .app import App
         self._app = App.instance()
-        self._language_handler: LanguageHandler = self._app.language_handler
-
-        self._keys: list[KeyStroke] = []
+        self._layout_state: LayoutState = self._app.layout_state
+        self._clipboard: Clipboard = self._app.clipboard
+        self._layout_tables = LayoutTables()
+        self._layout_scorer = LayoutScorer(self._layout_tables, Utils.get_resource_path("ngrams"))
+        # Правдоподобие текущего слова во всех раскладках для автопереключения
+        self._word_scorer = IncrementalScorer(self._layout_scorer, self._layout_tables)
+
+        # Набранная фраза; вместе с нажатиями хранятся номера событий (общие для клавиатуры и мыши): события приходят
+        # из разных потоков и могут попасть в цикл приложения не в том порядке, в котором были нажаты
+        self._keys = KeystrokeRing()
+        self._reset_seq = 0
+        # Номер последнего физического нажатия или клика; пишется в потоке хуков, раньше, чем событие дойдёт до цикла
+        self._input_seq = 0
         self._is_busy = False
-        self._just_switched_last = False
+        # Сколько последних слов переключено подряд идущими нажатиями сочетания (0 — переключения не было)
+        self._switched_words = 0
+        # Наш собственный перенабор приходит в хук как injected-события — их не записываем
+        self._ignore_injected = False
 
         self._switch_last_id: int | None = None
         self._switch_selected_id: int | None = None
         self._switch_case_id: int | None = None
         self._mouse_hook_id: int | None = None
         self._key_hook_id: int | None = None
+        self._cycle: _ConversionCycle | None = None
+        # Клавиши сочетаний выделенного текста: их нажатие не прерывает перебор вариантов
+        self._hotkey_vks: dict[str, frozenset[int]] = {}
+        self._cycle_key_hook_id: int | None = None
+        self._cycle_mouse_hook_id: int | None = None
+        self._started = False
+
+        # Отпускаем зажатые пользователем shift/alt (иначе получится не ctrl+c) и копируем — одним вызовом
+        self._copy_sequence = (InputSequence()
+            .release(keys.left_shift.vk).release(keys.right_shift.vk)
+            .release(keys.left_alt.vk).release(keys.right_alt.vk)
+            .hotkey((keys.left_ctrl.vk, keys.c.vk))
+            .compile())
+        self._paste_sequence = InputSequence().hotkey((keys.left_ctrl.vk, keys.v.vk)).compile()
 
         self.set_switch_last_hotkey(config.layout_switch.last_hotkey.value)
         self.set_switch_selected_hotkey(config.layout_switch.selected_hotkey.value)
         self.set_switch_case_hotkey(config.layout_switch.case_hotkey.value)
+        self._update_key_tracking()
         
         config.layout_switch.last_hotkey.valueChanged.connect(self.set_switch_last_hotkey)
         config.layout_switch.selected_hotkey.valueChanged.connect(self.set_switch_selected_hotkey)
         config.layout_switch.case_hotkey.valueChanged.connect(self.set_switch_case_hotkey)
+        # Выключенная функция не держит ни сочетание, ни хуки
+        config.layout_switch.last.valueChanged.connect(
+            lambda *_: self.set_switch_last_hotkey(config.layout_switch.last_hotkey.value))
+        config.layout_switch.selected.valueChanged.connect(
+            lambda *_: self.set_switch_selected_hotkey(config.layout_switch.selected_hotkey.value))
+        config.layout_switch.case.valueChanged.connect(
+            lambda *_: self.set_switch_case_hotkey(config.layout_switch.case_hotkey.value))
+        config.layout_switch.auto_switch.valueChanged.connect(self._update_key_tracking)
+        self._layout_state.layouts_changed.connect(self._on_layouts_changed)
     
     def start(self):
-        if not keyboard.is_running:
-            keyboard.start()
-        if not mouse.is_running:
-            mouse.start()
+        self._started = True
+        self._update_hooks()
     
     def stop(self):
-        if keyboard.is_running:
-            keyboard.stop()
-        if mouse.is_running:
-            mouse.stop()
+        self._started = False
+        self._update_hooks()
+
+    def _update_hooks(self):
+        # Клавиатура нужна любому из сочетаний, мышь — только для сброса последнего слова по клику
+        keyboard_needed = bool(self._switch_last_id or self._switch_selected_id or self._switch_case_id or self._key_hook_id)
+        mouse_needed = self._mouse_hook_id is not None or self._cycle_mouse_hook_id is not None
+        keyboard.set_hook_required("layout_switcher", self._started and keyboard_needed)
+        mouse.set_hook_required("layout_switcher", self._started and mouse_needed)
 
     def set_switch_last_hotkey(self, hotkey: str):
         if self._switch_last_id:
             keyboard.unhook_hotkey(self._switch_last_id)
             self._switch_last_id = None
-        if self._key_hook_id:
-            keyboard.unhook(self._key_hook_id)
-            self._key_hook_id = None
-        if self._mouse_hook_id:
-            mouse.unhook(self._mouse_hook_id)
-            self._mouse_hook_id = None
 
-        if hotkey:
+        if hotkey and config.layout_switch.last.value:
             self._switch_last_id = keyboard.hook_hotkey(hotkey, self._switch_last)
+
+        self._update_key_tracking()
+
+    def _is_tracking_keys(self) -> bool:
+        # Набранное слово нужно и смене последнего слова, и автопереключению
+        last = config.layout_switch.last.value and bool(config.layout_switch.last_hotkey.value)
+        return last or config.layout_switch.auto_switch.value
+
+    def _update_key_tracking(self, *args):
+        tracking = self._is_tracking_keys()
+        if tracking and not self._key_hook_id:
             self._key_hook_id = keyboard.hook(self._on_key)
             self._mouse_hook_id = mouse.hook(self._on_click)
-    
+        elif not tracking and self._key_hook_id:
+            keyboard.unhook(self._key_hook_id)
+            mouse.unhook(self._mouse_hook_id)
+            self._key_hook_id = None
+            self._mouse_hook_id = None
+            self._clear_keys()
+
+        if tracking and config.layout_switch.auto_switch.value:
+            self._update_layouts()
+
+        self._update_hooks()
+
+    def _update_layouts(self):
+        # Таблицы перестраиваются, только если изменился список раскладок
+        if self._layout_tables.set_layouts(self._layout_state.layouts) or not self._word_scorer.layouts:
+            self._word_scorer.reset()
+
+    def _on_layouts_changed(self):
+        if config.layout_switch.auto_switch.value:
+            self._update_layouts()
+
     def set_switch_selected_hotkey(self, hotkey: str):
         if self._switch_selected_id:
             keyboard.unhook_hotkey(self._switch_selected_id)
             self._switch_selected_id = None
 
-        if hotkey:
+        if hotkey and config.layout_switch.selected.value:
             self._switch_selected_id = keyboard.hook_hotkey(hotkey, self._switch_selected)
 
+        self._hotkey_vks["layout"] = self._get_hotkey_vks(hotkey)
+        self._reset_cycle()
+
     def set_switch_case_hotkey(self, hotkey: str):
         if self._switch_case_id:
             keyboard.unhook_hotkey(self._switch_case_id)
             self._switch_case_id = None
 
-        if hotkey:
+        if hotkey and config.layout_switch.case.value:
             self._switch_case_id = keyboard.hook_hotkey(hotkey, self._switch_register)
-    
+
+        self._hotkey_vks["case"] = self._get_hotkey_vks(hotkey)
+        self._reset_cycle()
+
+    @staticmethod
+    def _get_hotkey_vks(hotkey: str) -> frozenset[int]:
+        if not hotkey:
+            return frozenset()
+        try:
+            return frozenset(vk for vk, _, _ in keyboard.compile_hotkey(hotkey).entries)
+        except ValueError:
+            return frozenset()
+
     def _switch_last(self):
-        if config.layout_switch.last_hotkey.value:
+        if config.layout_switch.last.value:
             self._app.call_soon_threadsafe(
                 lambda: asyncio.create_task(self._switch_last_async())
             )
 
     def _switch_selected(self):
-        if config.layout_switch.selected_hotkey.value:
+        if config.layout_switch.selected.value:
             self._app.call_soon_threadsafe(
                 lambda: asyncio.create_task(self._switch_selected_async())
             )
 
     def _switch_register(self):
-        if config.layout_switch.case_hotkey.value:
+        if config.layout_switch.case.value:
             self._app.call_soon_threadsafe(
                 lambda: asyncio.create_task(self._switch_register_async())
             )
 
-    async def _switch_last_async(self):
+    async def _switch_last_async(self, keystrokes: list[KeyStroke] | None = None, target: int | None = None,
+                                 seq: int | None = None):
+        """seq — номер пробела, по которому сработало автопереключение: исправление отменяется, если после него был ввод."""
         print("switch last")
 
         if self._is_busy:
             return
 
-        if len(self._keys) == 0:
-            layout = self._language_handler.get_layout()
-            new_layout = self._language_handler.set_next_layout(layout)
-            self._app.show_layout(new_layout)
+        switch_layout = True
+        if keystrokes is None:
+            words = self._keys.word_count()
+            if 0 < self._switched_words < words:
+                # Повторное нажатие: добавляем предыдущее слово к уже переключённым, раскладка не меняется
+                self._switched_words += 1
+                switch_layout = False
+            else:
+                # Первое нажатие — последнее слово; когда слов больше нет — вся фраза в следующую раскладку
+                self._switched_words = max(self._switched_words, 1)
+            keystrokes = self._keys.last_words(self._switched_words)
+        else:
+            self._switched_words = 0
+
+        if len(keystrokes) == 0:
+            self._switched_words = 0
+            self._layout_state.set_next_layout()
             return
         
+        if seq is not None and not self._is_last_input(seq):
+            print("[LayoutSwitcher] Auto switch cancelled: input after the word")
+            return
+
         self._is_busy = True
+        previous_layout = self._layout_state.layout
         
         try:
-            layout = self._language_handler.get_layout()
-            new_layout = self._language_handler.set_next_layout(layout)
-            self._app.show_layout(new_layout)
-            
-            print(self._keys)
-    
-            for _ in self._keys:
-                keyboard.click_key(keys.backspace)
-
-            await asyncio.sleep(0.02)
+            if switch_layout:
+                # Попап покажет подписка на layout_changed
+                if target is None:
+                    self._layout_state.set_next_layout()
+                else:
+                    self._layout_state.set_layout(target)
+
+            # Стираем и перенабираем слова одним пакетом; пауза остаётся перед ним, чтобы окно успело
+            # применить новую раскладку до того, как начнёт обрабатывать нажатия
+            sequence = InputSequence().backspace(len(keystrokes)).keystrokes(keystrokes)
+
+            if switch_layout:
+                await asyncio.sleep(0.02)
+
+            if seq is not None and not self._is_last_input(seq):
+                # Пользователь продолжил набор, пока менялась раскладка: backspace стёр бы его текст, а не слово
+                print("[LayoutSwitcher] Auto switch cancelled: input after the word")
+                self._layout_state.set_layout(previous_layout)
+                return
 
-            for ks in self._keys:
-                keyboard.click_keystroke(ks)
-            
-            self._just_switched_last = True
+            self._ignore_injected = True
+            keyboard.send(sequence, "switch last")
         except Exception as e:
             print(e)
         finally:
@@ -137,202 +276,275 @@ class LayoutSwitcher:
     
     async def _switch_selected_async(self):
         print("switch selected")
+        await self._convert_selection_async("layout", self._layout_variants)
 
-        if self._is_busy:
-            return
-        
-        self._is_busy = True
-        original: str | None = None
-        
-        try:
-            original = pyperclip.paste()
-            #print("original", original)
-            
-            keyboard.release_key("left shift")
-            keyboard.release_key("right shift")
-            keyboard.release_key("left alt")
-            keyboard.release_key("right alt")
-            
-            keyboard.click_hotkey("ctrl+c")
-    
-            await asyncio.sleep(0.03)
-            
-            copied = pyperclip.paste()
-            print("copied", copied)
-            
-            if not copied.strip() or original == copied:
-                return
-            
-            layouts = self._language_handler.get_all_layouts()
-            
-            keystrokes: list[KeyStroke] = []
-            layout = None
-            for l in layouts:
-                keystrokes.clear()
-                for char in copied:
-                    keystroke = keyboard.char_to_keystroke(char, l)
-                    if keystroke is not None:
-                        keystrokes.append(keystroke)
-                if len(keystrokes) == len(copied):
-                    layout = l
-                    break
-            
-            if layout is None:
-                return 
-            
-            new_layout = self._language_handler.set_next_layout(layout)
-            self._app.show_layout(new_layout)
-            #print("new_layout", new_layout)
-            #print("layout", layout)
-
-            await asyncio.sleep(0.02)
-            
-            result = ""
-            for ks in keystrokes:
-                result += keyboard.keystroke_to_char(ks, new_layout)
-            
-            print("result", result)
-
-            pyperclip.copy(result)
-            await asyncio.sleep(0.03)
-
-            keyboard.click_hotkey("ctrl+v")
-            #keyboard.type(result)
-            
-        except Exception as e:
-            print(e)
-        finally:
-            await asyncio.sleep(0.03)
-            if original:
-                pyperclip.copy(original)
-            self._is_busy = False
-    
     async def _switch_register_async(self):
         print("switch register")
+        await self._convert_selection_async("case", self._case_variants)
 
+    async def _convert_selection_async(self, kind: str, get_variants: Callable[[str], list[tuple[str, int | None]]]):
+        # Копируем выделение, заменяем его первым вариантом и возвращаем прежний текст в буфер;
+        # каждый шаг заканчивается, как только приложение ответило, а не по фиксированной паузе
         if self._is_busy:
             return
 
+        cycle = self._cycle
+        if cycle is not None and cycle.kind == kind and time.monotonic() < cycle.deadline \
+                and cycle.window == self._layout_state.foreground_window:
+            await self._cycle_selection_async(cycle)
+            return
+        self._reset_cycle()
+
         self._is_busy = True
-        original: str | None = None
+        original: ClipboardSnapshot | None = None
+        copied: str | None = None
+        variants: list[tuple[str, int | None]] = []
+        pasted = False
 
         try:
-            original = pyperclip.paste()
-            #print("original", original)
-            
-            keyboard.release_key("left shift")
-            keyboard.release_key("right shift")
-            keyboard.release_key("left alt")
-            keyboard.release_key("right alt")
-            
-            keyboard.click_hotkey("ctrl+c")
-
-            await asyncio.sleep(0.03)
-
-            copied = pyperclip.paste()
-            print("copied", copied)
-
-            if not copied.strip() or original == copied:
-                self._is_busy = False
+            # Все форматы, а не только текст: после вставки пользователю возвращается и картинка, и HTML
+            original = await self._clipboard.snapshot()
+
+            copied = await self._clipboard.copy(lambda: keyboard.send(self._copy_sequence, "copy"))
+
+            if not copied or not copied.strip():
+                return
+
+            variants = get_variants(copied)
+            if not variants:
                 return
 
-            result = copied.swapcase()
+            result, layout = variants[0]
+            # Вставляется готовый текст, так что ждать применения раскладки окном не нужно
+            if layout is not None:
+                self._layout_state.set_layout(layout)
 
-            print("result", result)
+            pasted = await self._clipboard.paste(result, lambda: keyboard.send(self._paste_sequence, "paste"))
+            if not pasted:
+                print("[LayoutSwitcher] Paste was not confirmed in time")
 
-            pyperclip.copy(result)
-            await asyncio.sleep(0.03)
+        except Exception as e:
+            print(e)
+        finally:
+            # Буфер изменился, только если приложение что-то скопировало
+            if copied is not None and original is not None:
+                await self._clipboard.restore(original)
+            if pasted:
+                self._start_cycle(kind, variants, original)
+            self._is_busy = False
+
+    async def _cycle_selection_async(self, cycle: _ConversionCycle):
+        # Исходный текст уже известен: выделяем вставленный вариант и заменяем его следующим одной вставкой
+        self._is_busy = True
+        original = cycle.clipboard
+        pasted = False
 
-            keyboard.click_hotkey("ctrl+v")
-            # keyboard.type(result)
+        try:
+            if original is None or self._clipboard.backend.sequence_number() != cycle.clipboard_sequence:
+                original = await self._clipboard.snapshot()
+
+            previous = cycle.text
+            cycle.index = (cycle.index + 1) % len(cycle.variants)
+            result, layout = cycle.variants[cycle.index]
+            if layout is not None:
+                self._layout_state.set_layout(layout)
+
+            # Как и при копировании, сначала отпускаем зажатые shift/alt: alt+shift переключил бы язык
+            sequence = (InputSequence()
+                .release(keys.left_shift.vk).release(keys.right_shift.vk)
+                .release(keys.left_alt.vk).release(keys.right_alt.vk)
+                .select_left(cycle.caret_length(previous))
+                .extend(self._paste_sequence))
+            pasted = await self._clipboard.paste(result, lambda: keyboard.send(sequence, "cycle paste"))
+            if not pasted:
+                print("[LayoutSwitcher] Paste was not confirmed in time")
 
         except Exception as e:
             print(e)
         finally:
-            await asyncio.sleep(0.03)
-            if original:
-                pyperclip.copy(original)
+            if original is not None:
+                await self._clipboard.restore(original)
+            if pasted:
+                cycle.deadline = time.monotonic() + CYCLE_TIMEOUT
+                cycle.clipboard = original
+                cycle.clipboard_sequence = self._clipboard.backend.sequence_number()
+            else:
+                self._reset_cycle()
             self._is_busy = False
 
+    def _start_cycle(self, kind: str, variants: list[tuple[str, int | None]], original: ClipboardSnapshot | None):
+        if len(variants) < 2:
+            return
+
+        cycle = _ConversionCycle(kind, variants, self._layout_state.foreground_window)
+        cycle.clipboard = original
+        cycle.clipboard_sequence = self._clipboard.backend.sequence_number()
+        self._cycle = cycle
+
+        # Любой набор, навигация или клик между нажатиями — и вставленный текст уже не выделить
+        if self._cycle_key_hook_id is None:
+            self._cycle_key_hook_id = keyboard.hook(self._on_cycle_key)
+            self._cycle_mouse_hook_id = mouse.hook(self._on_cycle_click)
+            self._update_hooks()
+
+    def _reset_cycle(self):
+        self._cycle = None
+        if self._cycle_key_hook_id is not None:
+            keyboard.unhook(self._cycle_key_hook_id)
+            mouse.unhook(self._cycle_mouse_hook_id)
+            self._cycle_key_hook_id = None
+            self._cycle_mouse_hook_id = None
+        self._update_hooks()
+
+    def _on_cycle_key(self, e: KeyEvent):
+        cycle = self._cycle
+        if cycle is None or e.event_type != KeyEventType.PRESS or e.is_injected:
+            return
+        if e.key == keys.backspace or e.key in PRINTABLE_KEYS or e.key in WORD_BOUNDARY_KEYS:
+            if e.key.vk not in self._hotkey_vks.get(cycle.kind, ()):
+                self._app.call_soon_threadsafe(self._reset_cycle)
+
+    def _on_cycle_click(self, e: MouseEvent):
+        if self._cycle is not None and e.event_type == MouseEventType.PRESS:
+            self._app.call_soon_threadsafe(self._reset_cycle)
+
+    def _layout_variants(self, copied: str) -> list[tuple[str, int | None]]:
+        # Таблицы перестраиваются, только если изменился список раскладок
+        layouts = self._layout_state.layouts
+        if self._layout_tables.set_layouts(layouts):
+            self._word_scorer.reset()
+
+        # Из раскладок, в которых набирается текст, первой идёт та, после конвертации из которой текст
+        # правдоподобнее, и её следующая раскладка; дальше — остальные цели и источники по убыванию оценки
+        choices = self._layout_scorer.rank(copied, layouts, preferred=self._layout_state.layout)
+        if not choices:
+            return []
+
+        variants: list[tuple[str, int | None]] = []
+        seen = {copied}
+        for choice in choices:
+            start = layouts.index(choice.source)
+            for step in range(1, len(layouts)):
+                target = layouts[(start + step) % len(layouts)]
+                text = self._layout_tables.convert(copied, choice.source, target)
+                if text not in seen:
+                    seen.add(text)
+                    variants.append((text, target))
+
+        if variants:
+            variants.append((copied, choices[0].source))
+        return variants
+
+    @staticmethod
+    def _case_variants(copied: str) -> list[tuple[str, int | None]]:
+        variants: list[tuple[str, int | None]] = []
+        seen = {copied}
+        for text in (copied.swapcase(), copied.upper(), copied.lower(), copied.capitalize()):
+            if text not in seen:
+                seen.add(text)
+                variants.append((text, None))
+
+        if variants:
+            variants.append((copied, None))
+        return variants
+
     def _on_key(self, e: KeyEvent):
-        if config.layout_switch.last_hotkey.value:
+        if self._is_tracking_keys():
+            if e.event_type == KeyEventType.PRESS and not e.is_injected:
+                self._input_seq = e.seq
             self._app.call_soon_threadsafe(self._do_on_key, e)
 
     def _do_on_key(self, e: KeyEvent):
         if e.event_type == KeyEventType.RELEASE or self._is_busy or e.key == keys.pause:
             return
 
+        if e.is_injected:
+            if self._ignore_injected:
+                return
+        else:
+            self._ignore_injected = False
+
+        # Клавиша нажата раньше клика, который уже сбросил слово
+        if e.seq < self._reset_seq:
+            return
+
         if e.key == keys.backspace:
-            if len(self._keys) > 0:
-                self._keys.pop()
+            self._switched_words = 0
+            self._keys.pop()
+            self._word_scorer.pop()
             return
 
-        if self._just_switched_last:
-            self._just_switched_last = False
-            self._keys.clear()
+        if self._switched_words:
+            # Продолжение набора после переключения — уже новое слово
+            self._switched_words = 0
+            self._keys.mark_word_start()
+            self._word_scorer.clear()
 
-        if e.key in [keys.enter, keys.esc, keys.tab, keys.left, keys.right, keys.up, keys.down,
-                     keys.delete, keys.home, keys.end, keys.page_up, keys.page_down]:
-            self._keys.clear()
+        if e.key in WORD_BOUNDARY_KEYS:
+            self._clear_keys()
             return
         
+        if e.key == keys.space and config.layout_switch.auto_switch.value:
+            self._auto_switch(e.seq)
+
         if not config.layout_switch.consider_spaces.value and e.key == keys.space:
-            self._keys.clear()
+            self._clear_keys()
             return
         
         if self._is_printable(e.key):
             if keyboard.is_ctrl_pressed() or keyboard.is_alt_pressed():
-                self._keys.clear()  # это хоткей, не текст
+                self._clear_keys()  # это хоткей, не текст
                 return
 
             shift_pressed = keyboard.is_shift_pressed()
             caps_on = keyboard.get_caps_lock()
             shifted = (shift_pressed and not caps_on) or (not shift_pressed and caps_on)
-            self._keys.append(KeyStroke(vk=e.key.vk, shift=shifted))
+            self._keys.append(e.key.vk, shifted, e.seq)
+
+            if config.layout_switch.auto_switch.value:
+                if e.key == keys.space:
+                    self._word_scorer.clear()
+                else:
+                    if self._word_scorer.length == 0:
+                        self._update_layouts()
+                    self._word_scorer.push(e.key.vk, shifted)
     
+    def _clear_keys(self):
+        self._keys.clear()
+        self._word_scorer.clear()
+
+    def _auto_switch(self, seq: int):
+        # Пробел уже напечатан: перенабираем слово вместе с ним в раскладке, где слово явно правдоподобнее
+        length = self._word_scorer.length
+        target = self._word_scorer.suggest(self._layout_state.layout)
+        self._word_scorer.clear()
+        if target is None or length == 0 or length > len(self._keys):
+            return
+
+        keystrokes = self._keys.last(length) + [KeyStroke(vk=keys.space.vk)]
+        asyncio.create_task(self._switch_last_async(keystrokes, target, seq))
+
+    def _is_last_input(self, seq: int) -> bool:
+        # Пробел seq — последнее физическое нажатие, клика после него не было, и слово с ним — конец набранного
+        # (без consider_spaces пробел очищает буфер)
+        return self._input_seq == seq and self._reset_seq <= seq and self._keys.last_seq in (0, seq)
+
     def _on_click(self, e: MouseEvent):
-        if config.layout_switch.last_hotkey.value:
+        if self._is_tracking_keys():
+            if e.event_type != MouseEventType.RELEASE:
+                self._input_seq = e.seq
             self._app.call_soon_threadsafe(self._do_on_click, e)
         
     def _do_on_click(self, e: MouseEvent):
         if e.event_type == MouseEventType.RELEASE or self._is_busy:
             return
 
-        self._keys.clear()
+        # Клик сбрасывает только то, что набрано до него
+        self._reset_seq = max(self._reset_seq, e.seq)
+        self._keys.discard_before(e.seq)
+        self._switched_words = 0
+        self._word_scorer.clear()
     
     @staticmethod
     def _is_printable(key: Key) -> bool:
-        # 1. Буквы (a-z) и цифры верхнего ряда (0-9) → их name односимвольный
-        if len(key.name) == 1 or key == keys.space:
-            return True
-    
-        # 2. OEM-клавиши, которые печатают знаки препинания (их name — многосимвольный)
-        return key in [
-            keys.semicolon,         # ;
-            keys.equal,             # =
-            keys.comma,             # ,
-            keys.minus,             # -
-            keys.period,            # .
-            keys.slash,             # /
-            keys.backquote,         # `
-            keys.left_bracket,      # [
-            keys.backslash,         # \
-            keys.right_bracket,     # ]
-            keys.quote,             # '
-            # Цифровая клавиатура (печатает, если Num Lock включён)
-            keys.numpad_0,
-            keys.numpad_1,
-            keys.numpad_2,
-            keys.numpad_3,
-            keys.numpad_4,
-            keys.numpad_5,
-            keys.numpad_6,
-            keys.numpad_7,
-            keys.numpad_8,
-            keys.numpad_9,
-            keys.numpad_decimal,     # точка
-            keys.numpad_add,         # +
-            keys.numpad_subtract,    # -
-            keys.numpad_multiply,    # *
-            keys.numpad_divide,      # /
-        ]
\ No newline at end of file
+        return key in PRINTABLE_KEYS
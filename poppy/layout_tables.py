@@ -0,0 +1,220 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ctypes
+from ctypes import wintypes
+from typing import Callable, Iterable, Mapping, Sequence
+from .hooks import KeyStroke
+
+# Состояния модификаторов, в которых перебираются клавиши. Порядок — приоритет при обратном поиске:
+# символ, доступный и без Caps Lock, и с ним, сопоставляется состоянию без Caps Lock
+STATE_NONE = 0
+STATE_SHIFT = 1
+STATE_ALTGR = 2
+STATE_SHIFT_ALTGR = 3
+STATE_CAPS = 4
+STATE_SHIFT_CAPS = 5
+STATES = (STATE_NONE, STATE_SHIFT, STATE_CAPS, STATE_SHIFT_CAPS, STATE_ALTGR, STATE_SHIFT_ALTGR)
+
+# Не менять состояние клавиатуры ядра (в т.ч. мёртвые клавиши) — Windows 10 1607+
+TOUNICODE_NO_STATE_CHANGE = 0x4
+
+# Модификаторы, переключатели и кнопки мыши не дают символов
+_SKIP_VKS = frozenset((0x01, 0x02, 0x04, 0x05, 0x06, 0x10, 0x11, 0x12, 0x14, 0x90, 0x91,
+                       0xA0, 0xA1, 0xA2, 0xA3, 0xA4, 0xA5, 0x5B, 0x5C))
+
+KeyState = tuple[int, int]  # (vk, состояние)
+
+class LayoutTable:
+    """Все символы одной раскладки: (vk, состояние) → символ и обратно."""
+    __slots__ = ("_layout", "_chars", "_keys", "_charset")
+
+    def __init__(self, layout: int, chars: Mapping[KeyState, str]):
+        self._layout = layout
+        self._chars: dict[KeyState, str] = dict(chars)
+
+        keys: dict[str, KeyState] = {}
+        for state in STATES:
+            for (vk, key_state), char in self._chars.items():
+                if key_state == state:
+                    keys.setdefault(char, (vk, state))
+        self._keys = keys
+        self._charset = frozenset(keys)
+
+    @property
+    def layout(self) -> int:
+        return self._layout
+
+    @property
+    def chars(self) -> Mapping[KeyState, str]:
+        return self._chars
+
+    @property
+    def keys(self) -> Mapping[str, KeyState]:
+        return self._keys
+
+    @property
+    def charset(self) -> frozenset[str]:
+        return self._charset
+
+    def char(self, vk: int, state: int) -> str | None:
+        return self._chars.get((vk, state))
+
+    def keystroke(self, char: str) -> KeyStroke | None:
+        key = self._keys.get(char)
+        if key is None:
+            return None
+        vk, state = key
+        # Caps Lock в KeyStroke не выражается: для букв он эквивалентен Shift
+        shift = state in (STATE_SHIFT, STATE_SHIFT_ALTGR, STATE_CAPS)
+        altgr = state in (STATE_ALTGR, STATE_SHIFT_ALTGR)
+        return KeyStroke(vk=vk, shift=shift, ctrl=altgr, alt=altgr)
+
+    def to_snapshot(self) -> dict:
+        return {"layout": self._layout, "chars": [[vk, state, char] for (vk, state), char in self._chars.items()]}
+
+    @classmethod
+    def from_snapshot(cls, data: Mapping) -> "LayoutTable":
+        return cls(int(data["layout"]), {(int(vk), int(state)): char for vk, state, char in data["chars"]})
+
+    def __repr__(self):
+        return f"LayoutTable(layout={self._layout:#06x}, chars={len(self._chars)})"
+
+def load_layout_table(layout: int) -> LayoutTable:
+    """Перебирает все VK во всех состояниях через ToUnicodeEx — один раз на раскладку."""
+    user32 = ctypes.windll.user32
+    buffer = ctypes.create_unicode_buffer(8)
+    chars: dict[KeyState, str] = {}
+
+    for state in STATES:
+        keyboard_state = (wintypes.BYTE * 256)()
+        if state in (STATE_SHIFT, STATE_SHIFT_ALTGR, STATE_SHIFT_CAPS):
+            keyboard_state[0x10] = 0x80     # VK_SHIFT
+        if state in (STATE_ALTGR, STATE_SHIFT_ALTGR):
+            keyboard_state[0x11] = 0x80     # VK_CONTROL
+            keyboard_state[0x12] = 0x80     # VK_MENU
+        if state in (STATE_CAPS, STATE_SHIFT_CAPS):
+            keyboard_state[0x14] = 0x01     # VK_CAPITAL
+
+        for vk in range(1, 256):
+            if vk in _SKIP_VKS:
+                continue
+            result = user32.ToUnicodeEx(vk, 0, keyboard_state, buffer, len(buffer), TOUNICODE_NO_STATE_CHANGE, layout)
+            # < 0 — мёртвая клавиша, > 1 — лигатура; ни то, ни другое не годится для посимвольной замены
+            if result == 1 and buffer[0].isprintable():
+                chars[(vk, state)] = buffer[0]
+
+    return LayoutTable(layout, chars)
+
+def is_neutral_char(char: str) -> bool:
+    # Пробелы и управляющие символы есть в любой раскладке и не меняются при конвертации
+    return char.isspace() or not char.isprintable()
+
+class LayoutTables:
+    """
+    Таблицы раскладок и готовые таблицы str.translate для каждой пары раскладок. Пересобираются только при
+    изменении списка раскладок. Для проверок без Windows таблицы можно передать готовыми (LayoutTable.from_snapshot).
+    """
+    def __init__(self, tables: Iterable[LayoutTable] | None = None, loader: Callable[[int], LayoutTable] = load_layout_table):
+        self._loader = loader
+        self._tables: dict[int, LayoutTable] = {}
+        self._translations: dict[tuple[int, int], dict[int, str]] = {}
+        self._layouts: tuple[int, ...] = ()
+
+        if tables is not None:
+            tables = list(tables)
+            self._tables = {table.layout: table for table in tables}
+            self._layouts = tuple(table.layout for table in tables)
+            self._build_translations()
+
+    @property
+    def layouts(self) -> tuple[int, ...]:
+        return self._layouts
+
+    def set_layouts(self, layouts: Sequence[int]) -> bool:
+        """Возвращает True, если список изменился и таблицы пересобраны."""
+        layouts = tuple(layouts)
+        if layouts == self._layouts:
+            return False
+
+        tables = {}
+        for layout in layouts:
+            table = self._tables.get(layout)
+            if table is None:
+                try:
+                    table = self._loader(layout)
+                except Exception as e:
+                    print(f"[LayoutTables] Failed to load layout {layout:#06x}: {e}")
+                    continue
+            tables[layout] = table
+
+        self._tables = tables
+        self._layouts = layouts
+        self._build_translations()
+        return True
+
+    def invalidate(self):
+        self._tables.clear()
+        self._translations.clear()
+        self._layouts = ()
+
+    def table(self, layout: int) -> LayoutTable | None:
+        return self._tables.get(layout)
+
+    def translation(self, source: int, target: int) -> dict[int, str]:
+        return self._translations.get((source, target), {})
+
+    def candidates(self, text: str, layouts: Sequence[int] | None = None) -> list[int]:
+        """Раскладки, в которых набирается весь текст, в порядке списка раскладок."""
+        chars = {char for char in text if not is_neutral_char(char)}
+        if not chars:
+            return []
+
+        result = []
+        for layout in self._layouts if layouts is None else layouts:
+            table = self._tables.get(layout)
+            if table is not None and chars <= table.charset:
+                result.append(layout)
+        return result
+
+    def detect(self, text: str, layouts: Sequence[int] | None = None) -> int | None:
+        """Первая раскладка, в которой набирается весь текст (как раньше перебором VkKeyScanExW)."""
+        candidates = self.candidates(text, layouts)
+        return candidates[0] if candidates else None
+
+    def convert(self, text: str, source: int, target: int) -> str:
+        return text.translate(self.translation(source, target))
+
+    def keystrokes(self, text: str, layout: int) -> list[KeyStroke] | None:
+        table = self._tables.get(layout)
+        if table is None:
+            return None
+
+        result = []
+        for char in text:
+            keystroke = table.keystroke(char)
+            if keystroke is None:
+                return None
+            result.append(keystroke)
+        return result
+
+    def _build_translations(self):
+        translations = {}
+        for source, source_table in self._tables.items():
+            for target, target_table in self._tables.items():
+                if source == target:
+                    continue
+                translation = {}
+                for char, key in source_table.keys.items():
+                    converted = target_table.chars.get(key)
+                    if converted is not None and converted != char:
+                        translation[ord(char)] = converted
+                translations[(source, target)] = translation
+        self._translations = translations
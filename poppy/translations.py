@@ -31,6 +31,7 @@ class Translations():
         self._add_settings_translations()
         self._add_audio_switch_translations()
         self._add_layout_switch_translations()
+        self._add_diagnostics_translations()
         self._add_info_translations()
 
     @property
@@ -149,6 +150,7 @@ class Translations():
         # Громкость
         self.volume_enable = "volume_enable"
         self.volume_show_media = "volume_show_media"
+        self.volume_show_external = "volume_show_external"
         self.volume_step = "volume_step"
         self.volume_show_name = "volume_show_name"
         self.volume_full_name = "volume_full_name"
@@ -159,6 +161,9 @@ class Translations():
         self._add(self.lang_en, self.volume_show_media, "Also show media popup")
         self._add(self.lang_ru, self.volume_show_media, "Также показывать окно мультимедиа")
 
+        self._add(self.lang_en, self.volume_show_external, "Show when volume is changed by other apps")
+        self._add(self.lang_ru, self.volume_show_external, "Показывать при изменении громкости другими программами")
+
         self._add(self.lang_en, self.volume_step, "Volume change step via keys")
         self._add(self.lang_ru, self.volume_step, "Шаг изменения громкости клавишами")
 
@@ -301,6 +306,9 @@ class Translations():
         self.layout_switch_selected = "layout_switch_selected"
         self.layout_switch_case = "layout_switch_case"
         self.layout_switch_block_locks = "layout_switch_block_locks"
+        self.layout_switch_auto = "layout_switch_auto"
+        self.layout_switch_remember = "layout_switch_remember"
+        self.layout_switch_remember_process = "layout_switch_remember_process"
 
         self._add(self.lang_en, self.layout_switch_last, "Switch last typed word layout")
         self._add(self.lang_ru, self.layout_switch_last, "Смена раскладки последнего набранного слова")
@@ -319,7 +327,50 @@ class Translations():
         
         self._add(self.lang_en, self.layout_switch_block_locks, "Do not send Caps, Scroll, Num Lock and Insert to system in hotkeys")
         self._add(self.lang_ru, self.layout_switch_block_locks, "Не передавать системе Caps, Scroll, Num Lock и Insert в сочетаниях клавиш")
+
+        self._add(self.lang_en, self.layout_switch_auto, "Automatically fix words typed in the wrong layout")
+        self._add(self.lang_ru, self.layout_switch_auto, "Автоматически исправлять слова, набранные не в той раскладке")
+
+        self._add(self.lang_en, self.layout_switch_remember, "Remember layout for each window")
+        self._add(self.lang_ru, self.layout_switch_remember, "Запоминать раскладку для каждого окна")
+
+        self._add(self.lang_en, self.layout_switch_remember_process, "One layout for all windows of an application")
+        self._add(self.lang_ru, self.layout_switch_remember_process, "Одна раскладка для всех окон программы")
         
+    def _add_diagnostics_translations(self):
+        self.diagnostics_group = "diagnostics_group"
+        self.diagnostics_profiling = "diagnostics_profiling"
+        self.diagnostics_timeout = "diagnostics_timeout"
+        self.diagnostics_warning = "diagnostics_warning"
+        self.diagnostics_no_warnings = "diagnostics_no_warnings"
+        self.diagnostics_source = "diagnostics_source"
+        self.diagnostics_subscriber = "diagnostics_subscriber"
+        self.diagnostics_calls = "diagnostics_calls"
+
+        self._add(self.lang_en, self.diagnostics_group, "Diagnostics")
+        self._add(self.lang_ru, self.diagnostics_group, "Диагностика")
+
+        self._add(self.lang_en, self.diagnostics_profiling, "Measure keyboard and mouse hook latency")
+        self._add(self.lang_ru, self.diagnostics_profiling, "Замерять время обработки хуков клавиатуры и мыши")
+
+        self._add(self.lang_en, self.diagnostics_timeout, "System hook timeout:")
+        self._add(self.lang_ru, self.diagnostics_timeout, "Системный тайм-аут хука:")
+
+        self._add(self.lang_en, self.diagnostics_warning, "Slow hook:")
+        self._add(self.lang_ru, self.diagnostics_warning, "Медленный хук:")
+
+        self._add(self.lang_en, self.diagnostics_no_warnings, "No slow hooks")
+        self._add(self.lang_ru, self.diagnostics_no_warnings, "Медленных хуков нет")
+
+        self._add(self.lang_en, self.diagnostics_source, "Source")
+        self._add(self.lang_ru, self.diagnostics_source, "Источник")
+
+        self._add(self.lang_en, self.diagnostics_subscriber, "Subscriber")
+        self._add(self.lang_ru, self.diagnostics_subscriber, "Подписчик")
+
+        self._add(self.lang_en, self.diagnostics_calls, "Calls")
+        self._add(self.lang_ru, self.diagnostics_calls, "Вызовы")
+
     def _add_info_translations(self):
         # О приложении
         self.about_title = "about_title"
@@ -384,6 +435,8 @@ class Translations():
                   )
         self._add(self.lang_ru, self.help_volume,
                   "• Окно громкости появляется при изменении уровня звука с клавиатуры.\n"
+                  "• Открытое окно следит за громкостью, даже если её меняют микшер Windows, другие программы или регулятор на устройстве; "
+                  "при желании окно может появляться и на такие изменения.\n"
                   "• Можно отображать имя аудиоустройства: краткое (например, «Динамики») или полное (например, «Динамики(Realtek)»).\n"
                   "• «шаг громкости» определяет, на сколько процентов меняется звук за одно нажатие."
                   )
@@ -404,9 +457,12 @@ class Translations():
                   )
         self._add(self.lang_ru, self.help_layout_switch,
                   "• Можно переключить раскладку последнего слова.\n"
+                  "• Если учитываются пробелы, повторное нажатие добавляет предыдущее слово, пока не будет переключена вся фраза.\n"
                   "• Можно выбрать опцию, чтобы раскладка переключалась, даже если нет последнего слова.\n"
                   "• Можно переключить раскладку выделенного текста, только если в нем символы одного языка.\n"
                   "• Можно переключить регистр выделенного текста.\n"
+                  "• Повторное нажатие в течение нескольких секунд перебирает другие раскладки (или варианты регистра) и возвращает исходный текст.\n"
+                  "• Можно запоминать раскладку для каждого окна или программы — она восстановится при переключении на окно.\n"
                   )
         self._add(self.lang_ru, self.help_tips,
                   "💡 Советы:\n"
@@ -437,6 +493,8 @@ class Translations():
                   )
         self._add(self.lang_en, self.help_volume,
                   "• The volume popup appears when adjusting sound level using the keyboard.\n"
+                  "• An open popup follows the volume even when it is changed by the Windows mixer, other apps or a knob on the device; "
+                  "optionally the popup can appear on such changes too.\n"
                   "• You can display the audio device name: short (e.g., 'Speakers') or full (e.g., 'Speakers (Realtek)').\n"
                   "• 'volume step' defines how many percent the volume changes per key press."
                   )
@@ -457,9 +515,12 @@ class Translations():
                   )
         self._add(self.lang_en, self.help_layout_switch,
                   "• You can switch the keyboard layout of the last word.\n"
+                  "• If spaces are considered, pressing the hotkey again adds the previous word until the whole phrase is switched.\n"
                   "• You can enable an option to switch the layout even if there is no last word.\n"
                   "• You can switch the layout of selected text, but only if it contains characters from a single language.\n"
-                  "• You can toggle the case of selected text.\n")
+                  "• You can toggle the case of selected text.\n"
+                  "• Pressing the hotkey again within a few seconds cycles through other layouts (or case variants) and back to the original text.\n"
+                  "• You can remember the layout for each window or application — it is restored when the window is activated.\n")
         self._add(self.lang_en, self.help_tips,
                   "💡 Tips:\n"
                   "• To clear a hotkey, press Esc in the input field.\n"
@@ -22,8 +22,14 @@ class TrayManager:
         self._app = App.instance()
         
         self._tray_icon: Optional[QSystemTrayIcon] = None
+        # Пункты подменю аудиоустройств по id устройства
+        self._audio_actions: dict[str, QAction] = {}
 
         self._create_tray_icon()
+
+        # Меню обновляется по изменениям каталога устройств и только в отличающихся пунктах
+        self._app.audio_manager.devices_changed.connect(self._update_audio_menu)
+        self._app.audio_manager.volume_state_changed.connect(self._on_volume_state_changed)
         
         self._update_text()
         loc.language_changed.connect(self._update_text)
@@ -68,38 +74,56 @@ class TrayManager:
         if not should_show:
             return
     
-        # Очищаем старые действия
-        self.audio_menu.clear()
-    
         # Получаем устройства и настройки
         devices = self._app.audio_manager.get_all_output_devices()
         switch_devices = config.audio_switch.devices.value
 
         switch_devices_enables = {dev["id"]: dev["on"] for dev in switch_devices}
-    
-        for device in devices:
+        if config.audio_switch.select.value:
+            devices = [device for device in devices if switch_devices_enables.get(device["id"], False)]
+
+        # Убираем пункты устройств, которых больше нет в списке
+        device_ids = {device["id"] for device in devices}
+        for device_id in [device_id for device_id in self._audio_actions if device_id not in device_ids]:
+            action = self._audio_actions.pop(device_id)
+            self.audio_menu.removeAction(action)
+            action.deleteLater()
+
+        current_id = self._app.audio_manager.get_device_id()
+        for index, device in enumerate(devices):
             device_id = device["id"]
-            
-            if config.audio_switch.select.value and not switch_devices_enables.get(device_id, False):
-                continue
     
             device_name = device["name"]
             if not config.audio_switch.tray_full_name.value:
                 device_name = Utils.strip_audio_name(device_name)
-            action = QAction(device_name, self.audio_menu)
-            action.setCheckable(True)
-            try:
-                if self._app.audio_manager.get_device_name() == device["name"]:
-                    action.setChecked(True)
-            except Exception as e:
-                print(f"Ошибка получения имени устройства: {e}")
-    
-            # Важно: захватываем device_id правильно
-            action.triggered.connect(lambda checked, dev_id=device_id: self._on_audio_switch(dev_id))
-    
-            self.audio_menu.addAction(action)
 
-        self.audio_menu_action.setVisible(len(self.audio_menu.actions()) > 0)
+            action = self._audio_actions.get(device_id)
+            if action is None:
+                action = QAction(device_name, self.audio_menu)
+                action.setCheckable(True)
+                # Важно: захватываем device_id правильно
+                action.triggered.connect(lambda checked, dev_id=device_id: self._on_audio_switch(dev_id))
+                self._audio_actions[device_id] = action
+            elif action.text() != device_name:
+                action.setText(device_name)
+
+            # Порядок — как у системы; переставляем только пункт не на своём месте
+            actions = self.audio_menu.actions()
+            if index >= len(actions) or actions[index] is not action:
+                self.audio_menu.removeAction(action)
+                actions = self.audio_menu.actions()
+                self.audio_menu.insertAction(actions[index] if index < len(actions) else None, action)
+
+            checked = device_id == current_id
+            if action.isChecked() != checked:
+                action.setChecked(checked)
+
+        self.audio_menu_action.setVisible(len(self._audio_actions) > 0)
+
+    def _on_volume_state_changed(self, state, external: bool):
+        # Сменилось устройство по умолчанию — переносим отметку
+        if not external:
+            self._update_audio_menu()
 
     def _on_audio_switch(self, device_id):
         try:
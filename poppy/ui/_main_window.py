@@ -5,6 +5,7 @@ from poppy.ui.fluent import Label, FluentMainWindow, NavigationView, Font
 from poppy.translations import localizer as loc, translations as trans
 from poppy.ui.fluent import NavigationViewItem
 from poppy.ui.pages import GeneralPage, KeyboardPage, VolumePage, MultimediaPage, HelpPage, AudioSwitchPage, LayoutSwitchPage
+from poppy.ui.pages import DiagnosticsPage
 from poppy.ui.pages import AboutPage
 from poppy.utils import Utils
 from poppy.app_info import app_name
@@ -60,6 +61,9 @@ class MainWindow(FluentMainWindow):
         self._layout_switch = NavigationViewItem(LayoutSwitchPage, "Переключение раскладки", QIcon(Utils.load_icon("icons/layout_switch.png")))
         self._navigation.addItem(self._layout_switch)
         
+        self._diagnostics = NavigationViewItem(DiagnosticsPage, "Диагностика", QIcon(Utils.load_icon("icons/settings.png")))
+        self._navigation.addFooterItem(self._diagnostics)
+        
         self._help = NavigationViewItem(HelpPage, "Справка", QIcon(Utils.load_icon("icons/help.png")))
         self._navigation.addFooterItem(self._help)
          
@@ -73,6 +77,7 @@ class MainWindow(FluentMainWindow):
         self._general.setText(f"  {loc.tr(trans.general_group)}")
         self._audio_switch.setText(f"  {loc.tr(trans.audio_switch_group)}")
         self._layout_switch.setText(f"  {loc.tr(trans.layout_switch_group)}")
+        self._diagnostics.setText(f"  {loc.tr(trans.diagnostics_group)}")
         self._help.setText(f"  {loc.tr(trans.help_title)}")
         self._about.setText(f"  {loc.tr(trans.about_title)}")
         
@@ -4,6 +4,7 @@ from ._multimedia_page import MultimediaPage
 from ._general_page import GeneralPage
 from ._audio_switch_page import AudioSwitchPage
 from ._layout_switch_page import LayoutSwitchPage
+from ._diagnostics_page import DiagnosticsPage
 from ._about_page import AboutPage
 from ._help_page import HelpPage
 
@@ -7,6 +7,14 @@ from poppy.ui.fluent import Label, Font, Widget, Card, Toggle
 from poppy.translations import localizer as loc, translations as trans
 
 
+class _DeviceItem:
+    def __init__(self, card: Card, toggle: Toggle, label: Label, combo_box: QComboBox):
+        self.card = card
+        self.toggle = toggle
+        self.label = label
+        self.combo_box = combo_box
+
+
 class AudioDeviceSelector(QWidget):
     deviceChanged = pyqtSignal(dict)
 
@@ -14,7 +22,10 @@ class AudioDeviceSelector(QWidget):
         super().__init__()
 
         self._mic_text = "не менять микрофон"
-        self._combo_boxes = []
+        # Карточки по id устройства вывода; при обновлении списка пересоздаются только изменившиеся
+        self._items: dict[str, _DeviceItem] = {}
+        self._input_ids: list[str] = []
+        self._input_names: list[str] = []
         
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -29,7 +40,11 @@ class AudioDeviceSelector(QWidget):
         self._scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self._scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 
-        self._layout = QVBoxLayout()
+        scroll_content = Widget()
+        self._layout = QVBoxLayout(scroll_content)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.addStretch()
+        self._scroll_area.setWidget(scroll_content)
 
         main_layout.addWidget(self._scroll_area)
     
@@ -38,93 +53,103 @@ class AudioDeviceSelector(QWidget):
 
     def setMicText(self, text: str):
         self._mic_text = text
-        for combo in self._combo_boxes:
-            if combo.count() > 0:
-                combo.setItemText(0, text)
+        for item in self._items.values():
+            if item.combo_box.count() > 0:
+                item.combo_box.setItemText(0, text)
     
     def setDevices(self, output_devices, input_devices, settings):
-        old_widget = self._scroll_area.widget()
-        if old_widget:
-            old_widget.deleteLater()
-
-        self._combo_boxes.clear()
-        
-        scroll_content = Widget()
-        self._layout = QVBoxLayout(scroll_content)
-        self._layout.setContentsMargins(0, 0, 0, 0)
-        self._scroll_area.setWidget(scroll_content)
-
         # Создаём словарь для быстрого поиска по device_id
         bindings_dict = {item["id"]: item for item in settings}
 
-        input_device_names = [d["name"] for d in input_devices]
-        input_device_ids = [d["id"] for d in input_devices]
-
-        for device in output_devices:
-            card = Card()
-
-            item_layout = QHBoxLayout()
-            item_layout.setContentsMargins(0, 0, 0, 0)
-            item_layout.setSpacing(8)
-
-            toggle = Toggle()
-            item_layout.addWidget(toggle)
-
-            label = Label(device["name"])
-            item_layout.addWidget(label)
-            
-            item_layout.addStretch()
-            
-            combo_box = QComboBox()
-            combo_box.addItem(self._mic_text)
-            combo_box.addItems(input_device_names)
-            item_layout.addWidget(combo_box)
-            
-            self._combo_boxes.append(combo_box)
-            
-            content = Widget()
-            content.setLayout(item_layout)
-
-            card.setHeader(content)
-
-            self._layout.addWidget(card)
-
-            # Настройка состояния чекбокса
-            binding = bindings_dict.get(device["id"])
-            if binding is not None:
-                toggle.setChecked(bool(binding.get("on", False)))
-
-                # Настройка комбобокса: выбираем привязанный микрофон
-                mic_id = binding.get("mic")
-                if mic_id is not None:
-                    try:
-                        # Находим индекс микрофона по его ID
-                        mic_index = input_device_ids.index(mic_id)
-                        combo_box.setCurrentIndex(mic_index + 1)  # +1 из-за "не менять микрофон"
-                    except ValueError:
-                        # Микрофон не найден в списке — оставляем "не менять"
-                        combo_box.setCurrentIndex(0)
-                else:
-                    combo_box.setCurrentIndex(0)
-            else:
-                toggle.setChecked(False)
-                combo_box.setCurrentIndex(0)
-
-            # noinspection PyDefaultArgument
-            def on_change(_, checkbox=toggle, combobox=combo_box, device_id=device["id"], input_ids=input_device_ids):
-                is_enabled = checkbox.isChecked()
-                m_id = None
-                if is_enabled:
-                    idx = combobox.currentIndex()
-                    if idx > 0:  # не "не менять микрофон"
-                        m_id = input_ids[idx - 1]
-                self.deviceChanged.emit({"id": device_id, "on": is_enabled, "mic": m_id})
-
-            # Подключаем оба события
-            toggle.toggled.connect(on_change)
-            combo_box.currentIndexChanged.connect(on_change)
-
-        self._layout.addStretch()
+        input_ids = [d["id"] for d in input_devices]
+        input_names = [d["name"] for d in input_devices]
+        inputs_changed = input_ids != self._input_ids or input_names != self._input_names
+        self._input_ids = input_ids
+        self._input_names = input_names
+
+        output_ids = {device["id"] for device in output_devices}
+        for device_id in [device_id for device_id in self._items if device_id not in output_ids]:
+            item = self._items.pop(device_id)
+            self._layout.removeWidget(item.card)
+            item.card.deleteLater()
+
+        for index, device in enumerate(output_devices):
+            item = self._items.get(device["id"])
+            if item is None:
+                item = self._create_item(device["id"], device["name"])
+                self._items[device["id"]] = item
+                self._layout.insertWidget(index, item.card)
+                self._apply_binding(item, bindings_dict.get(device["id"]))
+                continue
+
+            if item.label.text() != device["name"]:
+                item.label.setText(device["name"])
+            if self._layout.indexOf(item.card) != index:
+                self._layout.removeWidget(item.card)
+                self._layout.insertWidget(index, item.card)
+            if inputs_changed:
+                self._update_inputs(item, bindings_dict.get(device["id"]))
+
+    def _create_item(self, device_id: str, name: str) -> _DeviceItem:
+        card = Card()
+
+        item_layout = QHBoxLayout()
+        item_layout.setContentsMargins(0, 0, 0, 0)
+        item_layout.setSpacing(8)
+
+        toggle = Toggle()
+        item_layout.addWidget(toggle)
+
+        label = Label(name)
+        item_layout.addWidget(label)
+        
+        item_layout.addStretch()
+        
+        combo_box = QComboBox()
+        combo_box.addItem(self._mic_text)
+        combo_box.addItems(self._input_names)
+        item_layout.addWidget(combo_box)
+        
+        content = Widget()
+        content.setLayout(item_layout)
+
+        card.setHeader(content)
+
+        def on_change(_):
+            is_enabled = toggle.isChecked()
+            m_id = None
+            if is_enabled:
+                idx = combo_box.currentIndex()
+                if 0 < idx <= len(self._input_ids):  # не "не менять микрофон"
+                    m_id = self._input_ids[idx - 1]
+            self.deviceChanged.emit({"id": device_id, "on": is_enabled, "mic": m_id})
+
+        # Подключаем оба события
+        toggle.toggled.connect(on_change)
+        combo_box.currentIndexChanged.connect(on_change)
+        return _DeviceItem(card, toggle, label, combo_box)
+
+    def _apply_binding(self, item: _DeviceItem, binding: dict | None):
+        # Настройка состояния чекбокса
+        item.toggle.blockSignals(True)
+        item.toggle.setChecked(bool(binding.get("on", False)) if binding is not None else False)
+        item.toggle.blockSignals(False)
+        self._select_mic(item, binding.get("mic") if binding is not None else None)
+
+    def _update_inputs(self, item: _DeviceItem, binding: dict | None):
+        item.combo_box.blockSignals(True)
+        item.combo_box.clear()
+        item.combo_box.addItem(self._mic_text)
+        item.combo_box.addItems(self._input_names)
+        item.combo_box.blockSignals(False)
+        self._select_mic(item, binding.get("mic") if binding is not None else None)
+
+    def _select_mic(self, item: _DeviceItem, mic_id: str | None):
+        # Настройка комбобокса: выбираем привязанный микрофон; не найден — оставляем "не менять"
+        index = self._input_ids.index(mic_id) + 1 if mic_id in self._input_ids else 0  # +1 из-за "не менять микрофон"
+        item.combo_box.blockSignals(True)
+        item.combo_box.setCurrentIndex(index)
+        item.combo_box.blockSignals(False)
         
 
 class AudioSwitchPage(BasePage):
@@ -189,12 +214,17 @@ class AudioSwitchPage(BasePage):
         Binding.bool(self._select_audio_labeled.switch(), config.audio_switch.select)
 
         from poppy.app import App
+        self._audio_manager = App.instance().audio_manager
+        self._update_devices()
+        self._audio_selector.deviceChanged.connect(config.audio_switch.devices.save_device)
+        self._audio_manager.devices_changed.connect(self._update_devices)
+
+    def _update_devices(self):
         self._audio_selector.setDevices(
-            App.instance().audio_manager.get_all_output_devices(),
-            App.instance().audio_manager.get_all_input_devices(),
+            self._audio_manager.get_all_output_devices(),
+            self._audio_manager.get_all_input_devices(),
             config.audio_switch.devices.value
         )
-        self._audio_selector.deviceChanged.connect(config.audio_switch.devices.save_device)
 
     def _update_text(self):
         self._title.setText(loc.tr(trans.audio_switch_title))
@@ -0,0 +1,113 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+from ._base_page import BasePage
+from poppy.ui import LabeledSwitchTr, Binding
+from poppy.config import config
+from poppy.ui.fluent import Label, Card, Widget
+from poppy.translations import localizer as loc, translations as trans
+
+
+class DiagnosticsPage(BasePage):
+    def __init__(self):
+        super().__init__()
+
+        # Таблица обновляется, только пока страница видна
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self._refresh)
+
+    def _create_content(self, layout: QVBoxLayout):
+        from poppy.app import App
+        self._diagnostics = App.instance().hook_diagnostics
+
+        self._profiling_label = Label("Замерять время обработки хуков")
+        self._profiling_labeled = LabeledSwitchTr()
+        self._profiling_card = Card(self._profiling_label, self._profiling_labeled)
+        layout.addWidget(self._profiling_card)
+
+        self._timeout_label = Label()
+        self._warning_label = Label()
+
+        self._reset_btn = QPushButton()
+        self._reset_btn.setText("Сбросить")
+        self._reset_btn.setFixedHeight(31)
+        self._reset_btn.clicked.connect(self._reset)
+
+        status_layout = QVBoxLayout()
+        status_layout.setContentsMargins(0, 0, 0, 0)
+        status_layout.addWidget(self._timeout_label)
+        status_layout.addWidget(self._warning_label)
+        status_widget = Widget()
+        status_widget.setLayout(status_layout)
+
+        reset_layout = QHBoxLayout()
+        reset_layout.setContentsMargins(0, 0, 0, 0)
+        reset_layout.addWidget(self._reset_btn)
+        reset_widget = Widget()
+        reset_widget.setLayout(reset_layout)
+
+        self._status_card = Card(status_widget, reset_widget)
+        layout.addWidget(self._status_card)
+
+        self._table = QTableWidget(0, 6)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self._table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self._table.setMinimumHeight(240)
+        layout.addWidget(self._table)
+
+    def _bind(self):
+        Binding.bool(self._profiling_labeled.switch(), config.diagnostics.profiling)
+
+    def _update_text(self):
+        self._profiling_label.setText(loc.tr(trans.diagnostics_profiling))
+        self._timeout_label.setText(f"{loc.tr(trans.diagnostics_timeout)} {self._diagnostics.timeout_ms} ms")
+        self._reset_btn.setText(loc.tr(trans.clear_btn))
+        self._table.setHorizontalHeaderLabels([
+            loc.tr(trans.diagnostics_source),
+            loc.tr(trans.diagnostics_subscriber),
+            loc.tr(trans.diagnostics_calls),
+            "p50, µs",
+            "p99, µs",
+            "max, µs",
+        ])
+        self._update_warning()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def _reset(self):
+        self._diagnostics.reset()
+        self._refresh()
+
+    def _update_warning(self):
+        warning = self._diagnostics.last_warning
+        if warning is None:
+            self._warning_label.setText(loc.tr(trans.diagnostics_no_warnings))
+        else:
+            self._warning_label.setText(f"{loc.tr(trans.diagnostics_warning)} {warning}")
+
+    def _refresh(self):
+        self._update_warning()
+
+        entries = [(source, entry) for source, entry in self._diagnostics.entries() if entry.count]
+        self._table.setRowCount(len(entries))
+        for row, (source, entry) in enumerate(entries):
+            values = (
+                source,
+                entry.label,
+                str(entry.count),
+                f"{entry.p50_ns / 1000:.1f}",
+                f"{entry.p99_ns / 1000:.1f}",
+                f"{entry.max_ns / 1000:.1f}",
+            )
+            for column, value in enumerate(values):
+                self._table.setItem(row, column, QTableWidgetItem(value))
@@ -33,6 +33,22 @@ class LayoutSwitchPage(BasePage):
         self._change_language_card.setIdent(1)
         layout.addWidget(self._change_language_card)
 
+        self._auto_switch_label = Label("Автоматически исправлять раскладку")
+        self._auto_switch_labeled = LabeledSwitchTr()
+        self._auto_switch_card = Card(self._auto_switch_label, self._auto_switch_labeled)
+        layout.addWidget(self._auto_switch_card)
+
+        self._remember_label = Label("Запоминать раскладку для каждого окна")
+        self._remember_labeled = LabeledSwitchTr()
+        self._remember_card = Card(self._remember_label, self._remember_labeled)
+        layout.addWidget(self._remember_card)
+
+        self._remember_process_label = Label("Одна раскладка для всех окон программы")
+        self._remember_process_labeled = LabeledSwitchTr()
+        self._remember_process_card = Card(self._remember_process_label, self._remember_process_labeled)
+        self._remember_process_card.setIdent(1)
+        layout.addWidget(self._remember_process_card)
+
         self._selected_hotkey_label = Label("Смена выделенного текста")
         self._selected_hotkey_labeled = LabeledSwitchTr()
         self._selected_hotkey_card = Card(self._selected_hotkey_label, self._selected_hotkey_labeled)
@@ -57,6 +73,7 @@ class LayoutSwitchPage(BasePage):
         # layout.addWidget(self._block_lock_card)
         
         self.link_switch(self._last_hotkey_labeled.switch(), [self._last_hotkey_value_card, self._consider_space_card, self._change_language_card])
+        self.link_switch(self._remember_labeled.switch(), self._remember_process_card)
         self.link_switch(self._selected_hotkey_labeled.switch(), self._selected_hotkey_value_card)
         self.link_switch(self._case_hotkey_labeled.switch(), self._case_hotkey_value_card)
 
@@ -65,6 +82,9 @@ class LayoutSwitchPage(BasePage):
         Binding.bool(self._consider_space_labeled.switch(), config.layout_switch.consider_spaces)
         Binding.bool(self._last_hotkey_labeled.switch(), config.layout_switch.last)
         Binding.bool(self._change_language_labeled.switch(), config.layout_switch.no_last_switch)
+        Binding.bool(self._auto_switch_labeled.switch(), config.layout_switch.auto_switch)
+        Binding.bool(self._remember_labeled.switch(), config.layout_switch.remember_layout)
+        Binding.bool(self._remember_process_labeled.switch(), config.layout_switch.remember_per_process)
         Binding.bool(self._selected_hotkey_labeled.switch(), config.layout_switch.selected)
         Binding.str(self._selected_hotkey_value_card.hotkeyEdit(), config.layout_switch.selected_hotkey)
         Binding.bool(self._case_hotkey_labeled.switch(), config.layout_switch.case)
@@ -76,6 +96,9 @@ class LayoutSwitchPage(BasePage):
         self._last_hotkey_label.setText(loc.tr(trans.layout_switch_last))
         self._consider_space_label.setText(loc.tr(trans.layout_switch_spaces))
         self._change_language_label.setText(loc.tr(trans.layout_switch_if_no_last))
+        self._auto_switch_label.setText(loc.tr(trans.layout_switch_auto))
+        self._remember_label.setText(loc.tr(trans.layout_switch_remember))
+        self._remember_process_label.setText(loc.tr(trans.layout_switch_remember_process))
         self._selected_hotkey_label.setText(loc.tr(trans.layout_switch_selected))
         self._case_hotkey_label.setText(loc.tr(trans.layout_switch_case))
         #self._block_locks_label.setText(loc.tr(trans.layout_switch_block_locks))
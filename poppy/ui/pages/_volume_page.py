@@ -38,6 +38,11 @@ class VolumePage(BasePage):
         self._show_media_card = Card(self._show_media_label, self._show_media_labeled)
         content_layout.addWidget(self._show_media_card)
 
+        self._show_external_label = Label("Показывать при изменении громкости другими программами")
+        self._show_external_labeled = LabeledSwitchTr()
+        self._show_external_card = Card(self._show_external_label, self._show_external_labeled)
+        content_layout.addWidget(self._show_external_card)
+
         self._step_label = Label("Шаг громкости клавишами")
         self._step_slider = StepSlider()
         self._step_slider.setRange(1, 10)
@@ -83,6 +88,7 @@ class VolumePage(BasePage):
         Binding.position(self._position_grid, config.volume_window.position)
         Binding.bool(self._enable_labeled.switch(), config.volume_window.enable)
         Binding.bool(self._show_media_labeled.switch(), config.volume_window.show_media)
+        Binding.bool(self._show_external_labeled.switch(), config.volume_window.show_external)
         Binding.int(self._step_slider, config.volume_window.step)
         Binding.bool(self._show_name_labeled.switch(), config.volume_window.show_name)
         Binding.bool(self._full_name_labeled.switch(), config.volume_window.full_name)
@@ -92,6 +98,7 @@ class VolumePage(BasePage):
     def _update_text(self):
         self._enable_label.setText(loc.tr(trans.volume_enable))
         self._show_media_label.setText(loc.tr(trans.volume_show_media))
+        self._show_external_label.setText(loc.tr(trans.volume_show_external))
         self._step_label.setText(loc.tr(trans.volume_step))
         self._show_name_label.setText(loc.tr(trans.volume_show_name))
         self._full_name_label.setText(loc.tr(trans.volume_full_name))
@@ -35,6 +35,7 @@ class VolumePopup(BasePopup):
         self._slider = QSlider(Qt.Orientation.Horizontal)
         self._slider.setRange(0, 100)
         self._slider.valueChanged.connect(self._on_slider_change)
+        self._slider.sliderReleased.connect(self._on_slider_released)
 
         # Текст громкости справа
         self._volume_label = QLabel("0")
@@ -92,16 +93,18 @@ class VolumePopup(BasePopup):
         self._update_icon_by_volume(self._slider.value(), mute)
     
     def _on_slider_change(self, value):
-        self._app.audio_manager.set_volume(value)
+        # При перетаскивании valueChanged приходит на каждый пиксель — в устройство пишется не чаще раза за кадр
+        self._app.audio_manager.request_volume(value)
         self._volume_label.setText(str(value))
         self._update_icon_by_volume(value, False)
+
+    def _on_slider_released(self):
+        self._app.audio_manager.flush_volume()
     
     def show_popup(self, device_changed: bool = False):
         if not config.volume_window.enable.value:
             return
         
-        volume = self._app.audio_manager.get_volume()
-
         show_name = config.volume_window.show_name.value or device_changed
         if not self.isVisible() or device_changed:
             self._window_height = (self._origin_height + 20) if show_name else self._origin_height
@@ -109,14 +112,28 @@ class VolumePopup(BasePopup):
             self._update_device_name()
             self._device_label.setVisible(show_name)
         
+        # Громкость берётся из состояния AudioManager, без обращения к устройству
+        self._update_volume()
+
+        self._show_popup()
+
+    def update_state(self, device_changed: bool = False):
+        """Перерисовать открытое окно после изменения громкости или устройства извне."""
+        if not self.isVisible():
+            return
+        if device_changed:
+            self._update_device_name()
+        self._update_volume()
+
+    def _update_volume(self):
+        volume = self._app.audio_manager.get_volume()
+
         self._slider.blockSignals(True)
         self._slider.setValue(volume)
         self._slider.blockSignals(False)
-        
+
         self._volume_label.setText(f"{volume}")
         self._update_icon_by_volume(volume, self._app.audio_manager.get_mute())
-
-        self._show_popup()
             
     def _get_duration(self):
         return config.volume_window.duration.value \
@@ -0,0 +1,62 @@
+# Copyright (C) 2025 exviper86
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+class VolumeCommand:
+    """
+    Накопленные за кадр команды громкости, сведённые в одну запись на устройство.
+    Шаги (клавиши, колесо) складываются, абсолютное значение (ползунок) отменяет шаги до него.
+    Любое изменение громкости снимает mute, как и раньше; переключение mute учитывает порядок команд.
+    """
+    def __init__(self):
+        self.target: int | None = None
+        self.steps = 0
+        # Итоговый mute, если его задала команда громкости; иначе — переключить ли текущий
+        self.mute: bool | None = None
+        self.toggle_mute = False
+        self.show_popup = False
+        self.count = 0
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def add_steps(self, steps: int):
+        self.steps += steps
+        self.mute = False
+        self.toggle_mute = False
+        self.count += 1
+
+    def set_volume(self, volume: int):
+        self.target = volume
+        self.steps = 0
+        self.mute = False
+        self.toggle_mute = False
+        self.count += 1
+
+    def add_toggle_mute(self):
+        if self.mute is not None:
+            self.mute = not self.mute
+        else:
+            self.toggle_mute = not self.toggle_mute
+        self.count += 1
+
+    def apply(self, volume: int, mute: bool, step: int) -> tuple[int, bool]:
+        """Громкость (0..100) и mute после всех команд, начиная с текущих."""
+        if self.target is not None:
+            volume = self.target
+        if self.steps:
+            # Клавиши выравнивают громкость по шагу, как прежний volume_up/volume_down
+            volume = int(round(volume / step) * step) + self.steps * step
+        volume = max(0, min(100, volume))
+
+        if self.mute is not None:
+            mute = self.mute
+        elif self.toggle_mute:
+            mute = not mute
+        return volume, mute
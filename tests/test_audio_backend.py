@@ -0,0 +1,54 @@
+from poppy.audio_backend import AudioDeviceInfo, DeviceCatalog, EndpointCache, FakeAudioBackend, FLOW_CAPTURE
+
+def make_backend() -> FakeAudioBackend:
+    return FakeAudioBackend([AudioDeviceInfo("speakers", "Speakers"), AudioDeviceInfo("hdmi", "HDMI"),
+                             AudioDeviceInfo("mic", "Microphone", FLOW_CAPTURE)])
+
+def make_catalog(backend: FakeAudioBackend) -> DeviceCatalog:
+    catalog = DeviceCatalog(backend)
+    backend.set_device_listener(catalog.mark)
+    catalog.devices()
+    return catalog
+
+def ids(devices: list[AudioDeviceInfo]) -> list[str]:
+    return [device.id for device in devices]
+
+def test_catalog_follows_device_changes():
+    backend = make_backend()
+    catalog = make_catalog(backend)
+    assert ids(catalog.devices()) == ["speakers", "hdmi"]
+    assert ids(catalog.devices(FLOW_CAPTURE)) == ["mic"]
+
+    backend.simulate_renamed("hdmi", "TV")
+    assert catalog.apply_pending()
+    assert catalog.get("hdmi").name == "TV"
+
+    backend.simulate_added(AudioDeviceInfo("usb", "USB"))
+    backend.simulate_removed("speakers")
+    assert catalog.apply_pending()
+    assert ids(catalog.devices()) == ["hdmi", "usb"]
+    assert not catalog.apply_pending()
+
+def test_catalog_tracks_default_device():
+    backend = make_backend()
+    catalog = make_catalog(backend)
+    revision = catalog.revision
+    backend.simulate_default_changed("hdmi")
+    assert catalog.apply_pending()
+    assert catalog.default_id() == "hdmi"
+    assert catalog.revision > revision
+
+def test_endpoint_cache_resolves_only_after_notification():
+    backend = make_backend()
+    cache = EndpointCache(backend)
+    try:
+        endpoint = cache.get()
+        resolves = backend.resolves
+        assert cache.get() is endpoint and backend.resolves == resolves
+
+        backend.simulate_default_changed("hdmi")
+        assert cache.get().id == "hdmi"
+        backend.simulate_removed("hdmi")
+        assert cache.get().id == "speakers"
+    finally:
+        cache.close()
@@ -0,0 +1,49 @@
+import asyncio
+
+from poppy.clipboard import Clipboard, FakeClipboardBackend
+
+def paste_and_restore(reader_delay: float, timeout: float = 0.2) -> tuple[bool, FakeClipboardBackend]:
+    backend = FakeClipboardBackend("original")
+    clipboard = Clipboard(backend)
+
+    async def run() -> bool:
+        original = await clipboard.snapshot()
+        pasted = await clipboard.paste("converted", lambda: backend.simulate_paste(reader_delay), timeout)
+        await clipboard.restore(original)
+        # Даём опоздавшему «приложению» прочитать буфер
+        await asyncio.sleep(max(0.0, reader_delay - timeout) + 0.05)
+        return pasted
+
+    return asyncio.run(run()), backend
+
+def test_paste_confirmed_when_app_reads_in_time():
+    pasted, backend = paste_and_restore(reader_delay=0.02)
+    assert pasted
+    assert backend.pasted == ["converted"]
+    assert backend.get_text() == "original"
+
+def test_paste_not_confirmed_when_app_reads_after_deadline():
+    pasted, backend = paste_and_restore(reader_delay=0.4)
+    assert not pasted
+    # Опоздавшее приложение получило уже восстановленный буфер — вызывающий код знает, что вставка не удалась
+    assert backend.pasted == ["original"]
+
+def test_paste_not_confirmed_when_clipboard_is_replaced_before_read():
+    backend = FakeClipboardBackend("original")
+    clipboard = Clipboard(backend)
+
+    def send_paste():
+        backend.simulate_copy("someone else", 0.01)
+        backend.simulate_paste(0.05)
+
+    assert not asyncio.run(clipboard.paste("converted", send_paste, 0.2))
+
+def test_copy_returns_text_once_app_writes_it():
+    backend = FakeClipboardBackend("original")
+    clipboard = Clipboard(backend)
+    assert asyncio.run(clipboard.copy(lambda: backend.simulate_copy("selected", 0.02))) == "selected"
+
+def test_copy_returns_none_without_selection():
+    backend = FakeClipboardBackend("original")
+    clipboard = Clipboard(backend)
+    assert asyncio.run(clipboard.copy(lambda: backend.simulate_copy(None), 0.05)) is None
@@ -0,0 +1,47 @@
+from poppy.hooks._keystroke_ring import KeystrokeRing
+
+def make_ring(text: str, capacity: int = 256) -> KeystrokeRing:
+    ring = KeystrokeRing(capacity)
+    for seq, char in enumerate(text, 1):
+        ring.append(ord(char.upper()), seq=seq)
+    return ring
+
+def typed(ring: KeystrokeRing, count: int) -> str:
+    return "".join(chr(stroke.vk).lower() for stroke in ring.last(count))
+
+def test_word_count():
+    assert make_ring("").word_count() == 0
+    assert make_ring("   ").word_count() == 0
+    assert make_ring("one").word_count() == 1
+    assert make_ring(" one  two three ").word_count() == 3
+
+def test_last_words_start_includes_trailing_spaces():
+    ring = make_ring("one two  ")
+    assert typed(ring, ring.last_words_start(1)) == "two  "
+    assert typed(ring, ring.last_words_start(2)) == "one two  "
+
+def test_last_words_start_takes_whole_buffer_when_words_run_out():
+    ring = make_ring("  one two")
+    assert ring.last_words_start(5) == len(ring)
+
+def test_word_start_mark_splits_words():
+    ring = make_ring("one")
+    ring.mark_word_start()
+    for seq, char in enumerate("two", 10):
+        ring.append(ord(char.upper()), seq=seq)
+    assert ring.word_count() == 2
+    assert typed(ring, ring.last_words_start(1)) == "two"
+
+def test_overflow_drops_oldest():
+    ring = make_ring("abc defgh", capacity=4)
+    assert len(ring) == 4
+    assert typed(ring, len(ring)) == "efgh"
+    assert ring.word_count() == 1
+
+def test_last_seq_and_discard_before():
+    ring = make_ring("ab cd")
+    assert ring.last_seq == 5
+    ring.discard_before(3)
+    assert typed(ring, len(ring)) == "cd"
+    ring.clear()
+    assert ring.last_seq == 0
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from poppy.hooks._keystroke_ring import KeystrokeRing
+from poppy.layout_switcher import LayoutSwitcher
+
+SPACE_SEQ = 4
+
+def make_switcher(input_seq: int = SPACE_SEQ, reset_seq: int = 0, consider_spaces: bool = True) -> SimpleNamespace:
+    # Слово «abc» и пробел, по которому сработало автопереключение
+    keys = KeystrokeRing()
+    for seq, vk in enumerate((0x41, 0x42, 0x43), 1):
+        keys.append(vk, seq=seq)
+    if consider_spaces:
+        keys.append(0x20, seq=SPACE_SEQ)
+    else:
+        keys.clear()
+    return SimpleNamespace(_input_seq=input_seq, _reset_seq=reset_seq, _keys=keys)
+
+def is_last_input(switcher: SimpleNamespace) -> bool:
+    return LayoutSwitcher._is_last_input(switcher, SPACE_SEQ)
+
+def test_word_is_last_input():
+    assert is_last_input(make_switcher())
+    assert is_last_input(make_switcher(consider_spaces=False))
+
+def test_cancelled_by_key_pressed_after_space():
+    # Нажатие уже записано потоком хука, но ещё не дошло до цикла приложения
+    assert not is_last_input(make_switcher(input_seq=SPACE_SEQ + 1))
+
+def test_cancelled_by_click_after_space():
+    assert not is_last_input(make_switcher(reset_seq=SPACE_SEQ + 1))
+
+def test_cancelled_when_word_is_no_longer_last():
+    switcher = make_switcher()
+    switcher._keys.append(0x44, seq=SPACE_SEQ + 1)
+    assert not is_last_input(switcher)
@@ -0,0 +1,57 @@
+from poppy.volume_commands import VolumeCommand
+
+STEP = 2
+
+def test_empty_command_keeps_state():
+    command = VolumeCommand()
+    assert command.is_empty()
+    assert command.apply(41, True, STEP) == (41, True)
+
+def test_steps_add_up_aligned_to_step_and_unmute():
+    command = VolumeCommand()
+    command.add_steps(1)
+    command.add_steps(1)
+    command.add_steps(-1)
+    assert command.apply(41, True, STEP) == (42, False)
+
+def test_steps_are_clamped():
+    command = VolumeCommand()
+    command.add_steps(10)
+    assert command.apply(95, False, STEP) == (100, False)
+    command = VolumeCommand()
+    command.add_steps(-10)
+    assert command.apply(5, False, STEP) == (0, False)
+
+def test_target_discards_earlier_steps():
+    command = VolumeCommand()
+    command.add_steps(5)
+    command.set_volume(30)
+    assert command.apply(50, False, STEP) == (30, False)
+
+def test_steps_after_target_are_applied_to_it():
+    command = VolumeCommand()
+    command.set_volume(30)
+    command.add_steps(2)
+    assert command.apply(50, False, STEP) == (34, False)
+
+def test_toggle_after_volume_change_mutes():
+    command = VolumeCommand()
+    command.add_steps(1)
+    command.add_toggle_mute()
+    assert command.apply(40, False, STEP) == (42, True)
+    assert command.apply(40, True, STEP) == (42, True)
+
+def test_volume_change_after_toggle_unmutes():
+    command = VolumeCommand()
+    command.add_toggle_mute()
+    command.set_volume(20)
+    assert command.apply(40, False, STEP) == (20, False)
+
+def test_toggles_cancel_out():
+    command = VolumeCommand()
+    command.add_toggle_mute()
+    command.add_toggle_mute()
+    assert not command.is_empty()
+    assert command.apply(40, True, STEP) == (40, True)
+    command.add_toggle_mute()
+    assert command.apply(40, True, STEP) == (40, False)
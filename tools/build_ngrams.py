@@ -0,0 +1,124 @@
+"""
+Сборка таблиц биграмм для выбора исходной раскладки (poppy/layout_scorer.py) из текстов в UTF-8
+и/или частотного словаря wordfreq.
+
+Поставляемые таблицы собраны так (wordfreq 3.1.1, pip install wordfreq==3.1.1):
+
+    python tools/build_ngrams.py en tools/corpus/en.txt --wordfreq
+    python tools/build_ngrams.py ru tools/corpus/ru.txt --wordfreq
+
+Корпус — словарь «large» пакета wordfreq: частоты слов, посчитанные по многогигабайтным текстам (Википедия,
+субтитры OpenSubtitles, новости NewsCrawl, Google Books, веб-корпус OSCAR, Reddit, Twitter); en — 321 180 слов,
+ru — 713 447 слов с частотой от 10^-8. Биграммы внутри слова и на его границах полностью определяются
+частотой слова, поэтому словарь даёт ту же статистику, что и исходный текст (кроме биграмм через дефис и апостроф).
+Частоты пересчитываются в WORDFREQ_TOKENS словоупотреблений. tools/corpus/*.txt — несколько килобайт
+связного текста общей тематики (небольшой рассказ); рядом со словарём они почти не меняют таблицы
+и остаются образцом текстового корпуса.
+
+    python tools/build_ngrams.py ru corpus.txt --bits 15 -o ru.bin   # свой корпус и размер таблицы
+
+По умолчанию таблица пишется в poppy/resources/ngrams/<язык>.bin.
+"""
+import argparse
+import math
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poppy.layout_scorer import NGRAM_HEADER, NGRAM_MAGIC, NGRAM_SCALE, NGRAM_VERSION, bigram_slot, normalize
+
+# Буквы, по которым считается статистика: остальные буквы корпуса (вставки на другом языке) — граница слова
+ALPHABETS = {
+    "en": "abcdefghijklmnopqrstuvwxyz",
+    "de": "abcdefghijklmnopqrstuvwxyzäöüß",
+    "ru": "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+    "uk": "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя",
+}
+
+# Сколько словоупотреблений соответствует частотам wordfreq (сумма частот около 1)
+WORDFREQ_TOKENS = 10 ** 9
+
+def count_bigrams(texts: list[str], alphabet: str, counts: Counter | None = None) -> Counter:
+    letters = set(alphabet)
+    counts = Counter() if counts is None else counts
+    for text in texts:
+        text = "".join(char if char.lower() in letters else " " for char in text)
+        # normalize обрезает текст — корпус считаем по строкам
+        for line in text.splitlines():
+            normalized = normalize(line)
+            for i in range(len(normalized) - 1):
+                counts[normalized[i:i + 2]] += 1
+    return counts
+
+def count_word_bigrams(frequencies: dict[str, float], alphabet: str, counts: Counter | None = None) -> Counter:
+    """Биграммы слов с границами, взвешенные частотой слова, — как если бы слова встретились в тексте."""
+    letters = set(alphabet)
+    counts = Counter() if counts is None else counts
+    for word, frequency in frequencies.items():
+        weight = frequency * WORDFREQ_TOKENS
+        normalized = normalize("".join(char if char in letters else " " for char in word))
+        for i in range(len(normalized) - 1):
+            counts[normalized[i:i + 2]] += weight
+    return counts
+
+def load_wordfreq(language: str) -> dict[str, float]:
+    try:
+        import wordfreq
+    except ImportError:
+        sys.exit("--wordfreq needs the wordfreq package: pip install wordfreq==3.1.1")
+    return wordfreq.get_frequency_dict(language, wordlist="large")
+
+def build_table(counts: Counter, bits: int) -> tuple[bytes, int]:
+    firsts = Counter()
+    for bigram, count in counts.items():
+        firsts[bigram[0]] += count
+
+    values: dict[int, int] = {}
+    for bigram, count in counts.items():
+        value = max(-127, round(math.log2(count / firsts[bigram[0]]) * NGRAM_SCALE))
+        slot = bigram_slot(bigram[0], bigram[1], (1 << bits) - 1)
+        # При коллизии оставляем более частую биграмму
+        values[slot] = max(values.get(slot, -128), value)
+
+    # Невстреченная биграмма — на два бита реже самой редкой из встреченных
+    floor = max(-128, min(values.values(), default=0) - 2 * NGRAM_SCALE)
+    table = bytearray((floor & 0xFF,) * (1 << bits))
+    for slot, value in values.items():
+        table[slot] = value & 0xFF
+    return bytes(table), floor
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a bigram table for layout detection")
+    parser.add_argument("language", choices=sorted(ALPHABETS))
+    parser.add_argument("corpus", nargs="*", help="UTF-8 text files")
+    parser.add_argument("--wordfreq", action="store_true", help="add the wordfreq 'large' word list for the language")
+    parser.add_argument("--bits", type=int, default=14, help="table size as a power of two")
+    parser.add_argument("-o", "--output", help="output file")
+    args = parser.parse_args()
+
+    texts = []
+    for path in args.corpus:
+        with open(path, encoding="utf-8") as file:
+            texts.append(file.read())
+
+    if not texts and not args.wordfreq:
+        parser.error("no corpus: give text files and/or --wordfreq")
+
+    counts = count_bigrams(texts, ALPHABETS[args.language])
+    if args.wordfreq:
+        count_word_bigrams(load_wordfreq(args.language), ALPHABETS[args.language], counts)
+    table, floor = build_table(counts, args.bits)
+
+    output = args.output or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         "poppy", "resources", "ngrams", f"{args.language}.bin")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "wb") as file:
+        file.write(NGRAM_HEADER.pack(NGRAM_MAGIC, NGRAM_VERSION, args.bits, floor))
+        file.write(table)
+
+    print(f"{output}: {len(counts)} bigrams, {1 << args.bits} slots, floor {floor / NGRAM_SCALE:.2f} bits")
+
+if __name__ == "__main__":
+    main()